@@ -0,0 +1,19 @@
+"""Helpers for generating the monthly TV advertising campaign reports."""
+from .cache import WorkbookCache, load_cleaned
+from .cleaning import build_purchase_dates, campaign_period, clean_workbook
+from .cube import build_daily_cube, roll_up_cube
+from .loader import load_workbook
+from .pipeline import run, run_incremental
+from .state import MonthlyStateStore
+
+__all__ = ['MonthlyStateStore',
+           'WorkbookCache',
+           'build_daily_cube',
+           'build_purchase_dates',
+           'campaign_period',
+           'clean_workbook',
+           'load_cleaned',
+           'load_workbook',
+           'roll_up_cube',
+           'run',
+           'run_incremental']
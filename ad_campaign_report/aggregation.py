@@ -0,0 +1,146 @@
+"""Aggregating Purchases, Spend and Lift by network (and month), and joining them through the Lookup table."""
+import pandas as pd
+
+
+def _offset_aliases():
+    # pandas 2.2 renamed the month and quarter end offsets to 'ME' and 'QE' (and 3.0 dropped 'M' and 'Q'),
+    # but Periods still use 'M' and 'Q', so the frequencies passed around here stay the Period ones
+    try:
+        pd.tseries.frequencies.to_offset('ME')
+    except ValueError:
+        return {}
+    return {'M': 'ME', 'Q': 'QE'}
+
+
+OFFSET_ALIASES = _offset_aliases()
+
+
+def grouper_freq(freq):
+    """The pd.Grouper (offset) alias of a Period frequency (ex: 'M' is 'ME' on pandas >= 2.2)."""
+    return OFFSET_ALIASES.get(freq, freq)
+
+
+def aggregate_monthly(purchase_data_transpose, airings_data):
+    """The only pass over the raw purchases and airings: everything else is rolled up from these.
+
+    Returns (purchases_by_month, spend_lift_by_network_and_month), where
+    purchases_by_month has one row per month (end) and one column per network name,
+    and spend_lift_by_network_and_month is indexed by (Network ticker, month).
+    """
+    purchases_by_month = aggregate_purchases_by_month(purchase_data_transpose)
+    spend_lift_by_network_and_month = aggregate_spend_lift_by_network_and_month(airings_data)
+
+    return purchases_by_month, spend_lift_by_network_and_month
+
+
+def aggregate_purchases_by_month(purchase_data_transpose, freq='M'):
+    """Purchases by month (end) for every network name.  The index gives us the months of the campaign.
+
+    freq groups by another period instead (ex: 'D' for days, see cube.py).
+    """
+    return purchase_data_transpose.groupby(pd.Grouper(freq=grouper_freq(freq))).sum()
+
+
+def aggregate_spend_lift_by_network_and_month(airings_data, freq='M'):
+    """Spend and Lift indexed by (Network ticker, month end), or by another period with freq."""
+    # observed=True, b/c Network is a categorical and we don't want a row for every ticker in every month, only the ones that aired
+    return airings_data.groupby(['Network', pd.Grouper(key='Date/Time ET', freq=grouper_freq(freq))], observed=True)[['Spend', 'Lift']].sum()
+
+
+def aggregate_by_network(purchase_data_transpose, airings_data, lookup_data, monthly=None):
+    """Total Purchases, Spend and Lift for every network in the Lookup table.
+
+    The totals are rolled up from the monthly aggregates, which are computed here
+    unless they're passed in as monthly (the result of aggregate_monthly).
+    """
+    if monthly is None:
+        monthly = aggregate_monthly(purchase_data_transpose, airings_data)
+    purchases_by_month, spend_lift_by_network_and_month = monthly
+
+    # Add up the months to find the total number of purchases by network
+    purchases_by_network = purchases_by_month.sum(axis=0)
+    purchases_by_network = purchases_by_network.to_frame()
+    purchases_by_network = purchases_by_network.rename(columns={0:'Purchases'})
+
+    # Add up the months to find the total amount spent on ads for each network and the total lift generated from those ads for each network
+    spend_and_lift_by_network = spend_lift_by_network_and_month.groupby(level='Network', observed=True).sum()
+
+    # Spend is in dollars and cents.  Adding up the monthly totals happens in a different order than adding up the airings directly, which can leave floating point noise in the last digits (ex: 11330.039999999999), so we round to the cent.
+    spend_and_lift_by_network['Spend'] = spend_and_lift_by_network['Spend'].round(2)
+
+    # Joining Purchases by Network to Lookup Data
+    purchases_by_network_w_lookup = lookup_data.merge(right=purchases_by_network, left_on='Network Name', right_on='Source', how='left')
+    purchases_by_network_w_lookup = purchases_by_network_w_lookup.set_index('Network Name')
+
+    # Joining Purchases/Lookup by Network to Spend and Lift
+    purchases_spend_lift_by_network = purchases_by_network_w_lookup.merge(right=spend_and_lift_by_network, left_on='Ticker', right_index=True, how='left')
+
+    # Since this column was only needed for the join, I'm going to drop it post join
+    purchases_spend_lift_by_network = purchases_spend_lift_by_network.drop('Ticker', axis=1)
+
+    purchases_spend_lift_by_network.index = purchases_spend_lift_by_network.index.str.replace('_', ' ').str.title()
+    purchases_spend_lift_by_network = purchases_spend_lift_by_network.fillna(0)
+
+    return purchases_spend_lift_by_network
+
+
+def aggregate_by_network_and_month(purchase_data_transpose, airings_data, lookup_data, monthly=None):
+    """Purchases, Spend and Lift for every network in the Lookup table and every month of the campaign.
+
+    monthly is the result of aggregate_monthly, which is computed here if it isn't passed in.
+    """
+    if monthly is None:
+        monthly = aggregate_monthly(purchase_data_transpose, airings_data)
+    purchases_by_month, spend_lift_by_network_and_month = monthly
+
+    # The months of the campaign, as month end timestamps
+    month_stamps = purchases_by_month.index
+
+    # Purchases by Network (name) and Month
+    purchases_by_network_and_month = purchases_by_month.transpose().stack()
+
+    # Every channel in the lookup table needs a row for each month in the campaign, even if it had no airings or purchases that month.  Rather than cross joining the lookup table with the months and then merging, we build that (channel, month) grid directly with MultiIndex.from_product and look up the aggregates with reindex.  The grid is built twice, once with the tickers (to look up Spend and Lift) and once with the network names (to look up Purchases), but both are in the same order, so the rows line up.
+    ticker_months = pd.MultiIndex.from_product([lookup_data['Ticker'], month_stamps])
+    name_months = pd.MultiIndex.from_product([lookup_data['Network Name'], month_stamps])
+
+    spend_lift = spend_lift_by_network_and_month.reindex(ticker_months)
+    purchases = purchases_by_network_and_month.reindex(name_months)
+
+    # Cleanup
+    network_names = lookup_data['Network Name'].str.replace('_', ' ').str.title()
+    index = pd.MultiIndex.from_product([network_names, month_stamps], names=['Network Name', 'date'])
+
+    purchases_spend_lift_by_network_and_month = pd.DataFrame({'Purchases': purchases.to_numpy(),
+                                                              'Spend': spend_lift['Spend'].to_numpy(),
+                                                              'Lift': spend_lift['Lift'].to_numpy()},
+                                                             index=index)
+    purchases_spend_lift_by_network_and_month = purchases_spend_lift_by_network_and_month.fillna(0)
+
+    return purchases_spend_lift_by_network_and_month
+
+
+def roll_up_by_network(purchases_spend_lift_by_network_and_month):
+    """Network totals of a (Network Name, date) indexed Purchases/Spend/Lift table, in order of first appearance."""
+    purchases_spend_lift_by_network = purchases_spend_lift_by_network_and_month.groupby(level='Network Name', sort=False, observed=True)[['Purchases', 'Spend', 'Lift']].sum()
+
+    # Same as in aggregate_by_network, round the added up Spend to the cent
+    purchases_spend_lift_by_network['Spend'] = purchases_spend_lift_by_network['Spend'].round(2)
+
+    return purchases_spend_lift_by_network
+
+
+def aggregate(purchase_data_transpose, airings_data, lookup_data, monthly=None):
+    """Returns (purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month).
+
+    The raw purchases and airings are only grouped once, by network and month, and
+    the network totals are rolled up from those monthly aggregates.  If the monthly
+    aggregates were already computed some other way (ex: by streaming the airings
+    in chunks), pass them in as monthly and airings_data can be None.
+    """
+    if monthly is None:
+        monthly = aggregate_monthly(purchase_data_transpose, airings_data)
+
+    purchases_spend_lift_by_network = aggregate_by_network(purchase_data_transpose, airings_data, lookup_data, monthly=monthly)
+    purchases_spend_lift_by_network_and_month = aggregate_by_network_and_month(purchase_data_transpose, airings_data, lookup_data, monthly=monthly)
+
+    return purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month
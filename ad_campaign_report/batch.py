@@ -0,0 +1,191 @@
+"""Batch mode: run the full report pipeline for many client workbooks across CPU cores.
+
+Every workbook (in the same layout as dataset.xlsx) is processed in a process
+pool and gets its own output directory, named after the workbook (and its
+directory, if workbooks in different directories have the same name):
+
+    python -m ad_campaign_report.batch ./clients --output ./output --workers 4
+    python -m ad_campaign_report.batch "./clients/*_2017_10.xlsx"
+
+A summary of the wall time of each workbook, and of any failures, is printed
+at the end.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import traceback
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .cube import DEFAULT_GRAIN, GRAINS
+from .duckdb_engine import ENGINES
+from .render import RENDERERS
+
+
+BatchResult = namedtuple('BatchResult', ['path', 'output_dir', 'seconds', 'error'])
+
+
+def find_workbooks(source):
+    """Workbooks in a directory, or matching a glob pattern, sorted by path."""
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, '*.xlsx'))
+    else:
+        paths = glob.glob(source)
+
+    # Excel leaves "~$name.xlsx" lock files next to open workbooks, which we skip
+    return sorted(path for path in paths if not os.path.basename(path).startswith('~$'))
+
+
+def _workbook_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def workbook_output_dirs(paths, output_root):
+    """Output directory of every workbook in paths: <output_root>/<workbook name without extension>.
+
+    Workbooks with the same name in different directories would write over each
+    other's files, so those keep their directories below the one they all share,
+    ex: <output_root>/east/client_a and <output_root>/west/client_a.  Raises
+    ValueError if the same workbook is listed twice.
+    """
+    absolute_paths = [os.path.abspath(path) for path in paths]
+    repeated = sorted(path for path, count in Counter(absolute_paths).items() if count > 1)
+    if repeated:
+        raise ValueError(F"Workbooks listed more than once: {', '.join(repeated)}")
+
+    name_counts = Counter(_workbook_name(path) for path in paths)
+    if max(name_counts.values(), default=0) > 1:
+        shared_dir = os.path.commonpath([os.path.dirname(path) for path in absolute_paths])
+
+    output_dirs = []
+    for path, absolute_path in zip(paths, absolute_paths):
+        name = _workbook_name(path)
+        if name_counts[name] > 1:
+            name = os.path.join(os.path.relpath(os.path.dirname(absolute_path), shared_dir), name)
+        output_dirs.append(os.path.join(output_root, name))
+
+    return output_dirs
+
+
+def _run_one(path, output_dir, pdfs, cache_dir, airings_chunksize, renderer, export_workers, combined_report, grain, dayparts, engine, profile):
+    # Runs in a worker process.  Errors are returned rather than raised, so one bad
+    # workbook doesn't stop the rest of the batch.
+    from .cache import WorkbookCache
+    from .pipeline import run
+
+    start = time.perf_counter()
+    try:
+        cache = WorkbookCache(cache_dir) if cache_dir else None
+        run(path, output_dir=output_dir, cache=cache, pdfs=pdfs, airings_chunksize=airings_chunksize, renderer=renderer,
+            export_workers=export_workers, combined_report=combined_report, grain=grain,
+            dayparts=dayparts, engine=engine, profile=profile)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+
+    return BatchResult(path, output_dir, time.perf_counter() - start, error)
+
+
+def run_batch(workbooks, output_root='./output', workers=None, pdfs=True, cache_dir=None, airings_chunksize=None, renderer=None, export_workers=None,
+              combined_report=False, grain=DEFAULT_GRAIN, dayparts=True, engine='pandas', profile=False):
+    """Run the pipeline for every workbook in a pool of worker processes.
+
+    workbooks is a list of paths, or a directory/glob pattern to search.  workers
+    defaults to the number of CPU cores.  airings_chunksize (to read the airings in
+    chunks when memory is tight), renderer (the name of a PDF backend from
+    render.py), export_workers (the number of export threads in each worker
+    process), combined_report (one PDF per workbook instead of three), grain
+    (the period of the "by month" report), dayparts (whether to add the daypart
+    and hour of day reports), engine ('pandas' or 'duckdb') and profile (write a
+    run_profile.json in each output directory) are passed on to pipeline.run.  Returns
+    a list of BatchResult, in the same order as the workbooks.
+    """
+    if isinstance(workbooks, str):
+        workbooks = find_workbooks(workbooks)
+
+    # Worked out before anything is submitted, so clashing workbooks fail the batch up front
+    output_dirs = workbook_output_dirs(workbooks, output_root)
+
+    results = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_one, path, output_dir, pdfs, cache_dir, airings_chunksize, renderer, export_workers,
+                               combined_report, grain, dayparts, engine, profile): (path, output_dir)
+                   for path, output_dir in zip(workbooks, output_dirs)}
+        for future in as_completed(futures):
+            path, output_dir = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                # The worker process died (ex: killed for running out of memory), which breaks the pool.  The
+                # workbooks that were still running fail, but the ones that finished keep their results.
+                result = BatchResult(path, output_dir, time.perf_counter() - start, traceback.format_exc())
+            results[path] = result
+
+    return [results[path] for path in workbooks]
+
+
+def print_summary(results, total_seconds=None, file=sys.stdout):
+    """Per-workbook wall time and status, followed by the tracebacks of any failures."""
+    failures = [result for result in results if result.error is not None]
+
+    # Workbooks are listed by name, or by path if some of them have the same name
+    names = [os.path.basename(result.path) for result in results]
+    if len(set(names)) < len(names):
+        names = [result.path for result in results]
+    width = max([len(name) for name in names] + [8])
+
+    print(F"{'workbook':<{width}}  {'status':<8}{'time (s)':>10}", file=file)
+    print('-'*(width + 20), file=file)
+    for name, result in zip(names, results):
+        status = 'ok' if result.error is None else 'FAILED'
+        print(F"{name:<{width}}  {status:<8}{result.seconds:>10.2f}", file=file)
+    print('-'*(width + 20), file=file)
+
+    summary = F"{len(results) - len(failures)} succeeded, {len(failures)} failed"
+    if total_seconds is not None:
+        summary += F" in {total_seconds:.2f}s"
+    print(summary, file=file)
+
+    for result in failures:
+        print(file=file)
+        print(F"{result.path} failed:", file=file)
+        print(result.error, file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the campaign reports for many workbooks in parallel.")
+    parser.add_argument('workbooks', help="directory containing .xlsx workbooks, or a glob pattern")
+    parser.add_argument('--output', default='./output', help="root directory; each workbook gets a sub-directory (default: ./output)")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes (default: number of CPU cores)")
+    parser.add_argument('--no-pdfs', action='store_true', help="only write the CSV files")
+    parser.add_argument('--cache-dir', default=None, help="cache the cleaned sheets in this directory")
+    parser.add_argument('--renderer', choices=sorted(RENDERERS), default=None, help="PDF backend (default: pdfkit)")
+    parser.add_argument('--airings-chunksize', type=int, default=None, help="read the airings this many rows at a time instead of all at once")
+    parser.add_argument('--export-workers', type=int, default=None, help="number of files each workbook writes at once (default: thread pool default)")
+    parser.add_argument('--combined-report', action='store_true', help="write the reports and summary metrics to one HTML file and PDF per workbook")
+    parser.add_argument('--grain', choices=list(GRAINS), default=DEFAULT_GRAIN, help="period of the by-period table and report (default: month)")
+    parser.add_argument('--no-dayparts', action='store_true', help="skip the daypart and hour of day reports")
+    parser.add_argument('--engine', choices=ENGINES, default='pandas', help="run the aggregations and joins with pandas or DuckDB (default: pandas)")
+    parser.add_argument('--profile', action='store_true', help="write the time and memory of every stage to run_profile.json in each output directory")
+    args = parser.parse_args(argv)
+
+    workbooks = find_workbooks(args.workbooks)
+    if not workbooks:
+        parser.error(F"no workbooks found in {args.workbooks}")
+
+    start = time.perf_counter()
+    results = run_batch(workbooks, output_root=args.output, workers=args.workers,
+                        pdfs=not args.no_pdfs, cache_dir=args.cache_dir,
+                        airings_chunksize=args.airings_chunksize, renderer=args.renderer,
+                        export_workers=args.export_workers, combined_report=args.combined_report,
+                        grain=args.grain, dayparts=not args.no_dayparts, engine=args.engine, profile=args.profile)
+    print_summary(results, total_seconds=time.perf_counter() - start)
+
+    return 1 if any(result.error is not None for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
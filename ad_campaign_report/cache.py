@@ -0,0 +1,175 @@
+"""On-disk columnar cache of the cleaned input sheets.
+
+Parsing the .xlsx file is the slowest part of a run, and we often re-run the
+report on the same workbook while tweaking the formatting of the output.  The
+cleaned purchase_data_transpose, airings_data and lookup_data are stored as
+Parquet files in a directory named after a hash of the workbook's contents, so
+a warm run can skip Excel parsing entirely.  When the cache grows past
+max_bytes, the least recently used entries are evicted.
+
+Parquet support comes from pyarrow.  If it isn't installed the cache simply
+stays empty and every run parses the workbook.
+"""
+import hashlib
+import os
+import shutil
+import warnings
+
+import pandas as pd
+
+from .cleaning import clean_workbook
+from .loader import load_workbook
+
+
+# Bump this whenever the cleaning steps change, so entries written by an older
+# version of the code are never read back.
+CACHE_VERSION = 3
+
+DEFAULT_CACHE_DIR = './.report_cache'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+FRAME_NAMES = ('purchase_data_transpose', 'airings_data', 'lookup_data')
+
+
+def workbook_hash(path, chunk_size=1024 * 1024):
+    """SHA-256 of the workbook's contents (and the cache version)."""
+    digest = hashlib.sha256(F"v{CACHE_VERSION}".encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _pyarrow_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class WorkbookCache:
+    """Cleaned sheets stored as Parquet files, keyed by workbook content hash."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = _pyarrow_available()
+
+        if not self.enabled:
+            warnings.warn("pyarrow is not installed, so the workbook cache is disabled")
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def _frame_path(self, key, name):
+        return os.path.join(self._entry_dir(key), F"{name}.parquet")
+
+    def get(self, key):
+        """Return the cached frames for key, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        paths = [self._frame_path(key, name) for name in FRAME_NAMES]
+        if not all(os.path.exists(path) for path in paths):
+            return None
+
+        # Another process (ex: a batch worker) may be evicting the entry while we
+        # read it, so a file that's gone or half deleted is just a miss.
+        try:
+            purchase_data_transpose, airings_data, lookup_data = (pd.read_parquet(path) for path in paths)
+        except (OSError, ValueError):
+            return None
+
+        # Parquet can't store the categorical network names of the purchases'
+        # columns (see put), so we restore them from the shared categories, which
+        # the Lookup table's Network Name column carries.
+        network_names = lookup_data['Network Name'].dtype
+        purchase_data_transpose.columns = pd.CategoricalIndex(purchase_data_transpose.columns, dtype=network_names, name='Source')
+        frames = (purchase_data_transpose, airings_data, lookup_data)
+
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(self._entry_dir(key))
+        except FileNotFoundError:
+            pass
+
+        return frames
+
+    def put(self, key, frames):
+        """Store the cleaned frames under key, then evict old entries if we're over max_bytes."""
+        if not self.enabled:
+            return
+
+        # Write into a temporary directory first and rename it into place, so a
+        # crash half way through never leaves a partial entry behind.
+        entry_dir = self._entry_dir(key)
+        tmp_dir = entry_dir + F".tmp{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        for name, frame in zip(FRAME_NAMES, frames):
+            # Parquet needs plain string column names
+            if isinstance(frame.columns, pd.CategoricalIndex):
+                frame = frame.copy()
+                frame.columns = pd.Index(frame.columns.astype(str), name=frame.columns.name)
+            frame.to_parquet(os.path.join(tmp_dir, F"{name}.parquet"))
+
+        # Entries are keyed by content, so if another process (ex: a batch worker
+        # with the same workbook) got there first, its entry is identical to ours.
+        # We keep it rather than deleting it from under a reader.
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            if not os.path.isdir(entry_dir):
+                raise
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.evict()
+
+    def entries(self):
+        """List of (key, size in bytes, last used time) for every entry in the cache."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            entry_dir = self._entry_dir(key)
+            if '.tmp' in key or not os.path.isdir(entry_dir):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry_dir, name)) for name in os.listdir(entry_dir))
+            entries.append((key, size, os.path.getmtime(entry_dir)))
+        return entries
+
+    def evict(self):
+        """Delete the least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def load_cleaned(path, cache=None):
+    """Load and clean a workbook, going through the cache when one is given.
+
+    Returns (purchase_data_transpose, airings_data, lookup_data).
+    """
+    key = None
+    if cache is not None and cache.enabled:
+        key = workbook_hash(path)
+        frames = cache.get(key)
+        if frames is not None:
+            return frames
+
+    frames = clean_workbook(*load_workbook(path))
+
+    if key is not None:
+        cache.put(key, frames)
+
+    return frames
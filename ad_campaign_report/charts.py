@@ -0,0 +1,573 @@
+"""The presentation charts (heatmaps, quadrant scatter plots and the no spend bar chart), and rendering them headless.
+
+The plotting functions draw on their own figure and return (fig, ax) without
+showing it, so ad_campaign_visuals.py can show them in a notebook, and
+render_deck can save every chart of a client's deck to PNG/SVG files without a
+display, in a pool of worker processes:
+
+    timings = render_deck(report_for_client, channels_no_spend, './output/charts', formats=('png', 'svg'))
+    print_chart_timings(timings)
+
+or, for every client the batch mode wrote reports for:
+
+    python -m ad_campaign_report.charts ./output/brand_a ./output/brand_b --formats png svg --workers 4
+
+Every figure is closed as soon as it's saved, since pyplot keeps every open
+figure alive (and in memory) until it's closed.
+
+matplotlib, seaborn and adjustText are only imported when a chart is drawn.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .label_placement import DEFAULT_LABEL_PLACER, LABEL_PLACERS, place_labels
+from .metrics import display_name, overall_metrics, unit
+from .rankings import consensus_networks, ranked_networks, ranking_table
+
+
+# One chart of the deck: function(**kwargs) draws it and returns (fig, ax), or (fig, ax, quadrants) for the scatter plots
+Chart = namedtuple('Chart', ['name', 'function', 'kwargs'])
+
+ChartTiming = namedtuple('ChartTiming', ['name', 'paths', 'seconds'])
+
+CHART_FORMATS = ('png', 'svg')
+
+# Figure fraction positions of the "Good"/"Bad" notes, in the corners of the quadrants they describe
+TOP_LEFT_NOTE = (0.08, 0.68)
+BOTTOM_RIGHT_NOTE = (0.36, 0.14)
+
+
+def use_headless_backend():
+    """Switch matplotlib to the Agg backend, which renders to files without a display."""
+    import matplotlib
+
+    matplotlib.use('Agg', force=True)
+
+
+def make_heatmap(df, field, color_map, top_labels, bottom_labels, rounding=".0f", cutoff_value=False, asc=False, annotate_horizontal=True, hide_y_label=False, rankings=None):
+    """One column heatmap of field by network, sorted, with only the top and bottom 5 networks named and annotated.
+
+    Networks in top_labels are named in green and the ones in bottom_labels in
+    red.  A dotted line marks cutoff_value (default: the mean of field).  The
+    rows are ordered from rankings, a ranking_table of df with field in the asc
+    order (pass the same one to every heatmap of a report, so each field is only
+    sorted once).  Values that can't be
+    plotted (inf or missing, ex: the Cost Per Acquisition of a network with no
+    purchases) are left out.  Returns (fig, ax).
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # # Get cutoff_value isn't supplied, we use the mean as the cutoff_value
+    if cutoff_value==False:
+        cutoff_value = df[field].mean()
+
+    if rankings is None:
+        rankings = ranking_table(df, [field], ascending=asc)
+
+    # Sort purchases High to Low
+    sorted_values = df.loc[ranked_networks(rankings, field, ascending=asc), [field]]
+
+    # Find index of channel that has a field value >= field_mean.  This is used to draw horizontal line in heatmap later.
+    if asc == False:
+        horizontal_y_val = sorted_values[sorted_values[field] > cutoff_value].shape[0]
+    else:
+        horizontal_y_val = sorted_values[sorted_values[field] < cutoff_value].shape[0]
+
+    # Create labels for y_ticks.  Keep top and bottom 5 labels, replace middle labels
+    # with empty string.
+    rank = np.arange(len(sorted_values))
+    labels_list = list(np.where((rank < 5) | (rank > len(rank) - 6), sorted_values.index, ''))
+
+    top_5_channels = top_labels
+    bottom_5_channels = bottom_labels
+
+    fig, ax = plt.subplots(1,1,figsize=(2,10))
+
+    ## Entries that are np.inf (ex: Cost Per Acquisition where there were no purchases) can't be plotted, so we remove them
+    sorted_values = sorted_values[np.isfinite(sorted_values[field])]
+
+    # Create masks
+    if asc==False:
+        ## Top 5 mask
+        mask1 = sorted_values>=sorted_values[field].iloc[4]
+        ## Bottom 5 mask
+        mask2 = sorted_values<=sorted_values[field].iloc[-5]
+    else:
+        ## Top 5 mask
+        mask1 = sorted_values>=sorted_values[field].iloc[-5]
+        ## Bottom 5 mask
+        mask2 = sorted_values<=sorted_values[field].iloc[4]
+
+    top_and_bottom_mask = mask1 | mask2
+    middle_mask = ~top_and_bottom_mask
+
+    sns.heatmap(data=sorted_values,
+                mask=middle_mask,
+                annot=True,
+                cmap=color_map,
+                fmt='g',
+                cbar=True,
+                ax=ax)
+
+    sns.heatmap(data=sorted_values,
+                cmap=color_map,
+                fmt='g',
+                cbar = False,
+                yticklabels=labels_list,
+                ax=ax)
+
+    for text in ax.get_yticklabels():
+        if text.get_text() in top_5_channels:
+            text.set_weight('bold')
+            text.set_color('green')
+        if text.get_text() in bottom_5_channels:
+            text.set_weight('bold')
+            text.set_color('red')
+
+    field = display_name(field)
+
+    ax.tick_params(axis='y', left=False)
+
+    if annotate_horizontal==True:
+        ax.axhline(horizontal_y_val, linestyle=':', color='blue')
+        ax.annotate(text=F'Avg {field} {format(cutoff_value, rounding)}:', xy=(0, horizontal_y_val), xytext=(-10, -5), textcoords='offset pixels', ha='right', color='#2596be')
+
+    if hide_y_label:
+        ax.set_ylabel('')
+
+    return fig, ax
+
+
+def _rounded_mean(values, units):
+    # Means are rounded like the values they're compared to: cents for $, 1 decimal for %
+    if units == "$":
+        return round(values.mean(), 2)
+    elif units == "%":
+        return round(values.mean(), 1)
+    else:
+        return round(values.mean())
+
+
+def _draw_mean_lines(ax, x_field, y_field, x_field_mean, y_field_mean):
+    # Short names of the metrics (ex: "Cost Per Visitor") come from the metric registry
+    x_annot_text = display_name(x_field)
+    y_annot_text = display_name(y_field)
+
+    ax.axvline(x=x_field_mean, linestyle=(0, (2, 8)), color='k')
+    ax.annotate(F'Mean {x_annot_text}',
+                xy=(x_field_mean, max(ax.get_ylim())), xycoords='data',
+                xytext=(0, 2), textcoords='offset pixels',
+                color='k', ha='center')
+
+    ax.axhline(y=y_field_mean, linestyle=(0, (2, 8)), color='k')
+    ax.annotate(F'Mean\n{y_annot_text}',
+                xy=(max(ax.get_xlim()), y_field_mean), xycoords='data',
+                xytext=(5, 0), textcoords='offset pixels',
+                color='k', ha='left')
+
+    ax.axes.set_xticks([0, x_field_mean])
+    ax.axes.set_yticks([0, y_field_mean])
+
+
+# Quadrants of the scatter plots, split by the means of x and y
+LOW_X_HIGH_Y = 'low x, high y'
+HIGH_X_LOW_Y = 'high x, low y'
+HIGH_X_HIGH_Y = 'high x, high y'
+LOW_X_LOW_Y = 'low x, low y'
+
+QUADRANTS = [LOW_X_HIGH_Y, HIGH_X_LOW_Y, HIGH_X_HIGH_Y, LOW_X_LOW_Y]
+
+
+def scatter_quadrants(df, x_field, y_field, x_units=None, y_units=None):
+    """Which quadrant of the y_field vs. x_field scatter plot every network is in.
+
+    The quadrants are split by the means of both fields (rounded by their units,
+    like the dashed lines of make_scatter), and a value equal to the mean counts
+    as high.  Returns a DataFrame indexed by network with x_field, y_field (inf
+    replaced by 0, like they're plotted) and Quadrant (one of QUADRANTS).  The
+    means are in its attrs, as x_mean and y_mean.
+    """
+    # A metric that divided by 0 (inf) is plotted at 0.  We work on a copy, so the caller's table keeps its inf.
+    points = df[[x_field, y_field]].replace(np.inf, 0)
+
+    # Unless they're given, the units ('$', '%' or '') come from the metric registry
+    if x_units is None:
+        x_units = unit(x_field)
+    if y_units is None:
+        y_units = unit(y_field)
+
+    x_field_mean = _rounded_mean(points[x_field], x_units)
+    y_field_mean = _rounded_mean(points[y_field], y_units)
+
+    high_x = (points[x_field] >= x_field_mean).values
+    high_y = (points[y_field] >= y_field_mean).values
+    quadrant = np.select([~high_x & high_y, high_x & ~high_y, high_x & high_y], QUADRANTS[:3], QUADRANTS[3])
+
+    points['Quadrant'] = pd.Categorical(quadrant, categories=QUADRANTS)
+    points.attrs.update(x_mean=x_field_mean, y_mean=y_field_mean)
+
+    return points
+
+
+def _draw_quadrant_scatter(df, x_field, y_field, x_units, y_units, color_1, color_2, sizes=None, annotate_text=True):
+    # The part make_scatter and make_scatter_with_size_adjustment share: every network as a point,
+    # then the networks in the low x/high y and high x/low y quadrants drawn again in color_1 and
+    # color_2, as one collection per quadrant (sizes is the marker size of every network, or None
+    # for the default).  Returns (fig, ax, quadrants, texts).
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(1,1,figsize=(10,5))
+
+    quadrants = scatter_quadrants(df, x_field, y_field, x_units, y_units)
+
+    quadrants.plot(kind='scatter', x=x_field, y=y_field, ax=ax)
+
+    colors = {LOW_X_HIGH_Y: color_1, HIGH_X_LOW_Y: color_2}
+    for quadrant, color in colors.items():
+        in_quadrant = (quadrants['Quadrant'] == quadrant).values
+        ax.scatter(quadrants[x_field].values[in_quadrant],
+                   quadrants[y_field].values[in_quadrant],
+                   color=color,
+                   s=None if sizes is None else np.asarray(sizes)[in_quadrant])
+
+    # The names are added in alphabetical order, which is the order adjust_text moves them in
+    texts = []
+    if annotate_text:
+        labelled = quadrants[quadrants['Quadrant'].isin(colors)].sort_index()
+        texts = [ax.text(x, y, network, color=colors[quadrant])
+                 for network, x, y, quadrant in zip(labelled.index, labelled[x_field], labelled[y_field], labelled['Quadrant'])]
+
+    _draw_mean_lines(ax, x_field, y_field, quadrants.attrs['x_mean'], quadrants.attrs['y_mean'])
+
+    return fig, ax, quadrants, texts
+
+
+def make_scatter(df, x_field, y_field, x_units=None, y_units=None, color_1='green', color_2='red', label_placer=None):
+    """Scatter plot of y_field vs. x_field, split into quadrants by the means.
+
+    Networks below the mean of x_field and at or above the mean of y_field are
+    drawn and named in color_1, and the ones at or above the mean of x_field and
+    below the mean of y_field in color_2.  x_units and y_units ('$', '%' or '')
+    default to the ones in the metric registry.  label_placer picks how the names
+    are kept from overlapping: 'adjust_text' (the default) or the faster 'greedy'
+    (see label_placement.py).  Returns (fig, ax, quadrants), where quadrants is
+    the table of scatter_quadrants.
+    """
+    fig, ax, quadrants, texts = _draw_quadrant_scatter(df, x_field, y_field, x_units, y_units, color_1, color_2)
+
+    place_labels(texts,
+                 ax,
+                 label_placer,
+                 x=quadrants[x_field],
+                 y=quadrants[y_field],
+                 force_text=(1,1),
+                 force_points=(1,1),
+                 force_objects=(1,1),
+                 only_move={'points':'y', 'texts':'y'},
+                 arrowprops=dict(arrowstyle="->", color='k', lw=0.5))
+
+    return fig, ax, quadrants
+
+
+def make_scatter_with_size_adjustment(df,
+                                      x_field,
+                                      y_field,
+                                      size_scale,
+                                      x_units=None,
+                                      y_units=None,
+                                      color_1='green',
+                                      color_2='red',
+                                      expand_text=(1.5, 1.5),
+                                      expand_points=(3,3),
+                                      expand_objects=(3,3),
+                                      force_text=(1,1),
+                                      force_points=(1,1),
+                                      force_objects=(1,1),
+                                      annotate_text=True,
+                                      label_placer=None):
+    """make_scatter, with the quadrant points sized by Purchases (times size_scale).
+
+    annotate_text=False leaves the networks unnamed.  The expand_* and force_*
+    arguments are only used by the adjust_text label placer.  Returns (fig, ax,
+    quadrants).
+    """
+    # Networks with no purchases are drawn as if they had 1, so they don't disappear
+    sizes = df['Purchases'].replace(0, 1).values * size_scale
+
+    fig, ax, quadrants, texts = _draw_quadrant_scatter(df, x_field, y_field, x_units, y_units, color_1, color_2,
+                                                       sizes=sizes, annotate_text=annotate_text)
+
+    if annotate_text == True:
+        place_labels(texts,
+                     ax,
+                     label_placer,
+                     x=quadrants[x_field],
+                     y=quadrants[y_field],
+                     sizes=sizes,
+                     expand_text=expand_text,
+                     expand_points=expand_points,
+                     expand_objects=expand_objects,
+                     force_text=force_text,
+                     force_points=force_points,
+                     force_objects=force_objects,
+                     only_move={'points':'y', 'texts':'y'},
+                     arrowprops=dict(arrowstyle="->", color='k', lw=0.5))
+
+    return fig, ax, quadrants
+
+
+def highlight_network(ax, df, network, x_field, y_field):
+    """Draw an outlier network in blue, named, with its x and y values added to the ticks."""
+    if network not in df.index:
+        return
+
+    row = df.loc[network]
+    ax.scatter(row[x_field], row[y_field], c='blue')
+    ax.annotate(text=network,
+                xy=(row[x_field], row[y_field]),
+                xytext=(-5, -20), textcoords='offset pixels',
+                ha='right',
+                color='blue',
+                alpha=0.3)
+
+    # Label x and y values of outlier on xticks and yticks
+    ax.set_xticks(np.append(ax.get_xticks(), row[x_field]))
+    ax.set_yticks(np.append(ax.get_yticks(), row[y_field]))
+
+
+def quadrant_scatter(df, x_field, y_field, size_scale=None, highlight=None, notes=(), **kwargs):
+    """make_scatter (or make_scatter_with_size_adjustment, with size_scale), plus an outlier and notes.
+
+    highlight is the name of a network to draw with highlight_network, and notes
+    a list of (text, (x, y) in figure fraction, color) to write on the figure
+    (ex: what the good and bad quadrants mean).  Returns (fig, ax, quadrants).
+    """
+    if size_scale is None:
+        fig, ax, quadrants = make_scatter(df, x_field, y_field, **kwargs)
+    else:
+        fig, ax, quadrants = make_scatter_with_size_adjustment(df, x_field, y_field, size_scale, **kwargs)
+
+    if highlight is not None:
+        highlight_network(ax, df, highlight, x_field, y_field)
+
+    for text, xy, color in notes:
+        fig.text(xy[0], xy[1], text, color=color, weight='bold')
+
+    return fig, ax, quadrants
+
+
+def make_no_spend_bar_chart(report_for_client, channels_no_spend):
+    """Purchases of the channels with no spend, compared with the mean purchases of every channel.
+
+    'Other' and '(Blank)' aren't networks, so they're left out, and only the
+    channels with more purchases than the mean are named.  Returns (fig, ax).
+    """
+    import matplotlib.pyplot as plt
+
+    no_spend_but_purchases = channels_no_spend.query("Purchases > 0 & `Network` != 'Other' & `Network` != '(Blank)'")
+
+    total_purchases_from_campaign = channels_no_spend['Purchases'].sum() + report_for_client['Purchases'].sum()
+    num_networks = len(report_for_client.index.values) + len(channels_no_spend.index.values)
+
+    mean_num_purchases_with_spend = round(report_for_client['Purchases'].mean(), 0)
+    mean_num_purchases_from_campaign = round(total_purchases_from_campaign / num_networks, 0)
+
+    above_mean = no_spend_but_purchases['Purchases'] > mean_num_purchases_from_campaign
+    no_spend_yticks = [label if is_above_mean else '' for label, is_above_mean in zip(no_spend_but_purchases.index.values, above_mean)]
+
+    fig, ax = plt.subplots(1,1,figsize=(8,6))
+    no_spend_but_purchases['Purchases'].plot(kind='barh', ax=ax, edgecolor='black')
+    ax.set_xlabel('Number of Purchases on Exit Survey')
+    ax.set_title('Channels where spend = 0', y=-0.06)
+
+    ax.axvline(mean_num_purchases_with_spend, color='red', linestyle='--')
+    ax.annotate(F'Mean purchases\nfrom channels\nthat had spending',
+                xy=(mean_num_purchases_with_spend, 0), xycoords='data',
+                xytext=(5, -175), textcoords='offset pixels', size=11,
+                color='red', ha='left')
+
+    ax.axvline(mean_num_purchases_from_campaign, color='darkviolet', linestyle='--')
+    ax.annotate(F'Mean purchases\nfrom exit survey',
+                xy=(mean_num_purchases_from_campaign, 0), xycoords='data',
+                xytext=(5, -175), textcoords='offset pixels', size=11,
+                color='darkviolet', ha='left')
+
+    ax.set_yticks(range(len(no_spend_yticks)))
+    ax.set_yticklabels(no_spend_yticks)
+
+    ax.xaxis.tick_top()
+    ax.xaxis.set_label_position('top')
+    ax.invert_yaxis()
+
+    return fig, ax
+
+
+def deck_charts(report_for_client, channels_no_spend, highlight=None, size_scale=10, label_placer=None):
+    """Every chart of the presentation deck (the ones in ad_campaign_visuals.py), as a list of Chart.
+
+    highlight is an outlier network to call out on the scatter plots (ex: 'Willow Tv'),
+    and label_placer places the names on them (see make_scatter).
+    """
+    overall = overall_metrics(report_for_client)
+    purchases = 'Purchases'
+    cpv = 'Cost Per Visitor (Spend/Lift)'
+    cpa = 'Cost Per Acquisition (Spend/Purchases)'
+    conversion_rate = 'Conversion Rate (Purchases/Lift)%'
+
+    # Every heatmap below looks up the networks' ranks instead of sorting the report again.  Lower costs are better.
+    rankings = ranking_table(report_for_client, [purchases, 'Spend', 'Lift', cpv, cpa, conversion_rate], ascending=[False, False, False, True, True, False])
+
+    charts = []
+
+    # Purchases, Spend, and Lift, naming the channels in the top/bottom 5 of at least 2 of the 3
+    top, bottom = consensus_networks(report_for_client, ['Purchases', 'Spend', 'Lift'], k=5, votes=2)
+    for field in ['Purchases', 'Spend', 'Lift']:
+        charts.append(Chart(F"heatmap_{field.lower()}", make_heatmap,
+                            dict(df=report_for_client, field=field, color_map='Greys', top_labels=top, bottom_labels=bottom,
+                                 hide_y_label=field != 'Purchases', rankings=rankings)))
+
+    # Purchases paired with each cost efficiency metric, naming the channels in the top/bottom 5 of both.  Lower costs are better.
+    for name, field, ascending, rounding in [('cost_per_visitor', cpv, True, ".2f"),
+                                             ('cost_per_acquisition', cpa, True, ".02f"),
+                                             ('conversion_rate', conversion_rate, False, ".1f")]:
+        top, bottom = consensus_networks(report_for_client, [purchases, field], k=5, votes=2, ascending=[False, ascending])
+        charts.append(Chart(F"heatmap_purchases_vs_{name}", make_heatmap,
+                            dict(df=report_for_client, field=purchases, color_map='Greys', top_labels=top, bottom_labels=bottom,
+                                 annotate_horizontal=False, rankings=rankings)))
+        charts.append(Chart(F"heatmap_{name}", make_heatmap,
+                            dict(df=report_for_client, field=field, color_map='Greys', top_labels=top, bottom_labels=bottom,
+                                 cutoff_value=overall[field], asc=ascending, rounding=rounding, hide_y_label=True, rankings=rankings)))
+
+    # Quadrant scatter plots: (name, x, y, sized by purchases, color of the low x/high y quadrant, good note, bad note)
+    for name, x_field, y_field, sized, color_1, good, bad in [
+            ('spend_vs_purchases', 'Spend', 'Purchases', False, 'green',
+             "Good:\nAbove avg purchases,\nbelow avg spend", "Bad: above avg spend, below avg purchases"),
+            ('lift_vs_purchases', 'Lift', 'Purchases', False, 'green',
+             "Good: Above\navg purchases,\nbelow avg lift", "Bad: Below avg purchases, above avg lift"),
+            ('spend_vs_lift', 'Spend', 'Lift', True, 'green',
+             "Good: Above avg lift,\nbelow avg spend", "Bad: Below avg lift, above avg spend"),
+            ('spend_vs_conversion_rate', 'Spend', conversion_rate, True, 'green',
+             "Good: below\navg spend,\nabove avg\nconversion rate", "Bad: above avg spend, below avg conversion rate"),
+            ('conversion_rate_vs_cost_per_acquisition', conversion_rate, cpa, True, 'red',
+             "Good: above avg conversion rate, below avg cpa", "Bad: below avg conversion rate,\nabove avg cpa"),
+            ('conversion_rate_vs_cost_per_visitor', conversion_rate, cpv, True, 'red',
+             "Good: above avg conversion rate, below avg cost per visitor", "Bad: below avg conversion rate,\nabove avg cost per visitor")]:
+        color_2 = 'red' if color_1 == 'green' else 'green'
+        if color_1 == 'green':
+            notes = [(good, TOP_LEFT_NOTE, 'g'), (bad, BOTTOM_RIGHT_NOTE, 'r')]
+        else:
+            notes = [(bad, TOP_LEFT_NOTE, 'r'), (good, BOTTOM_RIGHT_NOTE, 'g')]
+        # The outlier is only called out on the plots of the base measures, like in the notebook
+        outlier = highlight if y_field in ('Purchases', 'Lift') else None
+        charts.append(Chart(F"scatter_{name}", quadrant_scatter,
+                            dict(df=report_for_client, x_field=x_field, y_field=y_field, size_scale=size_scale if sized else None,
+                                 highlight=outlier, notes=notes, color_1=color_1, color_2=color_2, label_placer=label_placer)))
+
+    charts.append(Chart('bar_no_spend_channels', make_no_spend_bar_chart,
+                        dict(report_for_client=report_for_client, channels_no_spend=channels_no_spend)))
+
+    return charts
+
+
+def render_chart(chart, output_dir, formats=CHART_FORMATS):
+    """Draw chart headless, save it as <output_dir>/<name>.<format> for every format, and close it.
+
+    Returns a ChartTiming, with the time to draw and save the chart.
+    """
+    use_headless_backend()
+    import matplotlib.pyplot as plt
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [os.path.join(output_dir, F"{chart.name}.{extension}") for extension in formats]
+
+    start = time.perf_counter()
+    fig = chart.function(**chart.kwargs)[0]
+    try:
+        for path in paths:
+            fig.savefig(path, bbox_inches='tight')
+    finally:
+        # pyplot holds on to every figure until it's closed
+        plt.close(fig)
+
+    return ChartTiming(chart.name, paths, time.perf_counter() - start)
+
+
+def render_charts(charts, workers=None):
+    """Render (chart, output_dir, formats) jobs in a pool of worker processes.
+
+    Returns a ChartTiming per job, in the same order as charts.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_headless_backend) as pool:
+        futures = [pool.submit(render_chart, chart, output_dir, formats) for chart, output_dir, formats in charts]
+        return [future.result() for future in futures]
+
+
+def render_deck(report_for_client, channels_no_spend, output_dir, formats=CHART_FORMATS, workers=None, highlight=None, label_placer=None):
+    """Render every chart of deck_charts to output_dir, in a pool of worker processes.  Returns a list of ChartTiming."""
+    charts = deck_charts(report_for_client, channels_no_spend, highlight=highlight, label_placer=label_placer)
+    return render_charts([(chart, output_dir, formats) for chart in charts], workers=workers)
+
+
+def load_reports(report_dir):
+    """Returns (report_for_client, channels_no_spend) from the cleaned_csvs of a pipeline output directory."""
+    csv_dir = os.path.join(report_dir, 'cleaned_csvs')
+
+    # The period label (ex: 2017_September_October) starts with the year, which tells report_for_client_2017_... apart from report_for_client_by_month_...
+    report_for_client_path, = glob.glob(os.path.join(csv_dir, 'report_for_client_[0-9]*.csv'))
+    channels_no_spend_path, = glob.glob(os.path.join(csv_dir, 'channels_no_spend_[0-9]*.csv'))
+
+    return pd.read_csv(report_for_client_path, index_col='Network'), pd.read_csv(channels_no_spend_path, index_col='Network')
+
+
+def render_decks(report_dirs, formats=CHART_FORMATS, workers=None, highlight=None, label_placer=None):
+    """Render the deck of every pipeline output directory in report_dirs to <report_dir>/charts.
+
+    The charts of every deck share one pool of worker processes.  Returns a list of ChartTiming.
+    """
+    jobs = []
+    for report_dir in report_dirs:
+        report_for_client, channels_no_spend = load_reports(report_dir)
+        chart_dir = os.path.join(report_dir, 'charts')
+        jobs += [(chart, chart_dir, formats) for chart in deck_charts(report_for_client, channels_no_spend, highlight=highlight, label_placer=label_placer)]
+
+    return render_charts(jobs, workers=workers)
+
+
+def print_chart_timings(timings, file=sys.stdout):
+    """Render time of every chart, one line per chart."""
+    print(F"{'chart':<70}{'time (ms)':>12}", file=file)
+    print('-'*82, file=file)
+    for timing in timings:
+        print(F"{os.path.relpath(os.path.splitext(timing.paths[0])[0]):<70}{timing.seconds * 1000:>12.1f}", file=file)
+    print('-'*82, file=file)
+    print(F"{'total (sum of all charts)':<70}{sum(timing.seconds for timing in timings) * 1000:>12.1f}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the presentation charts of pipeline output directories to image files, without a display.")
+    parser.add_argument('report_dirs', nargs='+', help="output directories of pipeline.run (with a cleaned_csvs directory); the charts go in <dir>/charts")
+    parser.add_argument('--formats', nargs='+', choices=['png', 'svg', 'pdf'], default=list(CHART_FORMATS), help="image formats (default: png svg)")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes (default: number of CPU cores)")
+    parser.add_argument('--highlight', default=None, help="outlier network to call out on the scatter plots (ex: 'Willow Tv')")
+    parser.add_argument('--label-placer', choices=LABEL_PLACERS, default=DEFAULT_LABEL_PLACER, help=F"how the network names on the scatter plots are kept apart (default: {DEFAULT_LABEL_PLACER})")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    timings = render_decks(args.report_dirs, formats=args.formats, workers=args.workers, highlight=args.highlight, label_placer=args.label_placer)
+    print_chart_timings(timings)
+    print(F"{len(timings)} charts in {time.perf_counter() - start:.2f}s")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
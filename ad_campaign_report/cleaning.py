@@ -0,0 +1,145 @@
+"""Cleaning and preprocessing of the raw Purchases, Airings and Lookup sheets."""
+import calendar
+
+import numpy as np
+import pandas as pd
+
+
+# "January" -> 1, "February" -> 2, ...
+MONTH_NUMBERS = {name: number for number, name in enumerate(calendar.month_name) if name}
+
+
+def clean_lookup(lookup_data):
+    """Drop the empty/duplicated parts of the Lookup sheet and normalize its names."""
+    # Lookup data is meant to facilitate a join between the purchases data and the spend/lift data, but lookup data has a row with all null values, which doesn't help the join in any way.  I'll drop that row.
+    lookup_data = lookup_data.dropna(how='all')
+
+    # The Network Name column and Network Name.1 column contain identical information, so we can drop the duplicated column.
+    lookup_data = lookup_data.drop(labels='Network Name.1', axis=1)
+
+    # In order to make sure the joins happen correctly, we need to ensure that the strings we're joining on actually match.
+    lookup_data['Network Name'] = lookup_data['Network Name'].str.lower()
+    lookup_data['Ticker'] = lookup_data['Ticker'].str.upper()
+
+    return lookup_data
+
+
+def clean_airings(airings_data):
+    """Normalize the network tickers of the Airings sheet so they match the Lookup tickers."""
+    airings_data = airings_data.copy()
+    airings_data['Network'] = airings_data['Network'].str.upper()
+
+    return airings_data
+
+
+def build_purchase_dates(year, months, day_nums):
+    """Turn the day-number header of the Purchases sheet into dates.
+
+    The sheet only gives us the starting year, the names of the months it covers
+    and, for every column, a day number.  Whenever a day number is smaller than
+    the one before it (ex: Sept-30 followed by Oct-1, b/c 30 > 1) we've moved on
+    to the next month in months, so the month of every column is the running
+    count of those drops.  Likewise, whenever the month number goes down (ex:
+    December followed by January) we've moved on to the next year.
+
+    Returns a DatetimeIndex with one date per day number.
+    """
+    day_nums = np.asarray(day_nums, dtype=int)
+    if day_nums.size == 0:
+        return pd.DatetimeIndex([], name='date')
+
+    # Index into months for every column: 0 for the first month, 1 for the second...
+    month_positions = np.concatenate(([0], np.cumsum(np.diff(day_nums) < 0)))
+    if month_positions[-1] >= len(months):
+        raise ValueError(F"The day numbers cover {month_positions[-1] + 1} months, but only {len(months)} month names were given")
+
+    month_numbers = np.array([MONTH_NUMBERS[month] for month in months])
+    years = year + np.concatenate(([0], np.cumsum(np.diff(month_numbers) < 0)))
+
+    dates = pd.to_datetime({'year': years[month_positions],
+                            'month': month_numbers[month_positions],
+                            'day': day_nums})
+
+    return pd.DatetimeIndex(dates, name='date')
+
+
+def transpose_purchases(purchase_data):
+    """Turn the wide Purchases sheet into a table with dates as rows and networks as columns.
+
+    The purchases table is extremely messy and would be easier to work with if the rows were dates and the columns were the networks.  If we assume that the first row will always have the year, the third row will always have month names, the fourth row will always have the day numbers, and the second column will always have the names of the networks, we can build the dates with build_purchase_dates and use them for the rows.
+    """
+    current_year = int(purchase_data.iloc[0, :].dropna().iloc[0])
+    months = list(purchase_data.iloc[2, 2:].dropna())
+
+    # Grab the row of day numbers and cast as integers
+    day_nums = np.array(purchase_data.iloc[3, 2:], dtype=int)
+    dates = build_purchase_dates(current_year, months, day_nums)
+
+    # Everything below the row of day numbers is one network per row.  In order to make sure the joins happen correctly, the network names need to be lowercase.
+    networks = purchase_data.iloc[4:, 1].str.lower()
+    purchases = purchase_data.iloc[4:, 2:].to_numpy(dtype=float)
+
+    purchase_data_transpose = pd.DataFrame(data=purchases.T,
+                                           index=dates,
+                                           columns=pd.Index(networks, name='Source'))
+
+    return purchase_data_transpose
+
+
+def campaign_period(purchase_data_transpose):
+    """Return the first and last dates covered by the transposed purchases.
+
+    Also accepts a DatetimeIndex of the dates (or month ends) themselves.  Only
+    the ends of the range are used, so a history that runs over several years
+    gives the right years for both.
+    """
+    if isinstance(purchase_data_transpose, pd.DatetimeIndex):
+        dates = purchase_data_transpose
+    else:
+        dates = purchase_data_transpose.index
+
+    return dates.min(), dates.max()
+
+
+def categorize(purchase_data_transpose, airings_data, lookup_data):
+    """Store the network names and tickers as categoricals with one shared set of categories each.
+
+    Network names appear in the Lookup table and as the columns of the transposed
+    purchases, and tickers appear in the Lookup table and in every row of the
+    airings.  Once they've been normalized, we convert them to categoricals that
+    share the same categories, so the merges and groupbys on them work on integer
+    codes instead of strings, and each airing only stores a small code for its
+    network.
+
+    airings_data can be None, if the airings are being read in chunks.
+    """
+    network_names = set(lookup_data['Network Name'].dropna()) | set(purchase_data_transpose.columns.dropna())
+    network_names = pd.CategoricalDtype(sorted(network_names))
+
+    tickers = set(lookup_data['Ticker'].dropna())
+    if airings_data is not None:
+        tickers |= set(airings_data['Network'].dropna())
+    tickers = pd.CategoricalDtype(sorted(tickers))
+
+    lookup_data = lookup_data.astype({'Network Name': network_names, 'Ticker': tickers})
+
+    if airings_data is not None:
+        airings_data = airings_data.astype({'Network': tickers})
+
+    purchase_data_transpose = purchase_data_transpose.copy()
+    purchase_data_transpose.columns = pd.CategoricalIndex(purchase_data_transpose.columns, dtype=network_names, name='Source')
+
+    return purchase_data_transpose, airings_data, lookup_data
+
+
+def clean_workbook(purchase_data, airings_data, lookup_data):
+    """Clean all three sheets.  Returns (purchase_data_transpose, airings_data, lookup_data).
+
+    airings_data can be None, if the airings are being read in chunks (see streaming.py).
+    """
+    purchase_data_transpose = transpose_purchases(purchase_data)
+    if airings_data is not None:
+        airings_data = clean_airings(airings_data)
+    lookup_data = clean_lookup(lookup_data)
+
+    return categorize(purchase_data_transpose, airings_data, lookup_data)
@@ -0,0 +1,76 @@
+"""A daily Network x Date cube of Purchases, Spend and Lift, rolled up to coarser time grains.
+
+The raw purchases and airings are grouped once, by network and day.  Every other
+grain (week, month, quarter) is rolled up from that cube, which has at most one
+row per network per day, instead of going back to the raw airings:
+
+    cube = build_daily_cube(purchase_data_transpose, airings_data)
+    weekly = roll_up_cube(cube, 'week')
+    purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_week = aggregate(
+        purchase_data_transpose, None, lookup_data, monthly=weekly)
+
+A rolled up cube has the same layout as aggregation.aggregate_monthly, so the rest
+of the pipeline works the same at any grain; the periods are labelled with their
+last day (ex: the Sunday of each week), like pd.Grouper does.
+"""
+import pandas as pd
+
+from .aggregation import aggregate_purchases_by_month, aggregate_spend_lift_by_network_and_month, grouper_freq
+
+
+# Grain name: pandas (Period) frequency.  Weeks run Monday to Sunday.
+GRAINS = {'day': 'D',
+          'week': 'W',
+          'month': 'M',
+          'quarter': 'Q'}
+
+DEFAULT_GRAIN = 'month'
+
+
+def grain_freq(grain):
+    """The pandas frequency of a grain in GRAINS."""
+    try:
+        return GRAINS[grain]
+    except KeyError:
+        raise ValueError(F"Unknown grain {grain!r}, expected one of {list(GRAINS)}") from None
+
+
+def build_daily_cube(purchase_data_transpose, airings_data):
+    """Returns (purchases_by_day, spend_lift_by_network_and_day).
+
+    purchases_by_day has one row per day and one column per network name, and
+    spend_lift_by_network_and_day is indexed by (Network ticker, day), with only the
+    days each network aired on.
+    """
+    return aggregate_purchases_by_month(purchase_data_transpose, freq='D'), aggregate_spend_lift_by_network_and_month(airings_data, freq='D')
+
+
+def period_ends(dates, freq):
+    """The last day of the period (of frequency freq) each of dates falls in, i.e. the label pd.Grouper would give it."""
+    return pd.DatetimeIndex(dates).to_period(freq).to_timestamp(how='end').normalize()
+
+
+def roll_up_cube(cube, grain):
+    """Roll a daily cube (see build_daily_cube) up to grain.
+
+    Returns (purchases_by_period, spend_lift_by_network_and_period), in the same
+    layout as aggregation.aggregate_monthly, so it can be passed as monthly to the
+    aggregation functions.
+    """
+    freq = grain_freq(grain)
+    purchases_by_day, spend_lift_by_network_and_day = cube
+
+    if freq == 'D':
+        return cube
+
+    purchases_by_period = purchases_by_day.groupby(pd.Grouper(freq=grouper_freq(freq))).sum()
+
+    networks = spend_lift_by_network_and_day.index.get_level_values('Network')
+    periods = period_ends(spend_lift_by_network_and_day.index.get_level_values('Date/Time ET'), freq)
+    spend_lift_by_network_and_period = spend_lift_by_network_and_day.groupby([networks, periods], observed=True).sum()
+    spend_lift_by_network_and_period.index = spend_lift_by_network_and_period.index.set_names(['Network', 'Date/Time ET'])
+
+    # Same as when rolling the months up to network totals, round the added up Spend to the cent
+    spend_lift_by_network_and_period['Spend'] = spend_lift_by_network_and_period['Spend'].round(2)
+
+    return purchases_by_period, spend_lift_by_network_and_period
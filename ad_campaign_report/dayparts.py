@@ -0,0 +1,119 @@
+"""Spend, Lift and cost per visitor by daypart and by hour of the day, from the airings' Date/Time ET.
+
+The airings are only grouped once, by network and hour of the day (at most 24
+rows per network), using the hour of each timestamp as an integer array.
+Dayparts are bins of hours, so the daypart tables are rolled up from that by
+looking every hour up in a 24 entry array, never by looking at individual airings.
+
+Purchases are only recorded by day, so there's no cost per acquisition at these
+grains.
+"""
+import numpy as np
+import pandas as pd
+
+from .metrics import METRICS, evaluate_metrics, report_rounding
+
+
+# Broadcast dayparts (Eastern Time), as (name, first hour).  Each one runs until the next one starts.
+DAYPARTS = [('Early Morning', 6),
+            ('Daytime', 9),
+            ('Early Fringe', 16),
+            ('Prime Access', 19),
+            ('Prime', 20),
+            ('Late Night', 23),
+            ('Overnight', 2)]
+
+DAYPART_DTYPE = pd.CategoricalDtype([name for name, _ in DAYPARTS], ordered=True)
+
+
+def _daypart_codes():
+    # codes[hour] is the position in DAYPARTS of the daypart the hour falls in
+    codes = np.empty(24, dtype=np.int8)
+    starts = sorted((start, code) for code, (_, start) in enumerate(DAYPARTS))
+    for hour in range(24):
+        # The last daypart to start at or before this hour, wrapping around midnight
+        earlier = [code for start, code in starts if start <= hour]
+        codes[hour] = earlier[-1] if earlier else starts[-1][1]
+    return codes
+
+
+HOUR_TO_DAYPART = _daypart_codes()
+
+# Cost per visitor is the only client facing metric that doesn't need Purchases
+DAYPART_METRICS = ['Cost Per Visitor (Spend/Lift)']
+
+
+def daypart_of_hours(hours):
+    """The daypart (an ordered categorical) of every hour (0-23) in hours."""
+    return pd.Categorical.from_codes(HOUR_TO_DAYPART[np.asarray(hours, dtype=np.intp)], dtype=DAYPART_DTYPE)
+
+
+def aggregate_spend_lift_by_network_and_hour(airings_data):
+    """Spend and Lift indexed by (Network ticker, Hour), with only the hours each network aired in."""
+    # int64, b/c .dt.hour is int32 on pandas >= 2 and the DuckDB engine gives int64 hours
+    hours = pd.Index(airings_data['Date/Time ET'].dt.hour.to_numpy(dtype=np.int64), name='Hour')
+
+    # observed=True, b/c Network is a categorical, same as for the monthly aggregates
+    return airings_data.groupby([airings_data['Network'], hours], observed=True)[['Spend', 'Lift']].sum()
+
+
+def add_daypart_metrics(df):
+    """Cost per visitor of a Spend/Lift table, rounded for the reports."""
+    metrics = evaluate_metrics(df, [METRICS[column] for column in DAYPART_METRICS])
+    df = df.assign(**metrics)
+
+    df = df.round(report_rounding())
+    df['Lift'] = df['Lift'].astype(int)
+
+    return df
+
+
+def client_spend_lift_by_hour(spend_lift_by_network_and_hour, lookup_data, report_for_client):
+    """Spend and Lift by network name and hour, for the channels in report_for_client.
+
+    The hourly Spend and Lift (by ticker) are joined to the Lookup table to get the
+    network names, the same way as in aggregation.py, so both daypart reports add
+    up to the Spend and Lift of report_for_client.  Returns a DataFrame with
+    Network, Hour, Spend and Lift columns.
+    """
+    lookup = lookup_data[['Network Name', 'Ticker']].dropna(subset=['Ticker'])
+    by_hour = lookup.merge(right=spend_lift_by_network_and_hour.reset_index(), left_on='Ticker', right_on='Network', how='inner')
+
+    networks = by_hour['Network Name'].astype(str).str.replace('_', ' ').str.title()
+    by_hour = pd.DataFrame({'Network': networks, 'Hour': by_hour['Hour'], 'Spend': by_hour['Spend'], 'Lift': by_hour['Lift']})
+
+    # The same channels as the other client reports
+    return by_hour[by_hour['Network'].isin(report_for_client.index)]
+
+
+def build_report_by_hour(spend_lift_by_network_and_hour, lookup_data, report_for_client):
+    """Spend, Lift and cost per visitor of every hour of the day, across the channels in report_for_client."""
+    by_hour = client_spend_lift_by_hour(spend_lift_by_network_and_hour, lookup_data, report_for_client)
+    by_hour = by_hour.groupby('Hour')[['Spend', 'Lift']].sum()
+    by_hour = by_hour.reindex(pd.RangeIndex(24, name='Hour'), fill_value=0)
+
+    # Label the hours (ex: 20:00), and add the daypart each hour belongs to for reference
+    by_hour.index = pd.MultiIndex.from_arrays([pd.Index([F"{hour:02d}:00" for hour in range(24)], name='Hour'),
+                                               pd.CategoricalIndex(daypart_of_hours(range(24)), name='Daypart')])
+
+    return add_daypart_metrics(by_hour)
+
+
+def build_report_by_daypart(spend_lift_by_network_and_hour, lookup_data, report_for_client):
+    """Spend, Lift and cost per visitor by (Network, Daypart), for the channels in report_for_client."""
+    by_hour = client_spend_lift_by_hour(spend_lift_by_network_and_hour, lookup_data, report_for_client)
+
+    networks = pd.Index(by_hour['Network'], name='Network')
+    dayparts = pd.CategoricalIndex(daypart_of_hours(by_hour['Hour']), name='Daypart')
+
+    # A row for every daypart each channel aired in
+    by_daypart = by_hour.groupby([networks, dayparts], observed=True)[['Spend', 'Lift']].sum()
+    by_daypart = by_daypart.sort_index(level=['Network', 'Daypart'])
+
+    return add_daypart_metrics(by_daypart)
+
+
+def build_daypart_reports(spend_lift_by_network_and_hour, lookup_data, report_for_client):
+    """Returns (report_by_daypart, report_by_hour)."""
+    return (build_report_by_daypart(spend_lift_by_network_and_hour, lookup_data, report_for_client),
+            build_report_by_hour(spend_lift_by_network_and_hour, lookup_data, report_for_client))
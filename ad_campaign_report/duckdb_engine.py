@@ -0,0 +1,209 @@
+"""The aggregation and join stages as lazy DuckDB queries over Parquet files.
+
+aggregation.py does the grouping and joining with eager pandas, which needs every
+airing in memory at once.  This module expresses the same aggregations and joins
+as SQL over Parquet files, which DuckDB plans as a whole, reads column by column
+and spills to disk when it runs out of memory, so the inputs can be a multi-year,
+multi-brand history split over any number of files:
+
+    purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month = aggregate_parquet(
+        'history/purchases/*.parquet', 'history/airings/*.parquet', 'history/lookup.parquet')
+
+The results are the same tables aggregation.aggregate returns, so the rest of the
+pipeline doesn't change.  The inputs are the cleaned sheets, in the layout
+written by write_parquet_inputs:
+
+* purchases: one row per network per day (date, Source, Purchases), rather than
+  the wide one column per network layout of purchase_data_transpose
+* airings: Date/Time ET, Network (ticker), Spend, Lift
+* lookup: position (the order of the rows in the Lookup sheet), Network Name, Ticker
+
+duckdb is only imported when these functions are used, so it's only needed for
+engine='duckdb' (see pipeline.run).
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+from .cube import grain_freq
+
+
+ENGINES = ('pandas', 'duckdb')
+
+# SQL for the last day of the period a date or timestamp falls in, by pandas frequency (see cube.GRAINS).
+# These are the same labels pd.Grouper gives the periods.
+PERIOD_END_SQL = {'D': "CAST({column} AS DATE)",
+                  'W': "CAST(date_trunc('week', CAST({column} AS DATE)) AS DATE) + 6",
+                  'M': "last_day(CAST({column} AS DATE))",
+                  'Q': "last_day(CAST(date_trunc('quarter', CAST({column} AS DATE)) AS DATE) + INTERVAL 2 MONTH)"}
+
+
+def write_parquet_inputs(purchase_data_transpose, airings_data, lookup_data, directory):
+    """Write the cleaned sheets to purchases.parquet, airings.parquet and lookup.parquet in directory.
+
+    Returns the paths of the three files, in that order.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, F"{name}.parquet") for name in ('purchases', 'airings', 'lookup')]
+
+    purchases = purchase_data_transpose.copy()
+    purchases.columns = pd.Index(purchases.columns.astype(str), name='Source')
+    purchases = purchases.stack().rename('Purchases').reset_index()
+    purchases['Source'] = purchases['Source'].astype(str)
+    purchases.to_parquet(paths[0], index=False)
+
+    airings = airings_data[['Date/Time ET', 'Network', 'Spend', 'Lift']].astype({'Network': str})
+    # astype(str) turned missing tickers into 'nan', which we put back as missing
+    airings['Network'] = airings['Network'].where(airings_data['Network'].notna().to_numpy())
+    airings.to_parquet(paths[1], index=False)
+
+    lookup = lookup_data[['Network Name', 'Ticker']].astype(object)
+    lookup = lookup.where(lookup.notna(), None).astype({'Network Name': str})
+    lookup.insert(0, 'position', range(len(lookup)))
+    lookup.to_parquet(paths[2], index=False)
+
+    return paths
+
+
+def _source(paths):
+    # read_parquet() of a path, glob pattern or list of them
+    if isinstance(paths, str):
+        paths = [paths]
+    quoted = ', '.join("'" + path.replace("'", "''") + "'" for path in paths)
+    return F"read_parquet([{quoted}])"
+
+
+def _connect(connection):
+    if connection is not None:
+        return connection
+
+    import duckdb
+
+    return duckdb.connect()
+
+
+def _network_names(names):
+    # Cleanup, the same as in aggregation.py
+    return pd.Index(names, dtype=object).str.replace('_', ' ').str.title()
+
+
+def aggregate_by_network_parquet(purchases, airings, lookup, connection=None):
+    """Total Purchases, Spend and Lift for every network in the Lookup table, like aggregation.aggregate_by_network."""
+    connection = _connect(connection)
+
+    result = connection.execute(F"""
+        WITH lookup AS (SELECT position, "Network Name", Ticker FROM {_source(lookup)}),
+             purchases_by_network AS (SELECT Source, sum(Purchases) AS Purchases
+                                      FROM {_source(purchases)}
+                                      GROUP BY Source),
+             spend_and_lift_by_network AS (SELECT Network, sum(Spend) AS Spend, CAST(sum(Lift) AS DOUBLE) AS Lift
+                                           FROM {_source(airings)}
+                                           WHERE "Date/Time ET" IS NOT NULL
+                                           GROUP BY Network)
+        SELECT lookup."Network Name",
+               coalesce(purchases_by_network.Purchases, 0) AS Purchases,
+               coalesce(round(spend_and_lift_by_network.Spend, 2), 0) AS Spend,
+               coalesce(spend_and_lift_by_network.Lift, 0) AS Lift
+        FROM lookup
+        LEFT JOIN purchases_by_network ON purchases_by_network.Source = lookup."Network Name"
+        LEFT JOIN spend_and_lift_by_network ON spend_and_lift_by_network.Network = lookup.Ticker
+        ORDER BY lookup.position
+    """).df()
+
+    result.index = _network_names(result.pop('Network Name')).rename('Network Name')
+
+    return result.astype(float)
+
+
+def aggregate_by_network_and_period_parquet(purchases, airings, lookup, grain='month', connection=None):
+    """Purchases, Spend and Lift for every network in the Lookup table and every period of the campaign.
+
+    The same table as aggregation.aggregate_by_network_and_month (or, for other
+    grains, as when it's given a cube rolled up to grain), indexed by
+    (Network Name, date).
+    """
+    connection = _connect(connection)
+    freq = grain_freq(grain)
+    period_end = PERIOD_END_SQL[freq]
+
+    # Weeks and quarters are rolled up from days in pandas (see cube.roll_up_cube), which rounds their Spend to the cent
+    period_spend = 'sum(Spend)' if freq in ('D', 'M') else 'round(sum(Spend), 2)'
+
+    result = connection.execute(F"""
+        WITH lookup AS (SELECT position, "Network Name", Ticker FROM {_source(lookup)}),
+             purchases AS (SELECT date, Source, Purchases FROM {_source(purchases)}),
+             periods AS (SELECT DISTINCT {period_end.format(column='day')} AS period
+                         FROM (SELECT unnest(generate_series(min(date), max(date), INTERVAL 1 DAY)) AS day FROM purchases)),
+             purchases_by_period AS (SELECT Source, {period_end.format(column='date')} AS period, sum(Purchases) AS Purchases
+                                     FROM purchases
+                                     GROUP BY ALL),
+             spend_lift_by_period AS (SELECT Network, {period_end.format(column='"Date/Time ET"')} AS period,
+                                             {period_spend} AS Spend, CAST(sum(Lift) AS DOUBLE) AS Lift
+                                      FROM {_source(airings)}
+                                      WHERE "Date/Time ET" IS NOT NULL
+                                      GROUP BY ALL)
+        SELECT lookup."Network Name",
+               periods.period AS date,
+               coalesce(purchases_by_period.Purchases, 0) AS Purchases,
+               coalesce(spend_lift_by_period.Spend, 0) AS Spend,
+               coalesce(spend_lift_by_period.Lift, 0) AS Lift
+        FROM lookup
+        CROSS JOIN periods
+        LEFT JOIN purchases_by_period ON purchases_by_period.Source = lookup."Network Name" AND purchases_by_period.period = periods.period
+        LEFT JOIN spend_lift_by_period ON spend_lift_by_period.Network = lookup.Ticker AND spend_lift_by_period.period = periods.period
+        ORDER BY lookup.position, periods.period
+    """).df()
+
+    result.index = pd.MultiIndex.from_arrays([_network_names(result.pop('Network Name')),
+                                              pd.DatetimeIndex(result.pop('date')).astype('datetime64[ns]')],
+                                             names=['Network Name', 'date'])
+
+    return result.astype(float)
+
+
+def aggregate_spend_lift_by_network_and_hour_parquet(airings, connection=None):
+    """Spend and Lift indexed by (Network ticker, Hour), like dayparts.aggregate_spend_lift_by_network_and_hour."""
+    connection = _connect(connection)
+
+    result = connection.execute(F"""
+        SELECT Network, CAST(hour("Date/Time ET") AS BIGINT) AS Hour, sum(Spend) AS Spend, sum(Lift) AS Lift
+        FROM {_source(airings)}
+        WHERE Network IS NOT NULL AND "Date/Time ET" IS NOT NULL
+        GROUP BY ALL
+        ORDER BY Network, Hour
+    """).df()
+
+    return result.set_index(['Network', 'Hour'])
+
+
+def aggregate_parquet(purchases, airings, lookup, grain='month', connection=None):
+    """Returns (purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month), like aggregation.aggregate.
+
+    purchases, airings and lookup are paths or glob patterns (or lists of them) of
+    Parquet files in the layout of write_parquet_inputs.  Both queries run on the
+    same DuckDB connection (a new in-memory one by default).
+    """
+    connection = _connect(connection)
+
+    return (aggregate_by_network_parquet(purchases, airings, lookup, connection=connection),
+            aggregate_by_network_and_period_parquet(purchases, airings, lookup, grain=grain, connection=connection))
+
+
+def aggregate_frames(purchase_data_transpose, airings_data, lookup_data, grain='month', hours=False):
+    """aggregate_parquet of cleaned sheets that are already in memory, via Parquet files in a temporary directory.
+
+    Returns (purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month),
+    plus the Spend and Lift by network and hour (see dayparts.py) if hours=True.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        purchases, airings, lookup = write_parquet_inputs(purchase_data_transpose, airings_data, lookup_data, directory)
+        connection = _connect(None)
+        try:
+            aggregated = aggregate_parquet(purchases, airings, lookup, grain=grain, connection=connection)
+            if hours:
+                aggregated += (aggregate_spend_lift_by_network_and_hour_parquet(airings, connection=connection),)
+        finally:
+            connection.close()
+
+    return aggregated
@@ -0,0 +1,221 @@
+"""Writing the metrics tables and reports to CSV, HTML and PDF files."""
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .render import get_renderer
+from .reports import build_summary
+
+
+ArtifactTiming = namedtuple('ArtifactTiming', ['path', 'kind', 'seconds'])
+
+# Name of the HTML/PDF file with every report in it, when export(combined=True)
+COMBINED_REPORT_NAME = 'campaign_report'
+
+# Shared by every table in the combined HTML document
+COMBINED_HTML_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; font-size: 12px; }
+table { border-collapse: collapse; margin-bottom: 24px; }
+th, td { border: 1px solid #999999; padding: 2px 6px; text-align: right; }
+thead th { background-color: #eeeeee; }
+h2 { page-break-before: always; }
+h2.contents { page-break-before: avoid; }
+"""
+
+
+def period_label(start, end, every_month=True):
+    """'2017_September_October' style label used in the CSV file names, from the first and last dates of the campaign.
+
+    By default every month of the campaign is named, after the year it starts in
+    (ex: '2017_September_October_November'), as the report has always named its
+    files.  With every_month=False only the first and last months are named, and
+    the year is repeated when the campaign ends in a later year than it started,
+    ex: '2017_November_2018_February'.  The incremental mode uses that, since its
+    history keeps growing.
+    """
+    if every_month:
+        months = pd.period_range(start, end, freq='M').to_timestamp().month_name().unique()
+        return str(start.year) + '_' + '_'.join(months)
+
+    label = F"{start.year}_{start.month_name()}"
+    if end.year != start.year:
+        label += F"_{end.year}"
+    if (end.year, end.month) != (start.year, start.month):
+        label += F"_{end.month_name()}"
+
+    return label
+
+
+def output_dirs(output_dir):
+    """Create (if needed) and return the csv, html and pdf directories under output_dir."""
+    csv_dir = os.path.join(output_dir, 'cleaned_csvs')
+    html_dir = os.path.join(output_dir, 'reports', 'html')
+    pdf_dir = os.path.join(output_dir, 'reports', 'pdfs')
+
+    for directory in (csv_dir, html_dir, pdf_dir):
+        os.makedirs(directory, exist_ok=True)
+
+    return csv_dir, html_dir, pdf_dir
+
+
+def combined_html(sections, title):
+    """One HTML document with a title, a linked table of contents and a heading + table per (heading, df) in sections."""
+    toc = '\n'.join(F'<li><a href="#section{number}">{heading}</a></li>' for number, (heading, _) in enumerate(sections))
+    body = '\n'.join(F'<h2 id="section{number}">{heading}</h2>\n{df.to_html(col_space="100px")}'
+                     for number, (heading, df) in enumerate(sections))
+
+    return (F"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{title}</title>\n"
+            F"<style>{COMBINED_HTML_STYLE}</style>\n</head>\n<body>\n<h1>{title}</h1>\n"
+            F"<h2 class=\"contents\">Contents</h2>\n<ul>\n{toc}\n</ul>\n{body}\n</body>\n</html>\n")
+
+
+def combined_sections(report_for_client, report_for_client_by_month, channels_no_spend, grain='month', extra_reports=None):
+    """The (heading, df) sections of the combined report: the summary metrics followed by the three reports.
+
+    extra_reports ({name: DataFrame}) are added at the end, with their names as headings.
+    """
+    sections = [('Summary', build_summary(report_for_client, channels_no_spend)),
+                ('Report by network', report_for_client),
+                (F"Report by network and {grain}", report_for_client_by_month),
+                ('Purchases from channels with no spend', channels_no_spend)]
+    sections += [(name.replace('_', ' ').capitalize(), df) for name, df in (extra_reports or {}).items()]
+
+    return sections
+
+
+def export_combined_report(sections, name, output_dir, title, renderer=None):
+    """Write every (heading, df) in sections to one HTML file and one PDF, with a table of contents.
+
+    Returns the paths of the HTML and PDF files.
+    """
+    renderer = get_renderer(renderer)
+    timings = _write_combined_report(sections, name, output_dir, title, renderer)
+
+    return timings[0].path, timings[1].path
+
+
+def _timed(kind, path, write):
+    start = time.perf_counter()
+    write()
+    return ArtifactTiming(path, kind, time.perf_counter() - start)
+
+
+def _write_csv(df, path):
+    return [_timed('csv', path, lambda: df.to_csv(path))]
+
+
+def _write_report(df, name, output_dir, renderer, render_lock):
+    # The PDF needs the HTML file, so each report's HTML and PDF are written one
+    # after the other, while different reports (and the CSVs) run concurrently.
+    _, html_dir, pdf_dir = output_dirs(output_dir)
+    html_path = os.path.join(html_dir, F"{name}.html")
+    pdf_path = os.path.join(pdf_dir, F"{name}.pdf")
+
+    def write_html():
+        with open(html_path, 'w') as f:
+            f.write(df.to_html(col_space='100px'))
+
+    timings = [_timed('html', html_path, write_html)]
+
+    # The lock is taken outside of the timing, so waiting for another report's PDF doesn't count
+    if render_lock is None:
+        timings.append(_timed('pdf', pdf_path, lambda: renderer.render(df, html_path, pdf_path)))
+    else:
+        with render_lock:
+            timings.append(_timed('pdf', pdf_path, lambda: renderer.render(df, html_path, pdf_path)))
+
+    return timings
+
+
+def _write_combined_report(sections, name, output_dir, title, renderer):
+    _, html_dir, pdf_dir = output_dirs(output_dir)
+    html_path = os.path.join(html_dir, F"{name}.html")
+    pdf_path = os.path.join(pdf_dir, F"{name}.pdf")
+
+    def write_html():
+        with open(html_path, 'w') as f:
+            f.write(combined_html(sections, title))
+
+    return [_timed('html', html_path, write_html),
+            _timed('pdf', pdf_path, lambda: renderer.render_document(sections, html_path, pdf_path, title=title))]
+
+
+def export(purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month,
+           report_for_client, report_for_client_by_month, channels_no_spend,
+           output_dir, current_year_and_months, pdfs=True, renderer=None, max_workers=None,
+           combined=False, grain='month', extra_reports=None):
+    """Write the metrics tables and reports as CSVs, and the reports as HTML and PDF files.
+
+    The writes are independent of each other (apart from each PDF needing its HTML
+    file), so they run concurrently on a pool of max_workers threads (default:
+    ThreadPoolExecutor's default; 1 writes them one after another).  PDF
+    conversions mostly wait on wkhtmltopdf, so they overlap well.
+
+    renderer is the PDF backend (see render.py); one instance is shared by all
+    three reports.  Backends that aren't thread safe render one PDF at a time.
+
+    With combined=True, the three reports and the summary metrics (see
+    reports.build_summary) go into one HTML file and one PDF, with a table of
+    contents, named COMBINED_REPORT_NAME, instead of a file per report.  That's
+    one PDF render per run instead of three.
+
+    grain is the period of the "by month" table and report (see cube.GRAINS),
+    which are named after it (ex: report_for_client_by_week).
+
+    extra_reports ({name: DataFrame}, ex: the daypart reports) are written like
+    the three reports: as a CSV and an HTML/PDF file each, or as extra sections
+    of the combined report.
+
+    Returns a list of ArtifactTiming (path, kind, seconds), one per file written.
+    """
+    csv_dir, _, _ = output_dirs(output_dir)
+    tables = {'purchases_spend_lift_by_network': purchases_spend_lift_by_network,
+              F"purchases_spend_lift_by_network_and_{grain}": purchases_spend_lift_by_network_and_month,
+              'report_for_client': report_for_client,
+              F"report_for_client_by_{grain}": report_for_client_by_month,
+              'channels_no_spend': channels_no_spend}
+    reports = {'report_for_client': report_for_client,
+               F"report_for_client_by_{grain}": report_for_client_by_month,
+               'report_channels_no_spend': channels_no_spend}
+
+    if extra_reports:
+        tables.update(extra_reports)
+        reports.update(extra_reports)
+
+    if pdfs:
+        renderer = get_renderer(renderer)
+        render_lock = None if getattr(renderer, 'thread_safe', False) else threading.Lock()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_write_csv, df, os.path.join(csv_dir, F"{name}_{current_year_and_months}.csv"))
+                   for name, df in tables.items()]
+        if pdfs and combined:
+            title = F"TV Campaign Report {current_year_and_months.replace('_', ' ')}"
+            sections = combined_sections(report_for_client, report_for_client_by_month, channels_no_spend, grain=grain,
+                                        extra_reports=extra_reports)
+            futures.append(pool.submit(_write_combined_report, sections, COMBINED_REPORT_NAME, output_dir, title, renderer))
+        elif pdfs:
+            futures += [pool.submit(_write_report, df, name, output_dir, renderer, render_lock)
+                        for name, df in reports.items()]
+
+        # Collect in submission order, so the timings come out in a stable order
+        timings = []
+        for future in futures:
+            timings.extend(future.result())
+
+    return timings
+
+
+def print_timings(timings, file=sys.stdout):
+    """Timing breakdown of export(), one line per artifact."""
+    print(F"{'artifact':<70}{'time (ms)':>12}", file=file)
+    print('-'*82, file=file)
+    for timing in timings:
+        print(F"{os.path.basename(timing.path):<70}{timing.seconds * 1000:>12.1f}", file=file)
+    print('-'*82, file=file)
+    print(F"{'total (sum of all writes)':<70}{sum(timing.seconds for timing in timings) * 1000:>12.1f}", file=file)
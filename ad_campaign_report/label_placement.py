@@ -0,0 +1,170 @@
+"""Placing the network names on the scatter plots so they don't overlap.
+
+adjustText moves the labels with an iterative force simulation, which is the
+slowest part of drawing a scatter plot and gets much slower as the number of
+labels grows.  place_labels_greedy is a faster alternative: the labels are
+placed one at a time, each at the first of a list of candidate positions (right
+next to its point, then further and further above and below it) that doesn't collide
+with a label placed before it or with a point.  Collisions are only checked
+against the boxes in the same cells of a grid over the axes, so each check
+looks at a handful of boxes instead of all of them.
+
+The placer is picked per call, by name (see LABEL_PLACERS):
+
+    place_labels(texts, ax, label_placer='greedy', x=df['Spend'], y=df['Purchases'])
+
+count_overlaps tells how many pairs of labels still overlap after placing them.
+"""
+from collections import defaultdict
+
+import numpy as np
+
+
+ADJUST_TEXT = 'adjust_text'
+GREEDY = 'greedy'
+
+LABEL_PLACERS = (ADJUST_TEXT, GREEDY)
+
+DEFAULT_LABEL_PLACER = ADJUST_TEXT
+
+# Marker size (area in points^2) of ax.scatter when none is given
+DEFAULT_MARKER_SIZE = 36
+
+
+def _label_boxes(texts, renderer):
+    # [x0, y0, x1, y1] of every label, in pixels
+    return np.array([text.get_window_extent(renderer).extents for text in texts]).reshape(-1, 4)
+
+
+class _BoxGrid:
+    """Boxes (in pixels) bucketed by the grid cells they cover, for quick collision checks."""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+
+    def _cells(self, box):
+        x0, y0, x1, y1 = (np.array(box) // self.cell_size).astype(int)
+        return [(i, j) for i in range(x0, x1 + 1) for j in range(y0, y1 + 1)]
+
+    def add(self, box):
+        for cell in self._cells(box):
+            self.cells[cell].append(box)
+
+    def collides(self, box):
+        x0, y0, x1, y1 = box
+        for cell in self._cells(box):
+            for other in self.cells.get(cell, ()):
+                if x0 < other[2] and other[0] < x1 and y0 < other[3] and other[1] < y1:
+                    return True
+        return False
+
+
+def _candidate_offsets(width, height, nudge, max_steps, only_move):
+    # Right next to the point first, then a step further above and below it each time (and to the
+    # left of the point, unless the labels may only move up and down)
+    offsets = [(nudge, 0)]
+    for step in range(1, max_steps + 1):
+        offsets += [(nudge, step * height), (nudge, -step * height)]
+    if only_move != 'y':
+        offsets += [(-width - 2 * nudge - dx, dy) for dx, dy in offsets]
+    return offsets
+
+
+def place_labels_greedy(texts, ax, x=None, y=None, sizes=DEFAULT_MARKER_SIZE, only_move='y', max_steps=20, arrowprops=None):
+    """Move every text in texts to the first candidate position that doesn't overlap anything placed so far.
+
+    x and y are the points of the scatter plot, which the labels keep clear of,
+    and sizes their marker sizes (like the s argument of ax.scatter).  Labels are
+    placed in the order of texts, and stay inside the axes.  A label with no free
+    position is left on its point.  Labels that had to move up or down get an
+    arrow back to their point, drawn with arrowprops (ex: dict(arrowstyle="->")).
+    Returns the number of labels that were moved up or down.
+    """
+    if len(texts) == 0:
+        return 0
+
+    renderer = ax.figure.canvas.get_renderer()
+    to_pixels = ax.transData
+    to_data = ax.transData.inverted()
+
+    boxes = _label_boxes(texts, renderer)
+    widths = boxes[:, 2] - boxes[:, 0]
+    heights = boxes[:, 3] - boxes[:, 1]
+
+    # Cells about the size of a label, so a label only ever covers a few of them
+    grid = _BoxGrid(cell_size=max(np.median(widths), np.median(heights), 1))
+
+    # Half the width of every marker, in pixels (sizes are areas in points^2, and there are 72 points to
+    # an inch), by the position of its point.  The labels start out on their points, so a label is
+    # nudged right by half the width of the marker it's on.
+    marker_halves = {}
+    if x is not None and y is not None:
+        points = to_pixels.transform(np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)]))
+        halves = np.broadcast_to(np.sqrt(np.asarray(sizes, dtype=float)) / 2 * ax.figure.dpi / 72, len(points))
+        finite = np.isfinite(points).all(axis=1)
+        for (px, py), half in zip(points[finite], halves[finite]):
+            grid.add((px - half, py - half, px + half, py + half))
+            marker_halves[(px, py)] = half
+
+    ax_x0, ax_y0, ax_x1, ax_y1 = ax.get_window_extent(renderer).extents
+
+    moved = 0
+    for text, box, width, height in zip(texts, boxes, widths, heights):
+        point = text.get_position()
+        anchor = to_pixels.transform(point)
+        nudge = marker_halves.get(tuple(anchor), 0)
+
+        for dx, dy in _candidate_offsets(width, height, nudge, max_steps, only_move):
+            candidate = (box[0] + dx, box[1] + dy, box[2] + dx, box[3] + dy)
+            inside = ax_x0 <= candidate[0] and candidate[2] <= ax_x1 and ax_y0 <= candidate[1] and candidate[3] <= ax_y1
+            if inside and not grid.collides(candidate):
+                break
+        else:
+            # Nowhere to go, the label stays where it was
+            dx, dy = 0, 0
+            candidate = tuple(box)
+
+        grid.add(candidate)
+
+        text.set_position(to_data.transform((anchor[0] + dx, anchor[1] + dy)))
+
+        # A label right next to its point doesn't need an arrow
+        if dy != 0:
+            moved += 1
+            if arrowprops is not None:
+                ax.annotate('', xy=point, xytext=text.get_position(), arrowprops=arrowprops)
+
+    return moved
+
+
+def place_labels(texts, ax, label_placer=None, x=None, y=None, sizes=DEFAULT_MARKER_SIZE, **adjust_text_kwargs):
+    """Place texts with the label placer named label_placer (one of LABEL_PLACERS, default: adjust_text).
+
+    x, y and sizes are the points of the scatter plot, for the greedy placer.
+    adjust_text_kwargs are passed on to adjustText.adjust_text (ex: force_text,
+    only_move).  The greedy placer only uses arrowprops from them.
+    """
+    if label_placer is None:
+        label_placer = DEFAULT_LABEL_PLACER
+
+    if label_placer == ADJUST_TEXT:
+        from adjustText import adjust_text
+
+        adjust_text(texts, ax=ax, **adjust_text_kwargs)
+    elif label_placer == GREEDY:
+        place_labels_greedy(texts, ax, x=x, y=y, sizes=sizes, arrowprops=adjust_text_kwargs.get('arrowprops'))
+    else:
+        raise ValueError(F"Unknown label placer {label_placer!r}, expected one of {list(LABEL_PLACERS)}")
+
+
+def count_overlaps(texts, ax):
+    """Number of pairs of texts whose boxes overlap."""
+    boxes = _label_boxes(texts, ax.figure.canvas.get_renderer())
+    x0, y0, x1, y1 = boxes.T
+
+    overlapping = ((x0[:, None] < x1[None, :]) & (x0[None, :] < x1[:, None]) &
+                   (y0[:, None] < y1[None, :]) & (y0[None, :] < y1[:, None]))
+
+    # Every pair shows up twice, and every box overlaps itself
+    return int((overlapping.sum() - len(boxes)) // 2)
@@ -0,0 +1,156 @@
+"""Single-pass loader for the monthly campaign workbook.
+
+pd.read_excel re-opens and re-parses the whole .xlsx file (zip container, shared
+strings, styles) every time it's called, so reading the Purchases, Airings and
+Lookup sheets separately pays that cost three times.  Here we open the workbook
+once in read-only mode, stream the rows of each sheet and build the three
+DataFrames ourselves, with the same shape and column names read_excel would give
+us.
+"""
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook as _open_workbook
+
+
+PURCHASES_SHEET = 'Purchases'
+AIRINGS_SHEET = 'Airings'
+LOOKUP_SHEET = 'Lookup'
+
+# The Airings sheet is the big one, so we cast it explicitly instead of letting
+# pandas infer a dtype for every column.  A blank cell can't be cast to int64, so
+# Creative is a nullable integer, and Lift is a float like Spend (it gets added
+# up with NumPy, and blanks count as no lift).
+AIRINGS_DTYPES = {'Company': object,
+                  'Date/Time ET': 'datetime64[ns]',
+                  'Rotation': object,
+                  'Creative': 'Int64',
+                  'Network': object,
+                  'Spend': 'float64',
+                  'Lift': 'float64',
+                  'Program': object}
+
+LOOKUP_DTYPES = {'Network Name': object,
+                 'Ticker': object,
+                 'Network Name.1': object}
+
+# Strings that read_excel treats as missing values by default (ex: the Lookup sheet
+# has a "NULL" network name, and some airings have a "None" rotation)
+NA_STRINGS = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+              '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+              'nan', 'null']
+
+
+def _text_columns(frame):
+    # Text comes through as object columns, or as str columns on pandas >= 3
+    return frame.select_dtypes(include=['object', 'string']).columns
+
+
+def _infer_numeric_columns(frame):
+    # The Purchases sheet stores the day numbers as text.  read_excel turns a
+    # column into numbers when every value in it looks numeric, so we do the same
+    # to keep the rest of the script working unchanged.  Mixed columns (ex: the
+    # one holding "2017", "Q3" and "September") are left alone.
+    for column in _text_columns(frame):
+        try:
+            frame[column] = pd.to_numeric(frame[column])
+        except (ValueError, TypeError):
+            pass
+    return frame
+
+
+def _dedupe_columns(header):
+    # Mirror pandas' handling of duplicated column names (ex: the Lookup sheet has
+    # two "Network Name" columns, which read_excel calls "Network Name" and
+    # "Network Name.1")
+    seen = {}
+    columns = []
+    for count, name in enumerate(header):
+        if name is None:
+            name = F"Unnamed: {count}"
+        if name in seen:
+            seen[name] += 1
+            name = F"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def _sheet_to_frame(worksheet, skiprows=0):
+    rows = worksheet.iter_rows(values_only=True)
+
+    for _ in range(skiprows):
+        next(rows, None)
+
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+
+    records = list(rows)
+
+    # Read-only worksheets report their dimensions from the file, which can include
+    # trailing rows that are completely empty.  read_excel drops those, so do we.
+    while records and all(value is None for value in records[-1]):
+        records.pop()
+
+    # Workbooks written without a <dimension> record (ex: by openpyxl's write-only
+    # mode) come back with every row only as long as its last filled in cell.
+    # read_excel pads them with empty cells, so we do too.
+    width = max(len(row) for row in [header] + records)
+    if len(header) < width:
+        header = tuple(header) + (None,) * (width - len(header))
+    records = [row if len(row) == width else tuple(row) + (None,) * (width - len(row)) for row in records]
+
+    frame = pd.DataFrame.from_records(records, columns=_dedupe_columns(header))
+
+    # Empty cells come through as None, but read_excel gives us NaN.  Only text
+    # columns can hold None or the NA strings, so we leave the numeric ones alone.
+    text_columns = _text_columns(frame)
+    frame[text_columns] = frame[text_columns].replace(NA_STRINGS, np.nan).fillna(np.nan)
+
+    return frame
+
+
+def load_workbook(path, airings=True):
+    """Read the Purchases, Airings and Lookup sheets from one workbook.
+
+    The workbook is opened a single time and every sheet is streamed in read-only
+    mode.  Returns (purchase_data, airings_data, lookup_data), matching what
+
+        pd.read_excel(path, sheet_name='Purchases')
+        pd.read_excel(path, sheet_name='Airings')
+        pd.read_excel(path, sheet_name='Lookup', skiprows=1)
+
+    would return, but with explicit dtypes on the Airings and Lookup frames.
+
+    With airings=False the Airings sheet isn't read at all and airings_data is
+    None (see streaming.py for reading it in chunks instead).
+    """
+    workbook = _open_workbook(path, read_only=True, data_only=True)
+    try:
+        purchase_data = _infer_numeric_columns(_sheet_to_frame(workbook[PURCHASES_SHEET]))
+        airings_data = _sheet_to_frame(workbook[AIRINGS_SHEET]) if airings else None
+
+        # The first row of the Lookup sheet is a title ("Lookup table for survey
+        # response field to airings network ticker symbol."), so we skip it.
+        lookup_data = _sheet_to_frame(workbook[LOOKUP_SHEET], skiprows=1)
+    finally:
+        workbook.close()
+
+    if airings_data is not None:
+        airings_data = airings_data.astype(AIRINGS_DTYPES)
+    lookup_data = lookup_data.astype(LOOKUP_DTYPES)
+
+    return purchase_data, airings_data, lookup_data
+
+
+def load_workbook_separately(path):
+    """The original approach: one read_excel call (and one parse of the file) per sheet.
+
+    Kept around so the loader benchmark has something to compare against.
+    """
+    purchase_data = pd.read_excel(path, sheet_name=PURCHASES_SHEET)
+    airings_data = pd.read_excel(path, sheet_name=AIRINGS_SHEET)
+    lookup_data = pd.read_excel(path, sheet_name=LOOKUP_SHEET, skiprows=1)
+
+    return purchase_data, airings_data, lookup_data
@@ -0,0 +1,169 @@
+"""Cost efficiency metrics computed from Purchases, Spend and Lift.
+
+Every derived metric is declared once in METRICS, as a ratio of two expressions
+over the base measures, along with how it's shown in the reports and charts.
+add_metrics evaluates all of them together, from one array of the measures, so a
+new KPI is one more entry rather than another pass over the data:
+
+    register_metric(Metric('Cost Per Thousand Lift (Spend/Lift*1000)', 'Spend', 'Lift', scale=1000,
+                           display_name='Cost Per Thousand Lift', unit='$', rounding=2))
+
+Expressions can use Purchases, Spend and Lift, and total_Purchases, total_Spend
+and total_Lift for the totals of the whole table (ex: for shares).  Anything more
+than a single name is evaluated with pandas.eval (ex: 'Spend + 0.5 * Lift').
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+# Base measures every metric is computed from, and how they're rounded in the reports
+MEASURES = ['Purchases', 'Spend', 'Lift']
+MEASURE_ROUNDING = {"Purchases":0,
+                    "Spend":2,
+                    "Lift":0}
+
+# column is the name of the column in the tables.  The metric is numerator / denominator * scale.
+# rounding is the number of decimals in the client reports (None leaves it unrounded), and
+# internal metrics are only for our own analysis and are left out of the client reports.
+Metric = namedtuple('Metric', ['column', 'numerator', 'denominator', 'scale', 'display_name', 'unit', 'rounding', 'internal'],
+                    defaults=[1, None, '', None, False])
+
+METRICS = {}
+
+
+def register_metric(metric, replace=False):
+    """Add a Metric to METRICS, so add_metrics computes it for every table."""
+    if metric.column in METRICS and not replace:
+        raise ValueError(F"A metric named {metric.column!r} is already registered")
+    METRICS[metric.column] = metric
+
+
+for _metric in [Metric('Conversion Rate (Purchases/Lift)%', 'Purchases', 'Lift', scale=100,
+                       display_name='Conversion Rate', unit='%', rounding=1),
+                Metric('Cost Per Acquisition (Spend/Purchases)', 'Spend', 'Purchases',
+                       display_name='Cost Per Acquisition', unit='$', rounding=2),
+                Metric('Cost Per Visitor (Spend/Lift)', 'Spend', 'Lift',
+                       display_name='Cost Per Visitor', unit='$', rounding=2),
+                Metric('Percent of Purchases', 'Purchases', 'total_Purchases', scale=100, unit='%', internal=True),
+                Metric('Percent of Spend', 'Spend', 'total_Spend', scale=100, unit='%', internal=True)]:
+    register_metric(_metric)
+
+# Not a ratio, so it's added after the registered metrics
+COMPARISON_COLUMN = 'Percent Pur > Percent Spend'
+
+
+def display_name(column):
+    """Short name of a metric for chart titles and annotations (ex: 'Cost Per Visitor')."""
+    metric = METRICS.get(column)
+    if metric is None or metric.display_name is None:
+        return column
+    return metric.display_name
+
+
+def unit(column):
+    """'$', '%' or '' for a metric, '$' for Spend and '' for other measures."""
+    if column in METRICS:
+        return METRICS[column].unit
+    return '$' if column == 'Spend' else ''
+
+
+def report_rounding():
+    """Number of decimals of every column of the client reports."""
+    rounding = dict(MEASURE_ROUNDING)
+    rounding.update({metric.column: metric.rounding for metric in METRICS.values() if metric.rounding is not None})
+    return rounding
+
+
+def internal_columns():
+    """Columns that are useful for our own analysis but don't go into the client reports."""
+    return [metric.column for metric in METRICS.values() if metric.internal] + [COMPARISON_COLUMN]
+
+
+def ratio(numerator, denominator, zero_division=np.inf):
+    """numerator / denominator element-wise, with defined results when denominator is 0.
+
+    x / 0 is zero_division (default: inf, i.e. "we spent money and got nothing
+    for it") for any x other than 0, and 0 / 0 is NaN (nothing to measure).
+    Missing values in either input give NaN.
+    """
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = numerator / denominator
+
+    return np.where((denominator == 0) & (numerator != 0) & ~np.isnan(numerator), zero_division, result)
+
+
+def _measure_arrays(df):
+    # One float array per measure, plus the totals the expressions can refer to.  Tables that
+    # don't have every measure (ex: airings, which have no Purchases) can use the metrics of the others.
+    columns = [measure for measure in MEASURES if measure in df.columns]
+    measures = dict(zip(columns, df[columns].to_numpy(dtype=float).T))
+    measures.update({F"total_{name}": np.nansum(values) for name, values in list(measures.items())})
+    return measures
+
+
+def _evaluate(expression, measures):
+    if expression in measures:
+        return measures[expression]
+    return pd.eval(expression, local_dict=measures)
+
+
+def evaluate_metrics(df, metrics=None, zero_division=np.inf):
+    """Every metric in metrics (default: all of METRICS) for each row of df, as a dict of column name: array.
+
+    df needs the Purchases, Spend and Lift columns the metrics use.  Missing
+    values count as 0 in the totals, and see ratio for what dividing by 0 gives.
+    """
+    if metrics is None:
+        metrics = METRICS.values()
+
+    measures = _measure_arrays(df)
+
+    return {metric.column: ratio(_evaluate(metric.numerator, measures), _evaluate(metric.denominator, measures), zero_division) * metric.scale
+            for metric in metrics}
+
+
+def overall_metrics(df, zero_division=np.inf):
+    """The client facing metrics of the totals of df, i.e. of the whole campaign, as a dict of column name: float."""
+    totals = df[MEASURES].sum().to_frame().T
+    metrics = [metric for metric in METRICS.values() if not metric.internal]
+
+    return {name: float(values[0]) for name, values in evaluate_metrics(totals, metrics, zero_division).items()}
+
+
+def add_metrics(df, zero_division=np.inf):
+    """Return a copy of df (which needs Purchases, Spend and Lift columns) with the derived metrics added.
+
+    Works for any table of base measures (by network, by network and month, ...).
+    """
+    metrics = evaluate_metrics(df, zero_division=zero_division)
+    metrics[COMPARISON_COLUMN] = metrics['Percent of Purchases'] > metrics['Percent of Spend']
+
+    return df.assign(**metrics)
+
+
+def round_for_report(df):
+    """Round the metrics for display and store Purchases and Lift as whole numbers."""
+    df = df.round(report_rounding())
+    df[['Purchases', 'Lift']] = df[['Purchases', 'Lift']].astype(int)
+
+    return df
+
+
+def compute_metrics(purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month):
+    """Add the derived metrics to both aggregated tables.
+
+    The monthly (or other period) table is also rounded and sorted by network and
+    then period, the same way it gets written to its CSV file.
+    """
+    purchases_spend_lift_by_network = add_metrics(purchases_spend_lift_by_network)
+
+    purchases_spend_lift_by_network_and_month = add_metrics(purchases_spend_lift_by_network_and_month)
+    purchases_spend_lift_by_network_and_month = round_for_report(purchases_spend_lift_by_network_and_month)
+    purchases_spend_lift_by_network_and_month = purchases_spend_lift_by_network_and_month.sort_index(level=[0, 1])
+
+    return purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month
@@ -0,0 +1,218 @@
+"""The whole report, from workbook to PDFs, as functions that can be called in-process.
+
+Each stage is a plain function, so a long-lived worker can import this module
+once and process as many workbooks as it likes:
+
+    from ad_campaign_report import pipeline
+
+    for path in workbooks:
+        pipeline.run(path, output_dir=F"./output/{brand}")
+
+or run the stages one at a time, the same way ad_campaign_report_script.py does.
+"""
+import pandas as pd
+
+from .aggregation import aggregate, aggregate_by_network_and_month, aggregate_monthly, aggregate_purchases_by_month, roll_up_by_network
+from .cache import load_cleaned
+from .cleaning import campaign_period, clean_workbook
+from .cube import DEFAULT_GRAIN, build_daily_cube, grain_freq, roll_up_cube
+from .dayparts import aggregate_spend_lift_by_network_and_hour, build_daypart_reports
+from .duckdb_engine import ENGINES, aggregate_frames
+from .export import export, period_label
+from .loader import load_workbook
+from .metrics import compute_metrics
+from .profiling import RunProfiler
+from .reports import build_reports
+from .state import MonthlyStateStore
+from .streaming import DEFAULT_CHUNKSIZE, stream_spend_lift_by_network_and_month
+
+
+__all__ = ['load', 'clean', 'aggregate', 'compute_metrics', 'build_reports', 'export', 'run', 'run_incremental']
+
+
+def load(path):
+    """Read the raw Purchases, Airings and Lookup sheets.  Returns (purchase_data, airings_data, lookup_data)."""
+    return load_workbook(path)
+
+
+def clean(purchase_data, airings_data, lookup_data):
+    """Returns (purchase_data_transpose, airings_data, lookup_data)."""
+    return clean_workbook(purchase_data, airings_data, lookup_data)
+
+
+def run(path, output_dir='./output', cache=None, pdfs=True, airings_chunksize=None, airings_path=None, renderer=None, export_workers=None, combined_report=False,
+        grain=DEFAULT_GRAIN, dayparts=True, engine='pandas', profile=False, cprofile=False):
+    """Generate every CSV and report for the workbook at path, writing them under output_dir.
+
+    If cache (a WorkbookCache) is given, the cleaned sheets are read from/stored in
+    it, so re-running on the same workbook skips the Excel parsing.  Set pdfs=False
+    to skip the HTML/PDF reports and only write the CSV files.  renderer picks the
+    PDF backend (a name or instance from render.py, default: pdfkit), and
+    export_workers how many files are written at once (see export.export).  With
+    combined_report=True the three reports and the summary metrics are written to
+    one HTML file and one PDF instead of a file per report.
+
+    If airings_chunksize is given, the airings are never loaded into memory all at
+    once: they're read airings_chunksize rows at a time, from airings_path (a CSV
+    export of the Airings sheet) if given or from the workbook's Airings sheet
+    otherwise, and folded into running per-network-per-month totals.  The cache
+    isn't used in this mode.
+
+    grain is the period of the "by month" table and report: 'day', 'week', 'month'
+    (the default) or 'quarter' (see cube.GRAINS).  Other grains than month are
+    rolled up from a daily Network x Date cube, and their tables are named after
+    the grain (ex: report_for_client_by_week).
+
+    Unless dayparts=False, Spend, Lift and cost per visitor by network and daypart
+    and by hour of the day (see dayparts.py) are added as two more reports,
+    report_by_daypart and report_by_hour.
+
+    engine='duckdb' runs the aggregations and joins as DuckDB queries over the
+    cleaned sheets written to Parquet (see duckdb_engine.py) instead of with
+    pandas, with the same results.  It can't be combined with airings_chunksize or
+    airings_path; for histories too big for memory, query Parquet files directly
+    with duckdb_engine.aggregate_parquet.
+
+    With profile=True, the wall time, CPU time and peak memory of every stage
+    (load, clean, aggregate, join, metrics, reports, export) are written to
+    <output_dir>/run_profile.json (see profiling.py), along with the time it took
+    to write each file.  cprofile=True also runs every stage under cProfile and
+    writes the stats of the slowest one next to it.
+
+    Returns a dict with every table that was produced, keyed by name, and the
+    ArtifactTiming of every file written (see export.export) as export_timings.
+    """
+    if engine not in ENGINES:
+        raise ValueError(F"Unknown engine {engine!r}, expected one of {list(ENGINES)}")
+    if engine == 'duckdb' and (airings_chunksize is not None or airings_path is not None):
+        raise ValueError("engine='duckdb' can't stream the airings, use duckdb_engine.aggregate_parquet on Parquet files instead")
+
+    profiler = RunProfiler(cprofile=cprofile, enabled=profile or cprofile)
+
+    # Months are grouped straight from the raw rows, every other grain is rolled up from the daily cube
+    by_month = grain_freq(grain) == 'M'
+    freq = 'M' if by_month else 'D'
+
+    if airings_chunksize is not None or airings_path is not None:
+        with profiler.stage('load'):
+            purchase_data, _, lookup_data = load_workbook(path, airings=False)
+        with profiler.stage('clean'):
+            purchase_data_transpose, _, lookup_data = clean(purchase_data, None, lookup_data)
+            airings_data = None
+
+        with profiler.stage('aggregate'):
+            # The hourly totals for the daypart reports are folded in the same pass over the airings
+            streamed = stream_spend_lift_by_network_and_month(airings_path or path, chunksize=airings_chunksize or DEFAULT_CHUNKSIZE, freq=freq, hours=dayparts)
+            spend_lift_by_network_and_period, spend_lift_by_network_and_hour = streamed if dayparts else (streamed, None)
+            monthly = (aggregate_purchases_by_month(purchase_data_transpose, freq=freq), spend_lift_by_network_and_period)
+    else:
+        if cache is not None:
+            # A cache hit skips the Excel parsing and the cleaning, so they're one stage here
+            with profiler.stage('load'):
+                purchase_data_transpose, airings_data, lookup_data = load_cleaned(path, cache=cache)
+        else:
+            with profiler.stage('load'):
+                raw = load(path)
+            with profiler.stage('clean'):
+                purchase_data_transpose, airings_data, lookup_data = clean(*raw)
+
+        if engine == 'pandas':
+            with profiler.stage('aggregate'):
+                monthly = aggregate_monthly(purchase_data_transpose, airings_data) if by_month else build_daily_cube(purchase_data_transpose, airings_data)
+                spend_lift_by_network_and_hour = aggregate_spend_lift_by_network_and_hour(airings_data) if dayparts else None
+
+    if engine == 'duckdb':
+        # DuckDB groups straight at any grain, so there's no cube to roll up, and the joins are part of the same queries
+        with profiler.stage('aggregate'):
+            aggregated = aggregate_frames(purchase_data_transpose, airings_data, lookup_data, grain=grain, hours=dayparts)
+            if dayparts:
+                *aggregated, spend_lift_by_network_and_hour = aggregated
+    else:
+        if not by_month:
+            with profiler.stage('aggregate'):
+                monthly = roll_up_cube(monthly, grain)
+        with profiler.stage('join'):
+            aggregated = aggregate(purchase_data_transpose, airings_data, lookup_data, monthly=monthly)
+
+    campaign_start, campaign_end = campaign_period(purchase_data_transpose)
+
+    with profiler.stage('metrics'):
+        purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month = compute_metrics(*aggregated)
+
+    with profiler.stage('reports'):
+        report_for_client, report_for_client_by_month, channels_no_spend = build_reports(
+            purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month)
+
+        extra_reports = {}
+        if dayparts:
+            extra_reports['report_by_daypart'], extra_reports['report_by_hour'] = build_daypart_reports(
+                spend_lift_by_network_and_hour, lookup_data, report_for_client)
+
+    with profiler.stage('export'):
+        export_timings = export(purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month,
+                                report_for_client, report_for_client_by_month, channels_no_spend,
+                                output_dir, period_label(campaign_start, campaign_end), pdfs=pdfs, renderer=renderer, max_workers=export_workers,
+                                combined=combined_report, grain=grain, extra_reports=extra_reports)
+
+    if profiler.enabled:
+        profiler.write(output_dir, workbook=path, grain=grain, engine=engine, streamed=airings_data is None, cached=cache is not None,
+                       artifacts=[timing._asdict() for timing in export_timings])
+
+    return {'purchases_spend_lift_by_network': purchases_spend_lift_by_network,
+            F"purchases_spend_lift_by_network_and_{grain}": purchases_spend_lift_by_network_and_month,
+            'report_for_client': report_for_client,
+            F"report_for_client_by_{grain}": report_for_client_by_month,
+            'channels_no_spend': channels_no_spend,
+            **extra_reports,
+            'export_timings': export_timings}
+
+
+def run_incremental(path, state_path, output_dir='./output', pdfs=True, overwrite=False, renderer=None, export_workers=None, combined_report=False):
+    """Add the months of the workbook at path that aren't in the state store yet, then regenerate the reports.
+
+    Only the purchases and airings of months missing from the store at state_path
+    (see state.MonthlyStateStore) are aggregated.  The reports cover every month
+    in the store.  With overwrite=True, months of the workbook that are already
+    stored are recomputed and replaced.  renderer, export_workers and
+    combined_report are the same as for run.  The store only keeps monthly totals,
+    so there are no daypart reports in this mode.  The files are labelled with the
+    first and last months of the store (see export.period_label).
+
+    Returns a dict with every table that was produced, keyed by name, and the
+    ArtifactTiming of every file written (see export.export) as export_timings.
+    """
+    store = MonthlyStateStore(state_path)
+    purchase_data_transpose, airings_data, lookup_data = clean(*load(path))
+
+    # Only keep the days and airings of months we haven't stored yet
+    if not overwrite:
+        stored_months = store.months()
+        new_days = ~(purchase_data_transpose.index + pd.offsets.MonthEnd(0)).isin(stored_months)
+        new_airings = ~(airings_data['Date/Time ET'].dt.normalize() + pd.offsets.MonthEnd(0)).isin(stored_months)
+        purchase_data_transpose = purchase_data_transpose[new_days]
+        airings_data = airings_data[new_airings]
+
+    if not purchase_data_transpose.empty:
+        new_months = aggregate_by_network_and_month(purchase_data_transpose, airings_data, lookup_data)
+        store.append(new_months, overwrite=overwrite)
+
+    history = store.load()
+    campaign_start, campaign_end = campaign_period(history.index.get_level_values('date').unique().sort_values())
+
+    purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month = compute_metrics(
+        roll_up_by_network(history), history)
+
+    report_for_client, report_for_client_by_month, channels_no_spend = build_reports(
+        purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month)
+
+    export_timings = export(purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month,
+                            report_for_client, report_for_client_by_month, channels_no_spend,
+                            output_dir, period_label(campaign_start, campaign_end, every_month=False), pdfs=pdfs, renderer=renderer, max_workers=export_workers,
+                            combined=combined_report)
+
+    return {'purchases_spend_lift_by_network': purchases_spend_lift_by_network,
+            'purchases_spend_lift_by_network_and_month': purchases_spend_lift_by_network_and_month,
+            'report_for_client': report_for_client,
+            'report_for_client_by_month': report_for_client_by_month,
+            'channels_no_spend': channels_no_spend,
+            'export_timings': export_timings}
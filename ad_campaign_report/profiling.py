@@ -0,0 +1,180 @@
+"""Wall time, CPU time and peak memory of every stage of a report run, saved as a JSON run profile.
+
+When a run is slow, this tells us whether it's the Excel parsing, the transpose,
+the joins or the PDF rendering:
+
+    profiler = RunProfiler()
+    with profiler.stage('load'):
+        purchase_data, airings_data, lookup_data = pipeline.load("./dataset.xlsx")
+    ...
+    profiler.write('./output')      # ./output/run_profile.json
+    print_profile(profiler.stages)
+
+For every stage we record:
+
+* wall_seconds and cpu_seconds (time.process_time, so the CPU time of every thread, ex: the export threads)
+* peak_traced_bytes, the most memory Python (and NumPy/pandas) allocated on top
+  of what was already allocated when the stage started, from tracemalloc.
+  Tracing slows allocation heavy code down, so pass trace_memory=False when only
+  the times matter.
+* max_rss_bytes, the peak resident set size of the process up to the end of the
+  stage (the OS only keeps one peak for the whole process, so a stage's own
+  peak shows up as the step up from the stage before).  None on Windows.
+
+With cprofile=True every stage also runs under cProfile, and the stats of the
+slowest one are written next to the JSON profile (run_profile_<stage>.prof, see
+pstats or snakeviz).  cProfile only sees the thread it was started in, so
+anything the export threads do shows up as waiting on them.
+"""
+import cProfile
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+
+StageProfile = namedtuple('StageProfile', ['stage', 'wall_seconds', 'cpu_seconds', 'peak_traced_bytes', 'max_rss_bytes'])
+
+# <output_dir>/run_profile.json, and <output_dir>/run_profile_<stage>.prof for the cProfile stats
+PROFILE_NAME = 'run_profile'
+
+
+def max_rss_bytes():
+    """Peak resident set size of this process so far, or None where it isn't available."""
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Bytes on macOS, kilobytes everywhere else
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+class RunProfiler:
+    """Records a StageProfile for every `with profiler.stage(name):` block.
+
+    A stage that's entered more than once (ex: the aggregations of different
+    grains) is added up into one entry.  With enabled=False, stage() does nothing,
+    so code can always be written with a profiler and only pay for it when asked.
+    """
+
+    def __init__(self, trace_memory=True, cprofile=False, enabled=True):
+        self.trace_memory = trace_memory
+        self.cprofile = cprofile
+        self.enabled = enabled
+        self.stages = []
+        self._profiles = {}
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        # tracemalloc is only on for the length of the stage (unless someone else started it), so
+        # nothing is left slowed down if the run fails half way
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_at_start = tracemalloc.get_traced_memory()[0]
+
+        profile = cProfile.Profile() if self.cprofile else None
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            wall_seconds = time.perf_counter() - wall_start
+            cpu_seconds = time.process_time() - cpu_start
+            peak_traced_bytes = tracemalloc.get_traced_memory()[1] - traced_at_start if self.trace_memory else None
+            if started_tracing:
+                tracemalloc.stop()
+
+            self._record(StageProfile(name, wall_seconds, cpu_seconds, peak_traced_bytes, max_rss_bytes()), profile)
+
+    def _record(self, stage_profile, profile):
+        previous = next((position for position, stage in enumerate(self.stages) if stage.stage == stage_profile.stage), None)
+        if previous is None:
+            self.stages.append(stage_profile)
+        else:
+            before = self.stages[previous]
+            peaks = [peak for peak in (before.peak_traced_bytes, stage_profile.peak_traced_bytes) if peak is not None]
+            self.stages[previous] = before._replace(wall_seconds=before.wall_seconds + stage_profile.wall_seconds,
+                                                    cpu_seconds=before.cpu_seconds + stage_profile.cpu_seconds,
+                                                    peak_traced_bytes=max(peaks) if peaks else None,
+                                                    max_rss_bytes=stage_profile.max_rss_bytes)
+
+        if profile is not None:
+            if stage_profile.stage in self._profiles:
+                self._profiles[stage_profile.stage].append(profile)
+            else:
+                self._profiles[stage_profile.stage] = [profile]
+
+    def slowest_stage(self):
+        """The StageProfile with the most wall time, or None before any stage has run."""
+        return max(self.stages, key=lambda stage: stage.wall_seconds, default=None)
+
+    def write(self, output_dir, **metadata):
+        """Write <output_dir>/run_profile.json, and the cProfile stats of the slowest stage if cprofile=True.
+
+        Any keyword arguments (ex: workbook=path) are saved along with the stages.
+        Returns the path of the JSON file.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+
+        slowest = self.slowest_stage()
+        cprofile_path = None
+        if slowest is not None and slowest.stage in self._profiles:
+            import pstats
+
+            cprofile_path = os.path.join(output_dir, F"{PROFILE_NAME}_{slowest.stage}.prof")
+            stats = pstats.Stats(*self._profiles[slowest.stage])
+            stats.dump_stats(cprofile_path)
+
+        profile = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                   'python': platform.python_version(),
+                   'machine': platform.platform(),
+                   **metadata,
+                   'total_wall_seconds': sum(stage.wall_seconds for stage in self.stages),
+                   'total_cpu_seconds': sum(stage.cpu_seconds for stage in self.stages),
+                   'slowest_stage': slowest.stage if slowest is not None else None,
+                   'cprofile': cprofile_path,
+                   'stages': [stage._asdict() for stage in self.stages]}
+
+        path = os.path.join(output_dir, F"{PROFILE_NAME}.json")
+        with open(path, 'w') as file:
+            json.dump(profile, file, indent=2, default=str)
+
+        return path
+
+
+def _megabytes(size):
+    return F"{size / 1024**2:.1f}" if size is not None else '-'
+
+
+def print_profile(stages, file=sys.stdout):
+    """Wall time, CPU time and memory of every stage, one line per stage."""
+    print(F"{'stage':<20}{'wall (s)':>12}{'cpu (s)':>12}{'peak traced (MB)':>18}{'max RSS (MB)':>15}", file=file)
+    print('-'*77, file=file)
+    for stage in stages:
+        print(F"{stage.stage:<20}{stage.wall_seconds:>12.3f}{stage.cpu_seconds:>12.3f}"
+              F"{_megabytes(stage.peak_traced_bytes):>18}{_megabytes(stage.max_rss_bytes):>15}", file=file)
+    print('-'*77, file=file)
+    print(F"{'total':<20}{sum(stage.wall_seconds for stage in stages):>12.3f}{sum(stage.cpu_seconds for stage in stages):>12.3f}", file=file)
@@ -0,0 +1,118 @@
+"""Where every network ranks on the metrics of a report's heatmaps, computed once.
+
+Each heatmap orders its rows by the field it shows, and several heatmaps show
+the same field (Purchases is next to every cost metric).  ranking_table sorts
+each field once, in the order its heatmaps show it, and the heatmaps just look
+up the order:
+
+    rankings = ranking_table(report_for_client, ['Purchases', 'Cost Per Visitor (Spend/Lift)'], ascending=[False, True])
+    ranked_networks(rankings, 'Purchases')                                      # every network, most purchases first
+    ranked_networks(rankings, 'Cost Per Visitor (Spend/Lift)', ascending=True)  # every network, cheapest first
+
+consensus_networks picks the networks that are near the top (or bottom) of
+several metrics at once, ex: in the top 5 of at least 2 of Purchases, Spend and
+Lift.  It doesn't need the full order of any metric, so it finds each metric's
+top and bottom k with one np.argpartition instead of sorting:
+
+    top, bottom = consensus_networks(report_for_client, ['Purchases', 'Spend', 'Lift'], k=5, votes=2)
+"""
+import numpy as np
+import pandas as pd
+
+
+DESCENDING = 'descending'
+ASCENDING = 'ascending'
+
+
+def ranking_table(df, fields, ascending=False):
+    """Rank of every network (0 is first) on every field of df, from high to low (or low to high, with ascending=True).
+
+    ascending is one bool for every field, or a list with one per field.  The
+    ranks follow the order sort_values puts the networks in (missing values
+    last), so ranked_networks gives exactly the order sort_values would.  Returns
+    a DataFrame indexed like df, with a (field, 'descending' or 'ascending')
+    column for every field.
+    """
+    if isinstance(ascending, bool):
+        ascending = [ascending] * len(fields)
+
+    positions = np.arange(len(df))
+
+    ranks = {}
+    for field, field_ascending in zip(fields, ascending):
+        # Sorted with a 0..n-1 index, so the sorted index is the positions of the networks
+        sorted_positions = pd.Series(df[field].values).sort_values(ascending=field_ascending).index.values
+        rank = np.empty(len(df), dtype='int64')
+        rank[sorted_positions] = positions
+        ranks[(field, ASCENDING if field_ascending else DESCENDING)] = rank
+
+    return pd.DataFrame(ranks, index=df.index, columns=pd.MultiIndex.from_tuples(ranks, names=['field', 'order']))
+
+
+def ranked_networks(rankings, field, ascending=False):
+    """Every network in order of field, from high to low (or low to high, with ascending=True)."""
+    rank = rankings[(field, ASCENDING if ascending else DESCENDING)].values
+
+    # The ranks are a permutation, so they're turned around without sorting again
+    order = np.empty_like(rank)
+    order[rank] = np.arange(len(rank))
+
+    return rankings.index[order]
+
+
+def _k_with_ties(better, tied, k):
+    # The positions where better is True, then the earliest ones where tied is True, up to k in all
+    above = np.flatnonzero(better)
+    return np.concatenate([above, np.flatnonzero(tied)[:k - len(above)]])
+
+
+def _largest_and_smallest_k(values, k):
+    # Positions of the k largest and the k smallest values, both found with one partial sort.
+    # Missing values never count, and ties at the k-th value go to the earliest positions.
+    positions = None
+    missing = np.isnan(values)
+    if missing.any():
+        positions = np.flatnonzero(~missing)
+        values = values[positions]
+
+    if len(values) <= k:
+        largest = smallest = np.arange(len(values))
+    else:
+        partitioned = np.argpartition(values, [k - 1, len(values) - k])
+        kth_smallest = values[partitioned[k - 1]]
+        kth_largest = values[partitioned[len(values) - k]]
+        largest = _k_with_ties(values > kth_largest, values == kth_largest, k)
+        smallest = _k_with_ties(values < kth_smallest, values == kth_smallest, k)
+
+    if positions is not None:
+        return positions[largest], positions[smallest]
+    return largest, smallest
+
+
+def consensus_networks(df, metrics, k=5, votes=None, ascending=False):
+    """Returns (networks in the top k of at least votes of the metrics, networks in the bottom k of at least votes of them).
+
+    ascending=True means lower is better (ex: the costs), so the top k of that
+    metric are its k lowest values.  It's one bool for every metric, or a list
+    with one per metric.  votes defaults to a majority of the metrics (2 of 3, or
+    both of 2).  Ties at the k-th place go to the networks that come first in
+    df, and a missing value is never in the top or bottom k.
+    """
+    if isinstance(ascending, bool):
+        ascending = [ascending] * len(metrics)
+    if votes is None:
+        votes = len(metrics) // 2 + 1
+
+    # One row per metric and one column per network, so every metric's values are contiguous in memory
+    matrix = np.ascontiguousarray(df[list(metrics)].to_numpy(dtype='float64').T)
+
+    top_votes = np.zeros(len(df), dtype='int64')
+    bottom_votes = np.zeros(len(df), dtype='int64')
+    for values, lower_is_better in zip(matrix, ascending):
+        largest, smallest = _largest_and_smallest_k(values, k)
+        if lower_is_better:
+            largest, smallest = smallest, largest
+        top_votes[largest] += 1
+        bottom_votes[smallest] += 1
+
+    return set(df.index[top_votes >= votes]), set(df.index[bottom_votes >= votes])
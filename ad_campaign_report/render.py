@@ -0,0 +1,176 @@
+"""Pluggable backends for rendering the report tables to PDF.
+
+pdfkit (the original approach) converts each report's HTML file by launching a
+wkhtmltopdf process, which pays process start-up, font loading and page setup
+for every report: three per run, hundreds in batch mode.  The reportlab backend
+lays the tables out in-process with a pure-Python layout engine instead, and can
+be reused for any number of reports.
+
+Every backend has the same interface:
+
+    renderer = get_renderer('reportlab')
+    renderer.render(df, html_path, pdf_path)
+
+html_path is the HTML version of df, which export.py always writes; backends
+that don't need it (ex: reportlab) ignore it.
+
+Backends can also put several tables into one PDF with a table of contents, so a
+run pays the start-up, font loading and page setup once instead of per report:
+
+    renderer.render_document([(heading, df), ...], html_path, pdf_path, title)
+"""
+
+
+class PdfkitRenderer:
+    """Convert the report's HTML file with pdfkit, i.e. one wkhtmltopdf process per report."""
+
+    name = 'pdfkit'
+
+    # Every call runs its own wkhtmltopdf process, so PDFs can be converted concurrently
+    thread_safe = True
+
+    def __init__(self, options=None):
+        import pdfkit
+
+        self._pdfkit = pdfkit
+        self.options = options
+
+    def render(self, df, html_path, pdf_path):
+        self._pdfkit.from_file(html_path, pdf_path, options=self.options)
+
+    def render_document(self, sections, html_path, pdf_path, title=None):
+        # The combined HTML file already has the headings and a linked table of contents
+        self._pdfkit.from_file(html_path, pdf_path, options=self.options)
+
+
+def _format_cell(value):
+    # Match what DataFrame.to_html shows for the values in our reports
+    if hasattr(value, 'strftime') and value.hour == value.minute == value.second == 0:
+        return value.strftime('%Y-%m-%d')
+    return str(value)
+
+
+def table_rows(df):
+    """The header row and body rows of df (index included) as lists of strings."""
+    index_names = [name if name is not None else '' for name in df.index.names]
+    header = index_names + [str(column) for column in df.columns]
+
+    rows = [header]
+    for index, values in zip(df.index, df.itertuples(index=False, name=None)):
+        if not isinstance(index, tuple):
+            index = (index,)
+        rows.append([_format_cell(value) for value in index + values])
+
+    return rows
+
+
+class ReportLabRenderer:
+    """Lay the report tables out in-process with reportlab (no external processes)."""
+
+    name = 'reportlab'
+
+    # reportlab keeps some global state (ex: its font registry), so we render one PDF at a time
+    thread_safe = False
+
+    def __init__(self, pagesize=None, font_size=8):
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import landscape, letter
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+        from reportlab.platypus import LongTable, PageBreak, Paragraph, SimpleDocTemplate, TableStyle
+        from reportlab.platypus.tableofcontents import TableOfContents
+
+        self._LongTable = LongTable
+        self._PageBreak = PageBreak
+        self._Paragraph = Paragraph
+        self._SimpleDocTemplate = SimpleDocTemplate
+        self._TableOfContents = TableOfContents
+
+        self.pagesize = pagesize or landscape(letter)
+        self.font_size = font_size
+
+        # Building the table style is the same for every report, so we only do it once
+        self._table_style = TableStyle([('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                                        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+                                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#eeeeee')),
+                                        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+                                        ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+                                        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')])
+
+        self._styles = getSampleStyleSheet()
+        self._toc_styles = [ParagraphStyle('TOCLevel0', parent=self._styles['Normal'], fontSize=11, leading=16)]
+
+    def table(self, df):
+        """df as a reportlab flowable, with the header repeated on every page."""
+        table = self._LongTable(table_rows(df), repeatRows=1)
+        table.setStyle(self._table_style)
+        return table
+
+    def heading(self, text, key=None):
+        """A section heading.  Headings with a key get a table of contents entry and a PDF bookmark."""
+        heading = self._Paragraph(text, self._styles['Heading2'])
+        heading.toc_key = key
+        return heading
+
+    def paragraph(self, text):
+        return self._Paragraph(text, self._styles['Normal'])
+
+    def build(self, flowables, pdf_path, title=None):
+        """Write a list of flowables to pdf_path.
+
+        If the flowables include a TableOfContents, the document is laid out twice,
+        the second time with the page numbers of the headings filled in.
+        """
+        document = self._SimpleDocTemplate(pdf_path, pagesize=self.pagesize, title=title or '')
+
+        def after_flowable(flowable):
+            key = getattr(flowable, 'toc_key', None)
+            if key is not None:
+                text = flowable.getPlainText()
+                document.canv.bookmarkPage(key)
+                document.canv.addOutlineEntry(text, key, level=0)
+                document.notify('TOCEntry', (0, text, document.page, key))
+
+        document.afterFlowable = after_flowable
+
+        if any(isinstance(flowable, self._TableOfContents) for flowable in flowables):
+            document.multiBuild(flowables)
+        else:
+            document.build(flowables)
+
+    def render(self, df, html_path, pdf_path):
+        self.build([self.table(df)], pdf_path)
+
+    def render_document(self, sections, html_path, pdf_path, title=None):
+        toc = self._TableOfContents()
+        toc.levelStyles = self._toc_styles
+
+        flowables = []
+        if title:
+            flowables.append(self._Paragraph(title, self._styles['Title']))
+        flowables += [self.heading('Contents'), toc]
+
+        for number, (heading, df) in enumerate(sections):
+            flowables += [self._PageBreak(), self.heading(heading, key=F"section{number}"), self.table(df)]
+
+        self.build(flowables, pdf_path, title=title)
+
+
+RENDERERS = {PdfkitRenderer.name: PdfkitRenderer,
+             ReportLabRenderer.name: ReportLabRenderer}
+
+DEFAULT_RENDERER = PdfkitRenderer.name
+
+
+def get_renderer(renderer=None):
+    """A renderer instance from a name in RENDERERS (default: pdfkit), or renderer itself if it's already one."""
+    if renderer is None:
+        renderer = DEFAULT_RENDERER
+    if not isinstance(renderer, str):
+        return renderer
+
+    try:
+        renderer_class = RENDERERS[renderer]
+    except KeyError:
+        raise ValueError(F"Unknown renderer {renderer!r}, expected one of {sorted(RENDERERS)}") from None
+
+    return renderer_class()
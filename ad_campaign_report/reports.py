@@ -0,0 +1,73 @@
+"""Building the three reports we hand to the client from the metrics tables."""
+import pandas as pd
+
+from .metrics import MEASURES, internal_columns, overall_metrics, report_rounding, round_for_report
+
+
+def build_report_for_client(purchases_spend_lift_by_network):
+    """Overall report by network, for the channels we actually spent money on."""
+    report_for_client = purchases_spend_lift_by_network.drop(internal_columns(), axis=1)
+    report_for_client = report_for_client.query('Spend > 0')
+
+    report_for_client = round_for_report(report_for_client)
+    report_for_client = report_for_client.rename_axis('Network', axis=0)
+    report_for_client = report_for_client.sort_values('Network')
+
+    return report_for_client
+
+
+def build_report_for_client_by_month(purchases_spend_lift_by_network_and_month, report_for_client):
+    """Monthly report by network, for the same channels as report_for_client."""
+    report_for_client_by_month = purchases_spend_lift_by_network_and_month.drop(internal_columns(), axis=1)
+    report_for_client_by_month.index = report_for_client_by_month.index.set_names('Network', level=0)
+
+    report_for_client_by_month = round_for_report(report_for_client_by_month)
+
+    # This will ensure that both reports have the same channels.  Since we already filtered report_for_client to show only channels where there was spend, report_for_client_by_month will also also have those same channels.
+    report_for_client_by_month = report_for_client_by_month.loc[report_for_client.index]
+    report_for_client_by_month = report_for_client_by_month.fillna(0)
+
+    return report_for_client_by_month
+
+
+def build_channels_no_spend(purchases_spend_lift_by_network):
+    """Purchases attributed to channels where Spend = 0."""
+    channels_no_spend = purchases_spend_lift_by_network.query('Spend == 0')['Purchases'].to_frame()
+    channels_no_spend = channels_no_spend.rename_axis('Network', axis=0)
+    channels_no_spend = channels_no_spend.sort_values(by='Purchases', ascending=False)
+
+    return channels_no_spend
+
+
+def build_summary(report_for_client, channels_no_spend):
+    """Totals and overall metrics (cost per acquisition, cost per visitor, ...) of the campaign, as a one column table."""
+    # Where spend > 0
+    overall = overall_metrics(report_for_client)
+    total_spend = report_for_client['Spend'].sum()
+    total_purchases_from_spend = report_for_client['Purchases'].sum()
+    total_lift = report_for_client['Lift'].sum()
+
+    # Any purchases, including where spend = 0.  Channels with no spend also have no lift.
+    any_spend = overall_metrics(pd.concat([report_for_client[MEASURES], channels_no_spend['Purchases'].to_frame()]).fillna(0))
+    total_purchases_from_campaign = channels_no_spend['Purchases'].sum() + total_purchases_from_spend
+
+    rounding = report_rounding()
+    summary = {'Total Spend': round(total_spend, 2),
+               'Total Lift': int(total_lift),
+               'Purchases (channels with spend)': int(total_purchases_from_spend)}
+    summary.update({column: round(value, rounding.get(column, 2)) for column, value in overall.items()})
+    summary.update({'Purchases (all channels)': int(total_purchases_from_campaign),
+                    'Cost Per Acquisition, all channels': round(any_spend['Cost Per Acquisition (Spend/Purchases)'], 2),
+                    'Conversion Rate, all channels %': round(any_spend['Conversion Rate (Purchases/Lift)%'], 1)})
+
+    # object dtype, so the counts are shown as whole numbers next to the dollar amounts
+    return pd.Series(summary, dtype=object, name='Value').rename_axis('Metric').to_frame()
+
+
+def build_reports(purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month):
+    """Returns (report_for_client, report_for_client_by_month, channels_no_spend)."""
+    report_for_client = build_report_for_client(purchases_spend_lift_by_network)
+    report_for_client_by_month = build_report_for_client_by_month(purchases_spend_lift_by_network_and_month, report_for_client)
+    channels_no_spend = build_channels_no_spend(purchases_spend_lift_by_network)
+
+    return report_for_client, report_for_client_by_month, channels_no_spend
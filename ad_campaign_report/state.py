@@ -0,0 +1,80 @@
+"""Persistent store of Purchases, Spend and Lift by network and month, for incremental updates.
+
+Every month we get a workbook covering the last two months, so consecutive
+workbooks overlap by a month.  Instead of recomputing everything from scratch,
+the per-network-per-month totals are kept in a Parquet file.  A new run only
+aggregates the months that aren't in the store yet, appends them, and the
+reports are regenerated from the full stored history.
+
+Months already in the store are treated as final.  If a month needs to be
+recomputed (ex: its airings were corrected), pass overwrite=True to append,
+or remove it with drop_months first.
+"""
+import os
+
+import pandas as pd
+
+
+COLUMNS = ['Purchases', 'Spend', 'Lift']
+INDEX_NAMES = ['Network Name', 'date']
+
+
+class MonthlyStateStore:
+    """Purchases, Spend and Lift indexed by (Network Name, month end), stored in one Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """The stored history, or an empty table if nothing has been stored yet."""
+        if not os.path.exists(self.path):
+            index = pd.MultiIndex.from_arrays([pd.Index([], dtype=object), pd.DatetimeIndex([])], names=INDEX_NAMES)
+            return pd.DataFrame({column: pd.Series(dtype=float) for column in COLUMNS}, index=index)
+
+        return pd.read_parquet(self.path)
+
+    def months(self):
+        """Month end timestamps that are already stored."""
+        return self.load().index.get_level_values('date').unique().sort_values()
+
+    def _save(self, history):
+        # Write to a temporary file and rename it into place, so a crash half way
+        # through never corrupts the store.
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = self.path + F".tmp{os.getpid()}"
+        history.to_parquet(tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def append(self, purchases_spend_lift_by_network_and_month, overwrite=False):
+        """Add the months of purchases_spend_lift_by_network_and_month that aren't stored yet.
+
+        With overwrite=True, months that are already stored are replaced instead of
+        skipped.  Returns the updated history, sorted by network and month.
+        """
+        history = self.load()
+        new = purchases_spend_lift_by_network_and_month[COLUMNS]
+        new_months = new.index.get_level_values('date')
+
+        if overwrite:
+            history = history[~history.index.get_level_values('date').isin(new_months)]
+        else:
+            new = new[~new_months.isin(self.months())]
+            if new.empty:
+                return history
+
+        # Keep the store in (Network Name, date) order, however the months were added
+        history = pd.concat([history, new]).sort_index()
+        self._save(history)
+
+        return history
+
+    def drop_months(self, month_stamps):
+        """Remove the given months from the store.  Returns the updated history."""
+        history = self.load()
+        history = history[~history.index.get_level_values('date').isin(month_stamps)]
+        self._save(history)
+
+        return history
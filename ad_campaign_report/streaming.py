@@ -0,0 +1,115 @@
+"""Chunked ingestion of the Airings data, for workbooks too big to load into memory.
+
+The only thing the report needs from the airings is Spend and Lift added up by
+network and month.  Instead of loading every airing into one DataFrame and
+grouping it, we read the airings a chunk at a time (from the workbook's Airings
+sheet, or from a CSV export with the same columns) and fold each chunk into a
+running per-network-per-month total.  Peak memory is then bounded by the chunk
+size and the number of networks x months, not by the number of airings.  The
+per-network totals are rolled up from the monthly ones, like in aggregate().
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook as _open_workbook
+
+from .aggregation import aggregate_spend_lift_by_network_and_month
+from .cleaning import clean_airings
+from .dayparts import aggregate_spend_lift_by_network_and_hour
+from .loader import AIRINGS_DTYPES, AIRINGS_SHEET, NA_STRINGS
+
+
+# The only Airings columns the report uses
+AIRINGS_COLUMNS = ['Date/Time ET', 'Network', 'Spend', 'Lift']
+
+DEFAULT_CHUNKSIZE = 100000
+
+
+def _chunk_to_frame(rows):
+    chunk = pd.DataFrame.from_records(rows, columns=AIRINGS_COLUMNS)
+    chunk['Network'] = chunk['Network'].replace(NA_STRINGS, np.nan)
+    return chunk.astype({column: AIRINGS_DTYPES[column] for column in AIRINGS_COLUMNS})
+
+
+def iter_airings_xlsx(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield the Airings sheet of a workbook as DataFrames of at most chunksize rows.
+
+    The sheet is streamed in read-only mode and only the columns in
+    AIRINGS_COLUMNS are kept.
+    """
+    workbook = _open_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[AIRINGS_SHEET].iter_rows(values_only=True)
+        header = list(next(rows))
+        positions = [header.index(column) for column in AIRINGS_COLUMNS]
+
+        chunk = []
+        for row in rows:
+            # Skip the completely empty rows read-only worksheets can report at the end
+            if all(value is None for value in row):
+                continue
+            chunk.append(tuple(row[position] for position in positions))
+            if len(chunk) == chunksize:
+                yield _chunk_to_frame(chunk)
+                chunk = []
+
+        if chunk:
+            yield _chunk_to_frame(chunk)
+    finally:
+        workbook.close()
+
+
+def iter_airings_csv(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield a CSV export of the Airings sheet as DataFrames of at most chunksize rows."""
+    dtypes = {column: AIRINGS_DTYPES[column] for column in ('Network', 'Spend', 'Lift')}
+    return pd.read_csv(path, usecols=AIRINGS_COLUMNS, dtype=dtypes, parse_dates=['Date/Time ET'], chunksize=chunksize)
+
+
+def iter_airings(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Chunks of airings from a .csv file, or from the Airings sheet of a workbook."""
+    if os.path.splitext(path)[1].lower() == '.csv':
+        return iter_airings_csv(path, chunksize=chunksize)
+    return iter_airings_xlsx(path, chunksize=chunksize)
+
+
+def _fold(chunks, aggregate_functions):
+    # Fold every chunk into one running total per aggregate function, so the airings are only read once
+    running = [None] * len(aggregate_functions)
+    for chunk in chunks:
+        chunk = clean_airings(chunk)
+        for number, aggregate_function in enumerate(aggregate_functions):
+            partial = aggregate_function(chunk)
+            if running[number] is None:
+                running[number] = partial
+            else:
+                running[number] = pd.concat([running[number], partial]).groupby(level=[0, 1], observed=True).sum()
+
+    empty = pd.DataFrame({column: pd.Series(dtype=AIRINGS_DTYPES[column]) for column in AIRINGS_COLUMNS})
+    return [total if total is not None else aggregate_function(empty)
+            for total, aggregate_function in zip(running, aggregate_functions)]
+
+
+def fold_airings(chunks, freq='M', hours=False):
+    """Fold chunks of raw airings into Spend and Lift by (Network ticker, month end), or by another period with freq.
+
+    Returns the same table as aggregation.aggregate_spend_lift_by_network_and_month
+    would for all the airings at once, while only ever holding one chunk plus the
+    running totals in memory.  With hours=True, Spend and Lift by (Network ticker,
+    Hour) (see dayparts.py) are folded in the same pass, and both are returned.
+    """
+    aggregate_functions = [lambda chunk: aggregate_spend_lift_by_network_and_month(chunk, freq=freq)]
+    if hours:
+        aggregate_functions.append(aggregate_spend_lift_by_network_and_hour)
+
+    totals = _fold(chunks, aggregate_functions)
+
+    return tuple(totals) if hours else totals[0]
+
+
+def stream_spend_lift_by_network_and_month(path, chunksize=DEFAULT_CHUNKSIZE, freq='M', hours=False):
+    """Spend and Lift by (Network ticker, month end), or by another period with freq, read from path a chunk at a time.
+
+    With hours=True, also returns Spend and Lift by (Network ticker, Hour), from the same pass.
+    """
+    return fold_airings(iter_airings(path, chunksize=chunksize), freq=freq, hours=hours)
@@ -17,113 +17,46 @@
 # # Advertising Campaign Report - Sept/Oct 2017
 
 # %%
-import pandas as pd
-import numpy as np
-from datetime import datetime
-import pdfkit
+from ad_campaign_report import pipeline
+from ad_campaign_report.aggregation import aggregate_monthly
+from ad_campaign_report.cache import WorkbookCache, load_cleaned
+from ad_campaign_report.cleaning import campaign_period
+from ad_campaign_report.dayparts import aggregate_spend_lift_by_network_and_hour, build_daypart_reports
+from ad_campaign_report.export import period_label, print_timings
+from ad_campaign_report.profiling import RunProfiler, print_profile
 
 # %% [markdown]
-# # Cleaning
-
-# %%
-purchase_data = pd.read_excel("./dataset.xlsx", sheet_name='Purchases')
-airings_data = pd.read_excel("./dataset.xlsx", sheet_name='Airings')
-
-# The first row of Lookup table says "Lookup table for survey response field to airings network ticker symbol."  Assuming the first row always says that, we can drop it.
-lookup_data = pd.read_excel("./dataset.xlsx", sheet_name='Lookup', skiprows=1)
-
-# %% [markdown]
-# # Preprocessing
+# Every stage below runs inside `with profiler.stage(...)`, which records its wall time, CPU time and peak memory.  They're printed and saved to ./output/run_profile.json at the end, so when a run is slow we can see whether it's the Excel parsing, the transpose, the joins or the PDFs.  RunProfiler(cprofile=True) also writes the cProfile stats of the slowest stage to ./output/run_profile_<stage>.prof.
 
 # %%
-# Lookup data is meant to facilitate a join between the purchases data and the spend/lift data, but lookup data has a row with all null values, which doesn't help the join in any way.  I'll drop that row.
-lookup_data = lookup_data.dropna(how='all')
-
-# The Network Name column and Network Name.1 column contain identical information, so we can drop the duplicated column.
-lookup_data.drop(labels='Network Name.1', axis=1, inplace=True)
-
-# %%
-# In order to make sure the joins happen correctly, we need to ensure that the strings we're joining on actually match.
-
-# The purchase data table is pretty messy, but if we assume the second column always contains the names of the networks, we can use .iloc to grab them and ensure they're lowercase 
-
-lookup_data['Network Name'] = lookup_data['Network Name'].str.lower()
-lookup_data['Ticker'] = lookup_data['Ticker'].str.upper()
-airings_data['Network'] = airings_data['Network'].str.upper()
-purchase_data.iloc[:, 1] = purchase_data.iloc[:, 1].str.lower()
+profiler = RunProfiler()
 
 # %% [markdown]
-# # Transposing Purchase Exit Survey Data - Converting dates from columns to rows in Purchase Exit Survey Data
+# # Cleaning
 #
-# The purchases table is extremely messy and would be easier to work with if the rows were dates and the columns were the networks.  If we assume that the first row will always have the year, the third row will always have month names, and the fourth row will always have the day numbers, I can programmatically concatenate all the necessary date information in the form "Year-Month-Day", then use them for the rows.
+# Every stage of this report lives in the ad_campaign_report package, so the same code can be imported and run in-process by a long-lived worker (see pipeline.run), rather than spawning a new interpreter for every workbook.  This notebook walks through the stages one at a time.
+#
+# Loading and cleaning:
+# * load_workbook opens the workbook once and streams the Purchases, Airings, and Lookup sheets in read-only mode, instead of calling pd.read_excel (and parsing the whole file) once per sheet.
+# * clean_workbook drops the empty rows and duplicated columns of the Lookup table and makes sure the network names and tickers we join on are consistently lower/upper case.
+# * transpose_purchases turns the Purchases table, which is extremely messy, into a table whose rows are dates and whose columns are networks.  It assumes that the first row will always have the year, the third row will always have month names, and the fourth row will always have the day numbers.
+#
+# The cleaned tables are cached as Parquet files keyed by a hash of the workbook, so re-running the report on the same dataset.xlsx skips Excel parsing entirely.
 
 # %%
-current_year = purchase_data.iloc[0,:].dropna()
-current_year = int(current_year)
-current_year
+cache = WorkbookCache('./.report_cache')
 
-# %%
-months = []
-for month in purchase_data.iloc[2,2:].dropna():
-    months.append(month)
-months
+with profiler.stage('load'):
+    purchase_data_transpose, airings_data, lookup_data = load_cleaned("./dataset.xlsx", cache=cache)
 
-# %%
-# Grab the row of day numbers and cast as integers
-day_nums = np.array(purchase_data.iloc[3,2:], dtype=int)
-
-parsed_dates = []
-current_month = months[0]
-i = 0
-
-# Walk through the list of day_nums.  
-
-# If current_day_num > next_day_num, that indicates a change in month (ex: If current_day = Sept-30 and next_day = Oct-1, b/c 30 > 1).  When this happens, we concatenate the current_day, then increase i by 1 to set the current_month to the next month for furture concatenation.  
-
-# If current_day_num < next_day_num, that indicates both days are in the same month (ex: If current_day = Sept-5 and next_day = Sept-6, b/c 5 < 6), so we concatenate like normal.
-
-# The try block handles the exception when you get to the last day in day_nums.  Since there are no more days in the list, we get an error when we try to index into the list one day into the future.
-for count, current_day_num in enumerate(day_nums, start=1):
-    try:
-        next_day_num = day_nums[count]
-    except:
-        pass
-    if current_day_num > next_day_num:
-        current_date = str(current_year) + '-' + current_month + '-' + str(current_day_num)
-        current_date = datetime.strptime(current_date, '%Y-%B-%d').date()
-        i += 1
-        current_month = months[i]
-        parsed_dates.append(current_date)
-    else:
-        current_date = str(current_year) + '-' + current_month + '-' + str(current_day_num)
-        current_date = datetime.strptime(current_date, '%Y-%B-%d').date()
-        parsed_dates.append(current_date)
-
-# Now that all the dates have been parsed, we replace the unparsed dates with the parsed ones, then transpose the table.  We now have rows that correspond to dates and columns that correspond to networks
-purchase_data.iloc[3,2:] = parsed_dates
-purchase_data_transpose = purchase_data.iloc[3:,:].transpose()
-purchase_data_transpose.head()
-
-# %% [markdown]
-# ## Some Cleanup
+campaign_start, campaign_end = campaign_period(purchase_data_transpose)
+campaign_start, campaign_end
 
 # %%
-# Set the column of dates as the index and rename the axis appropriately
-purchase_data_transpose.set_index(3, inplace=True)
-purchase_data_transpose.rename_axis('date', inplace=True)
-
-# Drop first row, which doesn't contain anything useful
-purchase_data_transpose = purchase_data_transpose.iloc[1:]
-
-# Replace column names with the row of network names and then drop that row
-purchase_data_transpose.columns = purchase_data_transpose.iloc[0]
-purchase_data_transpose = purchase_data_transpose.drop(labels='source')
+lookup_data.head()
 
-# Rename column axis as upper-case "Source" to match original table
-purchase_data_transpose.rename_axis('Source', axis='columns', inplace=True)
-
-# Convert index of dates to datetime objects
-purchase_data_transpose.index = pd.to_datetime(purchase_data_transpose.index)
+# %%
+airings_data.head()
 
 # %%
 purchase_data_transpose.head()
@@ -132,243 +65,59 @@ purchase_data_transpose.head()
 # ## Done
 
 # %% [markdown]
-# # Metrics by Network
-
-# %% [markdown]
-# ## Purchases by Network
-
-# %%
-# Aggregate across rows to find the total number of purchases by network
-purchases_by_network = purchase_data_transpose.sum(axis=0)
-purchases_by_network = purchases_by_network.to_frame()
-purchases_by_network = purchases_by_network.rename(columns={0:'Purchases'})
-
-# %%
-purchases_by_network.head()
-
-# %% [markdown]
-# ## Spend and Lift by Network
-
-# %%
-# Aggregate to find the total amount spent on ads for each network and the total lift generated from those ads for each network 
-spend_and_lift_by_network = airings_data.groupby('Network')[['Spend', 'Lift']].agg('sum')
-
-# %%
-spend_and_lift_by_network.head()
-
-# %% [markdown]
-# ## Joins
-
-# %% [markdown]
-# ### Joining Purchases by Network to Lookup Data
-
-# %%
-purchases_by_network_w_lookup = lookup_data.merge(right=purchases_by_network, left_on='Network Name', right_on='Source', how='left')
-purchases_by_network_w_lookup.set_index('Network Name', inplace=True)
-
-# %%
-purchases_by_network_w_lookup.head()
-
-# %% [markdown] tags=[]
-# ### Joining Purchases/Lookup by Network to Spend and Lift
-
-# %%
-purchases_spend_lift_by_network = purchases_by_network_w_lookup.merge(right=spend_and_lift_by_network, left_on='Ticker', right_index=True, how='left')
-
-# Since this column was only needed for the join, I'm going to drop it post join
-purchases_spend_lift_by_network.drop('Ticker', axis=1, inplace=True)
-
-# %%
-purchases_spend_lift_by_network.index = purchases_spend_lift_by_network.index.str.replace('_', ' ').str.title()
-
-# %%
-purchases_spend_lift_by_network.fillna(0, inplace=True)
-
-# %%
-purchases_spend_lift_by_network.head()
-
-# %% [markdown]
-# ## Computing Metrics by Network
+# # Aggregating Purchases, Spend, and Lift
+#
+# ## Metrics by Network
+#
+# Purchases are totalled by network from the transposed purchase data, Spend and Lift are totalled by network from the airings data, and the two are joined through the lookup table (Network Name -> Ticker).
+#
+# ## Metrics by Network and Month
+#
+# The same totals, but for every network and every month of the campaign.  The lookup table is combined with the months of the campaign so that every channel gets a row for each month, even if there were no airings or purchases that month.
+#
+# The raw purchases and airings are only grouped once, by network and month (aggregate_monthly), and both tables are joined and rolled up from those monthly totals.
 
 # %%
-purchases_spend_lift_by_network['Conversion Rate (Purchases/Lift)%'] = purchases_spend_lift_by_network['Purchases'] / purchases_spend_lift_by_network['Lift'] * 100
-
-purchases_spend_lift_by_network['Cost Per Acquisition (Spend/Purchases)'] = purchases_spend_lift_by_network['Spend'] / purchases_spend_lift_by_network['Purchases'].fillna(0)
-
-purchases_spend_lift_by_network['Cost Per Visitor (Spend/Lift)'] = purchases_spend_lift_by_network['Spend'] / purchases_spend_lift_by_network['Lift'].fillna(0)
+with profiler.stage('aggregate'):
+    monthly = aggregate_monthly(purchase_data_transpose, airings_data)
 
-purchases_spend_lift_by_network['Percent of Purchases'] = purchases_spend_lift_by_network['Purchases'] / sum(purchases_spend_lift_by_network['Purchases'].fillna(0)) * 100
-
-purchases_spend_lift_by_network['Percent of Spend'] = purchases_spend_lift_by_network['Spend'] / sum(purchases_spend_lift_by_network['Spend'].fillna(0)) * 100
-
-purchases_spend_lift_by_network['Percent Pur > Percent Spend'] = purchases_spend_lift_by_network['Percent of Purchases'] > purchases_spend_lift_by_network['Percent of Spend']
+with profiler.stage('join'):
+    purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month = pipeline.aggregate(purchase_data_transpose, airings_data, lookup_data, monthly=monthly)
 
 # %%
 purchases_spend_lift_by_network.head()
 
-# %% [markdown]
-# ## Output results to CSV file
-
-# %%
-current_year_and_months = str(current_year) + '_' + '_'.join(str(month) for month in months)
-
-purchases_spend_lift_by_network.to_csv(F"./output/cleaned_csvs/purchases_spend_lift_by_network_{current_year_and_months}.csv")
-
-# %% [markdown]
-# ## Done
-
-# %% [markdown]
-# # Metrics by Network and Month
-
-# %% [markdown]
-# ## Creating a lookup table that has monthly date information through a Cross Join
-
-# %% tags=[]
-# First we generate a series that has the monthly date information as the index, which we can grab
-month_stamps = purchase_data_transpose.groupby(pd.Grouper(freq='M')).sum().index.values
-
-# Then we convert the series to a DataFrame and add a key column, which will be used in the cross join.  Pandas doesn't have built in cross join functionality, so this will be used as a work around
-month_df = pd.DataFrame(data=month_stamps)
-month_df['key']=0
-
-# If we also add the same key to our lookup data, we'll be able to join the months in our spreadsheet to each row of the lookup table, and merge them together on that key, effectively creating a cross join
-lookup_data_with_key = lookup_data.copy()
-lookup_data_with_key['key'] = 0
-
-
-lookup_data_with_months = lookup_data_with_key.merge(month_df)
-lookup_data_with_months.rename(columns={0:'date'}, inplace=True)
-lookup_data_with_months.drop(columns='key', inplace=True)
-
-# %%
-# Now we have a lookup table that has the appropriate dates for each month in the campaign for each channel
-
-lookup_data_with_months.head()
-
-# %% [markdown]
-# ## Aggregating Spend and Lift by Network and Month
-
-# %%
-spend_lift_by_network_and_month = airings_data.groupby(['Network', pd.Grouper(key='Date/Time ET', freq='M')]).sum().reset_index()
-
-# %%
-spend_lift_by_network_and_month.head()
-
-# %% [markdown]
-# ## Aggregating Purchases by Network and Month
-
-# %%
-purchases_by_network_and_month = purchase_data_transpose.groupby(pd.Grouper(freq='M')).sum().transpose().stack().to_frame().reset_index()
-
-purchases_by_network_and_month.rename(columns={0:'Purchases'}, inplace=True)
-
-# %%
-purchases_by_network_and_month.head()
-
-# %% [markdown]
-# ## Joins
-
-# %% [markdown]
-# ### Joining lookup_data_with_months to spend_lift_by_network_and_month
-
-# %%
-lookup_data_with_months.head()
-
-# %%
-spend_lift_by_network_and_month.head()
-
-# %%
-lookup_spend_lift_by_network_and_month = lookup_data_with_months.merge(spend_lift_by_network_and_month, left_on=['Ticker', 'date'], right_on=['Network', 'Date/Time ET'], how='left')
-
-lookup_spend_lift_by_network_and_month.drop(columns=['Ticker', 'Network', 'Date/Time ET'], inplace=True)
-
-# %%
-lookup_spend_lift_by_network_and_month.head()
-
-# %% [markdown]
-# ### Joining Spend and Lift to Purchases
-
-# %%
-purchases_spend_lift_by_network_and_month = lookup_spend_lift_by_network_and_month.merge(purchases_by_network_and_month, left_on=['Network Name', 'date'], right_on=['Source', 'date'], how='left')
-
-purchases_spend_lift_by_network_and_month.drop(columns='Source', inplace=True)
-
-# %%
-purchases_spend_lift_by_network_and_month.head()
-
-# %% [markdown]
-# ## Cleanup
-
-# %%
-purchases_spend_lift_by_network_and_month['Network Name'] = purchases_spend_lift_by_network_and_month['Network Name'].str.replace('_', ' ').str.title()
-
-# %%
-purchases_spend_lift_by_network_and_month = purchases_spend_lift_by_network_and_month.set_index(['Network Name', 'date'])
-
-# %%
-purchases_spend_lift_by_network_and_month.fillna(0, inplace=True)
-
-# %%
-purchases_spend_lift_by_network_and_month = purchases_spend_lift_by_network_and_month[['Purchases', 'Spend', 'Lift']]
-
 # %%
 purchases_spend_lift_by_network_and_month.head()
 
 # %% [markdown]
-# ## Computing Metrics by Network and Month
+# ## Computing Metrics
+#
+# Conversion Rate, Cost Per Acquisition, Cost Per Visitor, and each network's share of purchases and spend.  The monthly table is also rounded for display and sorted by network.
 
 # %%
-purchases_spend_lift_by_network_and_month['Conversion Rate (Purchases/Lift)%'] = purchases_spend_lift_by_network_and_month['Purchases'] / purchases_spend_lift_by_network_and_month['Lift'] * 100
-
-purchases_spend_lift_by_network_and_month['Cost Per Acquisition (Spend/Purchases)'] = purchases_spend_lift_by_network_and_month['Spend'] / purchases_spend_lift_by_network_and_month['Purchases']
-
-purchases_spend_lift_by_network_and_month['Cost Per Visitor (Spend/Lift)'] = purchases_spend_lift_by_network_and_month['Spend'] / purchases_spend_lift_by_network_and_month['Lift']
-
-purchases_spend_lift_by_network_and_month['Percent of Purchases'] = purchases_spend_lift_by_network_and_month['Purchases'] / sum(purchases_spend_lift_by_network_and_month['Purchases'].fillna(0)) * 100
-
-purchases_spend_lift_by_network_and_month['Percent of Spend'] = purchases_spend_lift_by_network_and_month['Spend'] / sum(purchases_spend_lift_by_network_and_month['Spend'].fillna(0)) * 100
-
-purchases_spend_lift_by_network_and_month['Percent Pur > Percent Spend'] = purchases_spend_lift_by_network_and_month['Percent of Purchases'] > purchases_spend_lift_by_network_and_month['Percent of Spend']
+with profiler.stage('metrics'):
+    purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month = pipeline.compute_metrics(purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month)
 
 # %%
-purchases_spend_lift_by_network_and_month = purchases_spend_lift_by_network_and_month.round({"Purchases":0, "Spend":2, "Lift":0, "Conversion Rate (Purchases/Lift)%":1, "Cost Per Acquisition (Spend/Purchases)":2, "Cost Per Visitor (Spend/Lift)":2})
-
-purchases_spend_lift_by_network_and_month[['Purchases', 'Lift']] = purchases_spend_lift_by_network_and_month[['Purchases', 'Lift']].astype(int)
-
-purchases_spend_lift_by_network_and_month = purchases_spend_lift_by_network_and_month.sort_values('Network Name')
+purchases_spend_lift_by_network.head()
 
 # %%
 purchases_spend_lift_by_network_and_month.head()
 
-# %% [markdown]
-# ## Output results to CSV file
-
-# %%
-purchases_spend_lift_by_network_and_month.to_csv(F"./output/cleaned_csvs/purchases_spend_lift_by_network_and_month_{current_year_and_months}.csv")
-
 # %% [markdown]
 # ## Done
 
 # %% [markdown]
 # # Generating Reports
-
-# %% [markdown]
-# ## Overall report by network
-
-# %% tags=[]
-report_for_client = purchases_spend_lift_by_network.drop(['Percent of Purchases', 'Percent of Spend', 'Percent Pur > Percent Spend'], axis=1)
-
-report_for_client.query('Spend > 0', inplace=True)
+#
+# * report_for_client: overall report by network, only for channels where Spend > 0
+# * report_for_client_by_month: monthly report by network, for the same channels as report_for_client
+# * channels_no_spend: purchases for channels where Spend = 0
 
 # %%
-report_for_client[['Purchases', 'Lift']] = report_for_client[['Purchases', 'Lift']].astype(int)
-
-report_for_client = report_for_client.round({"Purchases":0, "Spend":2, "Lift":0, "Conversion Rate (Purchases/Lift)%":1, "Cost Per Acquisition (Spend/Purchases)":2, "Cost Per Visitor (Spend/Lift)":2})
-
-
-report_for_client.rename_axis('Network', axis=0, inplace=True)
-
-report_for_client = report_for_client.sort_values('Network')
+with profiler.stage('reports'):
+    report_for_client, report_for_client_by_month, channels_no_spend = pipeline.build_reports(purchases_spend_lift_by_network, purchases_spend_lift_by_network_and_month)
 
 # %% [markdown]
 # ### Viewing Finished Report by Network
@@ -376,42 +125,12 @@ report_for_client = report_for_client.sort_values('Network')
 # %%
 report_for_client
 
-# %% [markdown]
-# ## Monthly report by network
-
-# %%
-report_for_client_by_month = purchases_spend_lift_by_network_and_month.drop(['Percent of Purchases', 'Percent of Spend', 'Percent Pur > Percent Spend'], axis=1)
-
-report_for_client_by_month.index.set_names('Network', level=0, inplace=True)
-
-# %%
-report_for_client_by_month = report_for_client_by_month.round({"Purchases":0, "Spend":2, "Lift":0, "Conversion Rate (Purchases/Lift)%":1, "Cost Per Acquisition (Spend/Purchases)":2, "Cost Per Visitor (Spend/Lift)":2})
-
-report_for_client_by_month[['Purchases', 'Lift']] = report_for_client_by_month[['Purchases', 'Lift']].astype(int)
-
-# %%
-# This will ensure that both reports have the same channels.  Since we already filtered report_for_client to show only channels where there was spend, report_for_client_by_month will also also have those same channels.  
-report_for_client_by_month = report_for_client_by_month.loc[report_for_client.index]
-
-# %%
-report_for_client_by_month.fillna(0, inplace=True)
-
 # %% [markdown]
 # ### Viewing Finished Report by Network and Month
 
 # %%
 report_for_client_by_month
 
-# %% [markdown]
-# ## Report of channels where Spend = 0
-
-# %%
-channels_no_spend = purchases_spend_lift_by_network.query('Spend == 0')['Purchases'].to_frame()
-
-channels_no_spend.rename_axis('Network', axis=0, inplace=True)
-
-channels_no_spend.sort_values(by='Purchases', ascending=False, inplace=True)
-
 # %% [markdown]
 # ### Viewing Finished Report of purchases for channels with no spend
 
@@ -419,43 +138,58 @@ channels_no_spend.sort_values(by='Purchases', ascending=False, inplace=True)
 channels_no_spend
 
 # %% [markdown]
-# ## Output reports to CSV file
+# ### Dayparts and Hours of the Day
+#
+# The airings have the time they aired (Date/Time ET), so we can also see which parts of the day the spend went to and how much lift it generated there.  The airings are grouped once by network and hour of the day, and the hours are binned into dayparts (Early Morning, Daytime, Early Fringe, Prime Access, Prime, Late Night, Overnight).  There's no cost per acquisition here, since purchases are only recorded by day.
 
 # %%
-report_for_client.to_csv(F"./output/cleaned_csvs/report_for_client_{current_year_and_months}.csv")
+with profiler.stage('aggregate'):
+    spend_lift_by_network_and_hour = aggregate_spend_lift_by_network_and_hour(airings_data)
 
-# %%
-report_for_client_by_month.to_csv(F"./output/cleaned_csvs/report_for_client_by_month_{current_year_and_months}.csv")
+with profiler.stage('reports'):
+    report_by_daypart, report_by_hour = build_daypart_reports(spend_lift_by_network_and_hour, lookup_data, report_for_client)
+
+report_by_daypart
 
 # %%
-channels_no_spend.to_csv(F"./output/cleaned_csvs/channels_no_spend_{current_year_and_months}.csv")
+report_by_hour
 
 # %% [markdown]
-# ## Exporting Reports to PDF Files
+# # Exporting
+#
+# The metrics tables and the reports are written to ./output/cleaned_csvs, and the reports are also exported to HTML (./output/reports/html) and PDF files (./output/reports/pdfs).
+#
+# PDFs are made with pdfkit by default, which launches a wkhtmltopdf process for every report.  Passing renderer='reportlab' renders them in-process instead.
+#
+# The files are written concurrently on a thread pool (max_workers=1 writes them one at a time), and we print how long each one took.
+#
+# Passing combined=True writes the three reports, along with the overall cost per acquisition, cost per visitor and conversion rate, into one HTML file and one PDF with a table of contents (./output/reports/pdfs/campaign_report.pdf), so there's only one PDF to render.
 
 # %%
-f = open('./output/reports/html/report_for_client.html','w')
-a = report_for_client.to_html(col_space='100px')
-f.write(a)
-f.close()
+current_year_and_months = period_label(campaign_start, campaign_end)
 
-pdfkit.from_file('./output/reports/html/report_for_client.html', './output/reports/pdfs/report_for_client.pdf')
+with profiler.stage('export'):
+    export_timings = pipeline.export(purchases_spend_lift_by_network,
+                                     purchases_spend_lift_by_network_and_month,
+                                     report_for_client,
+                                     report_for_client_by_month,
+                                     channels_no_spend,
+                                     output_dir='./output',
+                                     current_year_and_months=current_year_and_months,
+                                     extra_reports={'report_by_daypart': report_by_daypart,
+                                                    'report_by_hour': report_by_hour})
 
-# %%
-f = open('./output/reports/html/report_for_client_by_month.html','w')
-a = report_for_client_by_month.to_html(col_space='100px')
-f.write(a)
-f.close()
+print_timings(export_timings)
 
-pdfkit.from_file('./output/reports/html/report_for_client_by_month.html', './output/reports/pdfs/report_for_client_by_month.pdf')
+# %% [markdown]
+# # Run Profile
+#
+# Time and memory of every stage of this run, also saved to ./output/run_profile.json.  The aggregate and reports stages include the daypart tables.
 
 # %%
-f = open('./output/reports/html/report_channels_no_spend.html','w')
-a = channels_no_spend.to_html(col_space='100px')
-f.write(a)
-f.close()
+profiler.write('./output', workbook="./dataset.xlsx")
 
-pdfkit.from_file('./output/reports/html/report_channels_no_spend.html', './output/reports/pdfs/report_channels_no_spend.pdf')
+print_profile(profiler.stages)
 
 # %% [markdown]
 # # Finish
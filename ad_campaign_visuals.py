@@ -20,9 +20,12 @@
 import pandas as pd
 import numpy as np
 
-import seaborn as sns
 import matplotlib.pyplot as plt
 
+from ad_campaign_report.charts import make_heatmap, make_scatter, make_scatter_with_size_adjustment, print_chart_timings, render_deck
+from ad_campaign_report.metrics import overall_metrics
+from ad_campaign_report.rankings import consensus_networks, ranking_table
+
 # %%
 # load CSV files
 
@@ -40,19 +43,18 @@ channels_no_spend = pd.read_csv("./output/cleaned_csvs/channels_no_spend_2017_Se
 
 # %%
 # Where spend > 0
-total_spend = report_for_client['Spend'].sum()
-total_purchases_from_spend = report_for_client['Purchases'].sum()
-total_lift = report_for_client['Lift'].sum()
+overall = overall_metrics(report_for_client)
 
-overall_cost_per_acquisition = total_spend / total_purchases_from_spend
-overall_cost_per_visitor = total_spend / total_lift
-overall_conversion_rate = total_purchases_from_spend / total_lift * 100
+overall_cost_per_acquisition = overall['Cost Per Acquisition (Spend/Purchases)']
+overall_cost_per_visitor = overall['Cost Per Visitor (Spend/Lift)']
+overall_conversion_rate = overall['Conversion Rate (Purchases/Lift)%']
 
-# Any purchases, including where spend = 0
+# Any purchases, including where spend = 0.  Channels with no spend have no spend or lift either.
 total_purchases_from_campaign = channels_no_spend['Purchases'].sum() + report_for_client['Purchases'].sum()
+any_spend = overall_metrics(pd.concat([report_for_client, channels_no_spend]).fillna(0))
 
-cost_per_acquisition_any_spend = total_spend / total_purchases_from_campaign
-conversion_rate_any_spend = total_purchases_from_campaign / total_lift * 100
+cost_per_acquisition_any_spend = any_spend['Cost Per Acquisition (Spend/Purchases)']
+conversion_rate_any_spend = any_spend['Conversion Rate (Purchases/Lift)%']
 
 print("If we only consider purchases from channels where spend > 0")
 print('-'*60)
@@ -75,163 +77,31 @@ print(F"The overall conversion rate was: {conversion_rate_any_spend:.1f}%")
 
 # %% [markdown]
 # #### Plotting Function - make_heatmap()
+#
+# make_heatmap lives in ad_campaign_report/charts.py.  It draws on its own figure and returns (fig, ax) without showing it, so the same function can render the charts to files without a display (see the end of this notebook).
+
+# %% [markdown]
+# #### Ranking the Networks
+#
+# Every heatmap below sorts the networks by a metric.  Rather than sorting report_for_client again each time, we rank the networks once on each metric the heatmaps show (lowest first for the costs), and look the ranks up.
+#
+# The networks named on each heatmap are the ones that are in the top (or bottom) 5 of several metrics at once.  consensus_networks(report_for_client, metrics, k=5, votes=2) finds them for any list of metrics: every metric votes for its top 5 and bottom 5 networks (picked with np.argpartition, without sorting), and the networks with at least 2 votes are returned.  ascending=True (or one bool per metric) means lower is better, like for the costs.
 
 # %%
-def make_heatmap(df, field, color_map, top_labels, bottom_labels, rounding=".0f", cutoff_value=False, asc=False, annotate_horizontal=True, hide_y_label=False):
-
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    
-    # # Get cutoff_value isn't supplied, we use the mean as the cutoff_value
-    if cutoff_value==False:
-        cutoff_value = df[field].mean()
-    
-    
-    # Sort purchases High to Low
-    sorted_values = df[[field]].sort_values(by=field, ascending=asc)
-    
-    # Find index of channel that has a field value >= field_mean.  This is used to draw horizontal line in heatmap later.
-    if asc == False:
-        horizontal_y_val = sorted_values[sorted_values[field] > cutoff_value].shape[0]
-    else:
-        horizontal_y_val = sorted_values[sorted_values[field] < cutoff_value].shape[0]
-
-    # Create labels for y_ticks.  Keep top and bottom 5 labels, replace middle labels
-    # with empty string.
-    labels_list = []
-    for count, label in enumerate(sorted_values.index):
-        #print(count, label)
-        if count<5 or count>len(sorted_values.index)-6:
-            labels_list.append(label)
-        else:
-            labels_list.append('')
-    
-    # # This part is needed if you want to get the values of Purchases to change the annotations (Annot) in the heatmap.  This keeps the top and bottom 5 values, but replaces the middle values with np.nan.  You can pass top_and_bottom_values to the sns.heatmap Annot arg to only annotate the top and bottom 5 values.
-
-    # top_and_bottom_values = []
-    # for i, boolean in enumerate(top_and_bottom_mask[field]):
-    #     if boolean == True:
-    #         purchases = sorted_values.iloc[i, 0]
-    #         top_and_bottom_values.append(purchases)
-    #         top_and_bottom_labels.append(top_and_bottom_mask.index.values[i])
-    #     else:
-    #         top_and_bottom_values.append(np.nan)
-
-    
-    # Unfortunately we need to hard code the names of the channels that are among the top and bottom 5 of Purchases, Spend, and Lift, b/c grabbing them programmatically is a little hard
-    top_5_channels = top_labels
-    bottom_5_channels = bottom_labels
-
-
-    fig, ax = plt.subplots(1,1,figsize=(2,10))
-
-
-    ## the last two entries for Cost Per Acquisition are np.inf and can't be plotted, so we remove them
-    if field == 'Cost Per Acquisition (Spend/Purchases)':
-        sorted_values = df[[field]].sort_values(by=field, ascending=True)[:-2]
-    
-    # Create masks
-    if asc==False:
-        
-        mask1 = sorted_values>=sorted_values[field][4]
-        ## Bottom 5 mask
-        mask2 = sorted_values<=sorted_values[field][-5]
-    else:
-        ## Top 5 mask
-        mask1 = sorted_values>=sorted_values[field][-5]
-        ## Bottom 5 mask
-        mask2 = sorted_values<=sorted_values[field][4]
-
-    top_and_bottom_mask = mask1 | mask2
-    middle_mask = ~top_and_bottom_mask
-    
-    #print(middle_mask)
-    
-    sns.heatmap(data=sorted_values,
-                mask=middle_mask,
-                annot=True, 
-                cmap=color_map, 
-                fmt='g',
-                cbar=True,
-                #annot_kws={"weight": "bold"},
-                #yticklabels=purchase_labels_w_alert,
-                ax=ax);
-
-
-    sns.heatmap(data=sorted_values,
-                # mask=top_and_bottom_mask,
-                #annot=True, 
-                cmap=color_map, 
-                fmt='g',
-                cbar = False,
-                yticklabels=labels_list,
-                ax=ax)
-
-    yticks=plt.gca().get_yticklabels()
-
-    for text in yticks:
-        if text.get_text() in top_5_channels:
-            text.set_weight('bold')
-            text.set_color('green')
-            #print('\u26A0 ' + text.get_text())
-            #text.set_text('\u26A0 ' + text.get_text())
-        if text.get_text() in bottom_5_channels:
-            text.set_weight('bold')
-            text.set_color('red')
-            
-    rewrite_txt_dict = {"Cost Per Visitor (Spend/Lift)":"Cost Per Visitor",
-                        "Cost Per Acquisition (Spend/Purchases)":"Cost Per Acquisition",
-                        "Conversion Rate (Purchases/Lift)%":"Conversion Rate"}        
-    
-    if field in rewrite_txt_dict.keys():
-        field = rewrite_txt_dict[field]
-    
-    y=plt.gca().get_yticks()
-    ax.tick_params(axis='y', left=False)
-    
-    if annotate_horizontal==True:
-        ax.axhline(horizontal_y_val, linestyle=':', color='blue')
-        text = ax.annotate(text=F'Avg {field} {format(cutoff_value, rounding)}:', xy=(0, horizontal_y_val), xytext=(-10, -5), textcoords='offset pixels', ha='right', color='#2596be')
-        
-        # This is to play with making outline of annotation text bolder
-        # import matplotlib.patheffects as pe
-        # text.set_path_effects(path_effects=[pe.withStroke(linewidth=0.8, foreground='black'), pe.Normal()])
-
-    if hide_y_label:
-        plt.ylabel('')
-    plt.show();
+rankings = ranking_table(report_for_client,
+                         ['Purchases', 'Spend', 'Lift', 'Cost Per Visitor (Spend/Lift)', 'Cost Per Acquisition (Spend/Purchases)', 'Conversion Rate (Purchases/Lift)%'],
+                         ascending=[False, False, False, True, True, False])
 
 # %% [markdown]
 # #### Purchases, Spend, and Lift
 
 # %%
-# Top Purchases, Spend, and Lift labels
-field1_top_labels = set(report_for_client['Purchases'].sort_values(ascending=False).index.values[0:5])
-field2_top_labels = set(report_for_client['Spend'].sort_values(ascending=False).index.values[0:5])
-field3_top_labels = set(report_for_client['Lift'].sort_values(ascending=False).index.values[0:5])
-
-## Use set logic to find which channels are in at least 2/3 of the top5 for Purchases, Spend, and Lift
-set1 = field1_top_labels.intersection(field2_top_labels)
-set2 = field1_top_labels.intersection(field3_top_labels)
-set3 = field2_top_labels.intersection(field3_top_labels)
-set4 = set1.intersection(set2, set3)
-at_least_top_2_of_3_spend_purchase_lift_labels = set1.union(set2, set3, set4)
-
-
-# Bottom Purchases, Spend, and Lift labels
-field1_bottom_labels = set(report_for_client['Purchases'].sort_values(ascending=False).index.values[-5:])
-field2_bottom_labels = set(report_for_client['Spend'].sort_values(ascending=False).index.values[-5:])
-field3_bottom_labels = set(report_for_client['Lift'].sort_values(ascending=False).index.values[-5:])
-
-## Use set logic to find which channels are in at least 2/3 of the bottom5 for Purchases, Spend, and Lift
-set1 = field1_bottom_labels.intersection(field2_bottom_labels)
-set2 = field1_bottom_labels.intersection(field3_bottom_labels)
-set3 = field2_bottom_labels.intersection(field3_bottom_labels)
-set4 = set1.intersection(set2, set3)
-at_least_bottom_2_of_3_spend_purchase_lift_labels = set1.union(set2, set3, set4)
+# Channels that are in at least 2/3 of the top5 (and bottom5) for Purchases, Spend, and Lift
+at_least_top_2_of_3_spend_purchase_lift_labels, at_least_bottom_2_of_3_spend_purchase_lift_labels = consensus_networks(report_for_client, ['Purchases', 'Spend', 'Lift'], k=5, votes=2)
 
 
 make_heatmap(df=report_for_client, 
+             rankings=rankings,
              field='Purchases', 
              color_map='Greys', 
              top_labels=at_least_top_2_of_3_spend_purchase_lift_labels, 
@@ -240,6 +110,7 @@ plt.show()
 
 
 make_heatmap(df=report_for_client, 
+             rankings=rankings,
              field='Spend', 
              color_map='Greys', 
              top_labels=at_least_top_2_of_3_spend_purchase_lift_labels, 
@@ -249,6 +120,7 @@ plt.show()
 
 
 make_heatmap(df=report_for_client, 
+             rankings=rankings,
              field='Lift', 
              color_map='Greys', 
              top_labels=at_least_top_2_of_3_spend_purchase_lift_labels, 
@@ -260,21 +132,13 @@ plt.show()
 # #### Purchases and Cost Per Visitor
 
 # %%
-# Use set logic to find which channels are in the top5 for purchases and cost per visitor
-top_5_purchases=set(report_for_client['Purchases'].sort_values(ascending=False).index.values[0:5])
-top_5_cost_per_visitor=set(report_for_client['Cost Per Visitor (Spend/Lift)'].sort_values(ascending=True).index.values[0:5])
-
-top_5_purchases_and_cost_per_visitor = top_5_purchases.intersection(top_5_cost_per_visitor)
-
-# Use set logic to find which channels are in the bottom5 for purchases and cost per visitor
-bottom_5_purchases=set(report_for_client['Purchases'].sort_values(ascending=False).index.values[-5:])
-bottom_5_cost_per_visitor=set(report_for_client['Cost Per Visitor (Spend/Lift)'].sort_values(ascending=True).index.values[-5:])
-
-bottom_5_purchases_and_cost_per_visitor = bottom_5_purchases.intersection(bottom_5_cost_per_visitor)
+# Channels that are in the top5 (and bottom5) for both purchases and cost per visitor.  A lower cost per visitor is better.
+top_5_purchases_and_cost_per_visitor, bottom_5_purchases_and_cost_per_visitor = consensus_networks(report_for_client, ['Purchases', 'Cost Per Visitor (Spend/Lift)'], k=5, votes=2, ascending=[False, True])
 
 
 
 make_heatmap(df=report_for_client, 
+             rankings=rankings,
              field='Purchases', 
              color_map='Greys', 
              top_labels=top_5_purchases_and_cost_per_visitor, 
@@ -283,6 +147,7 @@ make_heatmap(df=report_for_client,
 plt.show()
 
 make_heatmap(df=report_for_client, 
+             rankings=rankings,
              field='Cost Per Visitor (Spend/Lift)', 
              cutoff_value = overall_cost_per_visitor, 
              asc=True, 
@@ -297,18 +162,10 @@ plt.show()
 # #### Purchases and Cost Per Acquisition
 
 # %%
-top_5_purchases=set(report_for_client['Purchases'].sort_values(ascending=False).index.values[0:5])
-top_5_cost_per_acquisition=set(report_for_client['Cost Per Acquisition (Spend/Purchases)'].sort_values(ascending=True).index.values[0:5])
-
-top_5_purchases_and_cost_per_acquisition = top_5_purchases.intersection(top_5_cost_per_acquisition)
-
-
-bottom_5_purchases=set(report_for_client['Purchases'].sort_values(ascending=False).index.values[-5:])
-bottom_5_cost_per_acquisition=set(report_for_client['Cost Per Acquisition (Spend/Purchases)'].sort_values(ascending=True).index.values[-5:])
-
-bottom_5_purchases_and_cost_per_acquisition = bottom_5_purchases.intersection(bottom_5_cost_per_acquisition)
+top_5_purchases_and_cost_per_acquisition, bottom_5_purchases_and_cost_per_acquisition = consensus_networks(report_for_client, ['Purchases', 'Cost Per Acquisition (Spend/Purchases)'], k=5, votes=2, ascending=[False, True])
 
 make_heatmap(df=report_for_client, 
+             rankings=rankings,
              field='Purchases', 
              color_map='Greys', 
              top_labels=top_5_purchases_and_cost_per_acquisition, 
@@ -317,6 +174,7 @@ make_heatmap(df=report_for_client,
 plt.show()
 
 make_heatmap(df=report_for_client, 
+             rankings=rankings,
              field='Cost Per Acquisition (Spend/Purchases)', 
              cutoff_value = overall_cost_per_acquisition,
              top_labels = top_5_purchases_and_cost_per_acquisition,
@@ -331,18 +189,10 @@ plt.show()
 # #### Purchases and Conversion Rate
 
 # %%
-top_5_purchases=set(report_for_client['Purchases'].sort_values(ascending=False).index.values[0:5])
-top_5_conversion_rate=set(report_for_client['Conversion Rate (Purchases/Lift)%'].sort_values(ascending=False).index.values[0:5])
-
-top_5_purchases_and_conversion_rate = top_5_purchases.intersection(top_5_conversion_rate)
-
-
-bottom_5_purchases=set(report_for_client['Purchases'].sort_values(ascending=False).index.values[-5:])
-bottom_5_conversion_rate=set(report_for_client['Conversion Rate (Purchases/Lift)%'].sort_values(ascending=False).index.values[-5:])
-
-bottom_5_purchases_and_conversion_rate = bottom_5_purchases.intersection(bottom_5_conversion_rate)
+top_5_purchases_and_conversion_rate, bottom_5_purchases_and_conversion_rate = consensus_networks(report_for_client, ['Purchases', 'Conversion Rate (Purchases/Lift)%'], k=5, votes=2)
 
 make_heatmap(df=report_for_client, 
+             rankings=rankings,
              field='Purchases', 
              color_map='Greys', 
              top_labels=top_5_purchases_and_conversion_rate,
@@ -351,6 +201,7 @@ make_heatmap(df=report_for_client,
 plt.show()
 
 make_heatmap(df=report_for_client, 
+             rankings=rankings,
              field='Conversion Rate (Purchases/Lift)%', 
              cutoff_value = overall_conversion_rate, 
              rounding=".1f",
@@ -365,268 +216,9 @@ plt.show()
 # ## Scatter Plots
 
 # %% [markdown] tags=[]
-# ### Plotting Function - make_scatter()
-
-# %%
-def make_scatter(df, x_field, y_field, x_units='', y_units='', color_1='green', color_2='red'):
-    
-    from adjustText import adjust_text
-    
-    fig, ax = plt.subplots(1,1,figsize=(10,5))
-    
-    # ax.tick_params(top=False,
-    #                bottom=True,
-    #                left=True,
-    #                right=False,
-    #                labelleft=False,
-    #                labelbottom=False)
-    
-    df[x_field] = df[x_field].replace(np.inf, 0)
-    df[y_field] = df[y_field].replace(np.inf, 0)
-    
-    df.plot(kind='scatter', x=x_field, y=y_field, ax=ax)
-    
-    x_field_mean = df[x_field].mean()
-    y_field_mean = df[y_field].mean()
-    
-    if x_units == "$":
-        x_field_mean = round(x_field_mean, 2)
-    elif x_units == "%":
-        x_field_mean = round(x_field_mean, 1)
-    else:
-        x_field_mean = round(x_field_mean)
-        
-    if y_units == "$":
-        y_field_mean = round(y_field_mean, 2)
-    elif y_units == "%":
-        y_field_mean = round(y_field_mean, 1)
-    else:
-        y_field_mean = round(y_field_mean)
-
-    
-    low_x_high_y = df[(df[x_field] < x_field_mean) & (df[y_field] >= y_field_mean)]
-    high_x_low_y = df[(df[x_field] >= x_field_mean) & (df[y_field] < y_field_mean)]
-
-    together = []
-    
-    for i in range(len(low_x_high_y)):
-        txt1 = low_x_high_y.index[i]
-        x_coord1 = low_x_high_y[x_field][i]
-        y_coord1 = low_x_high_y[y_field][i]
-        #size1 = low_x_high_y['Purchases'][i]
-        color1 = color_1
-        together.append((txt1, x_coord1, y_coord1, color1))
-        ax.scatter(x_coord1, y_coord1, color=color1)
-
-    for i in range(len(high_x_low_y)):
-        txt2 = high_x_low_y.index[i]
-        x_coord2 = high_x_low_y[x_field][i]
-        y_coord2 = high_x_low_y[y_field][i]
-        color2 = color_2
-        together.append((txt2, x_coord2, y_coord2, color2))
-        ax.scatter(x_coord2, y_coord2, color=color2)
-    together.sort()
-
-
-    text = [x for (x,y,z,c) in together]
-    x_coords = [y for (x,y,z,c) in together]
-    y_coords = [z for (x,y,z,c) in together]
-    colors = [c for (x,y,z,c) in together]
-
-    texts = []
-    for x, y, s, c in zip(x_coords, y_coords, text, colors):
-        texts.append(plt.text(x, y, s, color=c))
-
-    
-    # I should lookup how to do this with regex to make things easier...
-    x_annot_text = x_field
-    y_annot_text = y_field
-    if x_field == "Conversion Rate (Purchases/Lift)%":
-        x_annot_text = "Conversion Rate"
-    elif x_field == "Cost Per Acquisition (Spend/Purchases)":
-        x_annot_text = "Cost Per Acquisition"
-    elif x_field == "Cost Per Visitor (Spend/Lift)":
-        x_annot_text = "Cost Per Visitor"
-        
-    if y_field == "Conversion Rate (Purchases/Lift)%":
-        y_annot_text = "Conversion Rate"
-    elif y_field == "Cost Per Acquisition (Spend/Purchases)":
-        y_annot_text = "Cost Per Acquisition"
-    elif y_field == "Cost Per Visitor (Spend/Lift)":
-        y_annot_text = "Cost Per Visitor"
-    
-    
-    
-    plt.axvline(x=x_field_mean, linestyle=(0, (2, 8)), color='k')
-    ax.annotate(F'Mean {x_annot_text}'#: {round(x_field_mean, 2)}{x_units}'
-                ,
-                xy=(x_field_mean, max(ax.get_ylim())), xycoords='data',
-                xytext=(0, 2), textcoords='offset pixels',
-                color='k', ha='center')
-    
-    plt.axhline(y=y_field_mean, linestyle=(0, (2, 8)), color='k')
-    ax.annotate(F'Mean\n{y_annot_text}' #:\n{round(y_field_mean, 2)}{y_units}'
-                ,
-                xy=(max(ax.get_xlim()), y_field_mean), xycoords='data',
-                xytext=(5, 0), textcoords='offset pixels',
-                color='k', ha='left')
-    
-    ax.axes.set_xticks([0, x_field_mean])
-    #ax.axes.xaxis.set_ticklabels([])
-    ax.axes.set_yticks([0, y_field_mean])
-    #ax.axes.yaxis.set_ticklabels([])
-    
-    adjust_text(texts, 
-            force_text=(1,1),
-            force_points=(1,1),
-            force_objects=(1,1),
-            only_move={'points':'y', 'texts':'y'},
-            arrowprops=dict(arrowstyle="->", color='k', lw=0.5))
-
-    return fig, ax;
-
-
-# %%
-def make_scatter_with_size_adjustment(df,
-                  x_field,
-                  y_field,
-                  size_scale,
-                  x_units='',
-                  y_units='',
-                  color_1='green',
-                  color_2='red',
-                  expand_text=(1.5, 1.5),
-                  expand_points=(3,3),
-                  expand_objects=(3,3),
-                  force_text=(1,1),
-                  force_points=(1,1),
-                  force_objects=(1,1),
-                  annotate_text=True):
-    
-    from adjustText import adjust_text
-    
-    fig, ax = plt.subplots(1,1,figsize=(10,5))
-    
-    # ax.tick_params(top=False,
-    #                bottom=True,
-    #                left=True,
-    #                right=False,
-    #                labelleft=False,
-    #                labelbottom=False)
-    
-    df[x_field] = df[x_field].replace(np.inf, 0)
-    df[y_field] = df[y_field].replace(np.inf, 0)
-    
-    df.plot(kind='scatter', x=x_field, y=y_field, ax=ax)
-    
-    x_field_mean = df[x_field].mean()
-    y_field_mean = df[y_field].mean()
-    
-    if x_units == "$":
-        x_field_mean = round(x_field_mean, 2)
-    elif x_units == "%":
-        x_field_mean = round(x_field_mean, 1)
-    else:
-        x_field_mean = round(x_field_mean)
-        
-    if y_units == "$":
-        y_field_mean = round(y_field_mean, 2)
-    elif y_units == "%":
-        y_field_mean = round(y_field_mean, 1)
-    else:
-        y_field_mean = round(y_field_mean)
-
-    
-    low_x_high_y = df[(df[x_field] < x_field_mean) & (df[y_field] >= y_field_mean)]
-    high_x_low_y = df[(df[x_field] >= x_field_mean) & (df[y_field] < y_field_mean)]
-
-    together = []
-    
-    for i in range(len(low_x_high_y)):
-        txt1 = low_x_high_y.index[i]
-        x_coord1 = low_x_high_y[x_field][i]
-        y_coord1 = low_x_high_y[y_field][i]
-        size1 = low_x_high_y['Purchases'][i]
-        if size1 == 0:
-            size1 = size_scale * 1 / size_scale
-        color1 = color_1
-        together.append((txt1, x_coord1, y_coord1, color1))
-        ax.scatter(x_coord1, y_coord1, color=color1, s=size1*size_scale)
-
-    for i in range(len(high_x_low_y)):
-        txt2 = high_x_low_y.index[i]
-        x_coord2 = high_x_low_y[x_field][i]
-        y_coord2 = high_x_low_y[y_field][i]
-        size2 = high_x_low_y['Purchases'][i]
-        if size2 == 0:
-            size2 = size_scale * 1 / size_scale
-        color2 = color_2
-        together.append((txt2, x_coord2, y_coord2, color2))
-        ax.scatter(x_coord2, y_coord2, color=color2, s=size2*size_scale)
-    together.sort()
-
-
-    text = [x for (x,y,z,c) in together]
-    x_coords = [y for (x,y,z,c) in together]
-    y_coords = [z for (x,y,z,c) in together]
-    colors = [c for (x,y,z,c) in together]
-    
-    if annotate_text==True:
-        texts = []
-        for x, y, s, c in zip(x_coords, y_coords, text, colors):
-            texts.append(plt.text(x, y, s, color=c))
-
-    
-    # I should lookup how to do this with regex to make things easier...
-    x_annot_text = x_field
-    y_annot_text = y_field
-    if x_field == "Conversion Rate (Purchases/Lift)%":
-        x_annot_text = "Conversion Rate"
-    elif x_field == "Cost Per Acquisition (Spend/Purchases)":
-        x_annot_text = "Cost Per Acquisition"
-    elif x_field == "Cost Per Visitor (Spend/Lift)":
-        x_annot_text = "Cost Per Visitor"
-        
-    if y_field == "Conversion Rate (Purchases/Lift)%":
-        y_annot_text = "Conversion Rate"
-    elif y_field == "Cost Per Acquisition (Spend/Purchases)":
-        y_annot_text = "Cost Per Acquisition"
-    elif y_field == "Cost Per Visitor (Spend/Lift)":
-        y_annot_text = "Cost Per Visitor"
-    
-    
-    
-    plt.axvline(x=x_field_mean, linestyle=(0, (2, 8)), color='k')
-    ax.annotate(F'Mean {x_annot_text}'#: {round(x_field_mean, 2)}{x_units}'
-                ,
-                xy=(x_field_mean, max(ax.get_ylim())), xycoords='data',
-                xytext=(0, 2), textcoords='offset pixels',
-                color='k', ha='center')
-    
-    plt.axhline(y=y_field_mean, linestyle=(0, (2, 8)), color='k')
-    ax.annotate(F'Mean\n{y_annot_text}' #:\n{round(y_field_mean, 2)}{y_units}'
-                ,
-                xy=(max(ax.get_xlim()), y_field_mean), xycoords='data',
-                xytext=(5, 0), textcoords='offset pixels',
-                color='k', ha='left')
-    
-    ax.axes.set_xticks([0, x_field_mean])
-    #ax.axes.xaxis.set_ticklabels([])
-    ax.axes.set_yticks([0, y_field_mean])
-    #ax.axes.yaxis.set_ticklabels([])
-    
-    if annotate_text == True:
-        adjust_text(texts,
-                expand_text=expand_text,
-                expand_points=expand_points,
-                expand_objects=expand_objects,
-                force_text=force_text,
-                force_points=force_points,
-                force_objects=force_objects,
-                only_move={'points':'y', 'texts':'y'},
-                arrowprops=dict(arrowstyle="->", color='k', lw=0.5))
-
-    return fig, ax;
+# ### Plotting Functions - make_scatter() and make_scatter_with_size_adjustment()
+#
+# Both live in ad_campaign_report/charts.py and return (fig, ax, quadrants).  quadrants says which quadrant of the plot every network is in (see scatter_quadrants), so the networks in the good and bad quadrants can be reused without recomputing the means.  A metric that divided by 0 (inf) is plotted at 0, on a copy, so report_for_client keeps its inf values.
 
 # %% [markdown]
 # #### Spend vs. Purchases
@@ -643,7 +235,7 @@ willow_tv_spend = willow_tv['Spend']
 willow_tv_lift = willow_tv['Lift']
 
 # %%
-fig, ax = make_scatter(df=report_for_client,
+fig, ax, quadrants = make_scatter(df=report_for_client,
                        x_field='Spend',
                        y_field='Purchases', 
                        #size=False,
@@ -679,7 +271,7 @@ plt.show()
 # #### Lift vs. Purchases
 
 # %%
-fig, ax = make_scatter(report_for_client,
+fig, ax, quadrants = make_scatter(report_for_client,
                        x_field='Lift',
                        y_field='Purchases',
                        x_units='',
@@ -711,7 +303,7 @@ plt.show()
 # #### Spend vs. Lift
 
 # %%
-fig, ax = make_scatter_with_size_adjustment(report_for_client,
+fig, ax, quadrants = make_scatter_with_size_adjustment(report_for_client,
                                             x_field='Spend',
                                             y_field='Lift',
                                             size_scale=scale,
@@ -869,5 +461,17 @@ ax.xaxis.tick_top()
 ax.xaxis.set_label_position('top')
 ax.invert_yaxis();
 
+# %% [markdown]
+# # Rendering the Deck Without a Display
+#
+# render_deck draws every chart above (ad_campaign_report.charts.deck_charts) with matplotlib's Agg backend in a pool of worker processes, saves each one as PNG and SVG files in ./output/charts, closes it, and tells us how long each chart took.  To render the decks of many clients at once, from the output directories of the batch mode:
+#
+#     python -m ad_campaign_report.charts ./output/brand_a ./output/brand_b --highlight "Willow Tv"
+
+# %%
+chart_timings = render_deck(report_for_client, channels_no_spend, './output/charts', formats=('png', 'svg'), highlight='Willow Tv')
+
+print_chart_timings(chart_timings)
+
 # %% [markdown]
 # # Finish
@@ -0,0 +1,76 @@
+"""Benchmark and check: network totals rolled up from the monthly aggregates.
+
+aggregate() groups the raw airings and purchases once (by network and month) and
+rolls the network totals up from that.  This script checks that the rolled-up
+purchases_spend_lift_by_network matches the one built by grouping the raw rows
+directly (what the report script used to do), on dataset.xlsx and on synthetic
+data, and times both.
+
+Usage:
+    python benchmarks/bench_aggregate.py [path/to/workbook.xlsx] [repeats]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.aggregation import aggregate, aggregate_by_network_and_month
+from ad_campaign_report.pipeline import clean, load
+from bench_month_join import synthetic_inputs
+
+
+def aggregate_by_network_direct(purchase_data_transpose, airings_data, lookup_data):
+    # Network totals grouped straight from the raw rows, the way the report script used to do it
+    purchases_by_network = purchase_data_transpose.sum(axis=0).to_frame().rename(columns={0:'Purchases'})
+    spend_and_lift_by_network = airings_data.groupby('Network')[['Spend', 'Lift']].agg('sum')
+
+    result = lookup_data.merge(right=purchases_by_network, left_on='Network Name', right_on='Source', how='left')
+    result = result.set_index('Network Name')
+    result = result.merge(right=spend_and_lift_by_network, left_on='Ticker', right_index=True, how='left')
+    result = result.drop('Ticker', axis=1)
+    result.index = result.index.str.replace('_', ' ').str.title()
+    return result.fillna(0)
+
+
+def aggregate_twice(purchase_data_transpose, airings_data, lookup_data):
+    return (aggregate_by_network_direct(purchase_data_transpose, airings_data, lookup_data),
+            aggregate_by_network_and_month(purchase_data_transpose, airings_data, lookup_data))
+
+
+def best_of(function, inputs, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*inputs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else './dataset.xlsx'
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    cases = [(os.path.basename(path), clean(*load(path)))]
+    for n_networks, n_months, airings_per_network in ((200, 18, 500), (1000, 18, 1000)):
+        cases.append((F"{n_networks} networks x {n_months} months", synthetic_inputs(n_networks, n_months, airings_per_network)))
+
+    print(F"{'data':<30}{'airings':>10}{'2 passes (ms)':>16}{'1 pass (ms)':>14}")
+    print('-'*70)
+    for name, inputs in cases:
+        direct = aggregate_by_network_direct(*inputs)
+        rolled_up, _ = aggregate(*inputs)
+        pd.testing.assert_frame_equal(rolled_up, direct)
+
+        two_passes = best_of(aggregate_twice, inputs, repeats)
+        one_pass = best_of(aggregate, inputs, repeats)
+        print(F"{name:<30}{len(inputs[1]):>10}{two_passes * 1000:>16.1f}{one_pass * 1000:>14.1f}")
+
+    print()
+    print("Rolled-up network totals match the directly grouped ones in every case.")
+
+
+if __name__ == '__main__':
+    main()
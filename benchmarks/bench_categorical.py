@@ -0,0 +1,63 @@
+"""Memory usage and aggregation time with object vs. categorical network names and tickers.
+
+Reports memory_usage(deep=True) of lookup_data, airings_data and the transposed
+purchases before and after cleaning.categorize, on dataset.xlsx and on a larger
+synthetic dataset, and times aggregate() on both versions.
+
+Usage:
+    python benchmarks/bench_categorical.py [path/to/workbook.xlsx] [repeats]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.aggregation import aggregate
+from ad_campaign_report.cleaning import categorize, clean_airings, clean_lookup, transpose_purchases
+from ad_campaign_report.loader import load_workbook
+from bench_month_join import synthetic_inputs
+
+
+def memory_mb(df):
+    # The transposed purchases keep the networks in the column labels, so we count those too
+    return (df.memory_usage(deep=True).sum() + df.columns.memory_usage(deep=True)) / 1e6
+
+
+def best_of(function, inputs, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*inputs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def report(name, inputs, repeats):
+    categorized = categorize(*inputs)
+
+    print(name)
+    print('-'*70)
+    print(F"{'table':<26}{'rows':>10}{'object (MB)':>16}{'categorical (MB)':>18}")
+    for table, before, after in zip(('purchase_data_transpose', 'airings_data', 'lookup_data'), inputs, categorized):
+        print(F"{table:<26}{len(before):>10}{memory_mb(before):>16.3f}{memory_mb(after):>18.3f}")
+
+    before = best_of(aggregate, inputs, repeats)
+    after = best_of(aggregate, categorized, repeats)
+    print(F"{'aggregate() time (ms)':<36}{before * 1000:>16.1f}{after * 1000:>18.1f}")
+    print()
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else './dataset.xlsx'
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    purchase_data, airings_data, lookup_data = load_workbook(path)
+    inputs = (transpose_purchases(purchase_data), clean_airings(airings_data), clean_lookup(lookup_data))
+    report(os.path.basename(path), inputs, repeats)
+
+    report("synthetic: 200 networks x 18 months", synthetic_inputs(200, 18, airings_per_network=5000), repeats)
+
+
+if __name__ == '__main__':
+    main()
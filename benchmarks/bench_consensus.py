@@ -0,0 +1,105 @@
+"""Benchmark and check: consensus top/bottom k networks with np.argpartition vs. sorting every metric.
+
+The visuals used to find the networks in the top 5 of at least 2 of Purchases,
+Spend and Lift with hand-written set intersections (set1..set4) over the top 5
+of each metric, which took a full sort_values per metric.
+rankings.consensus_networks partially sorts each column of a networks x metrics
+matrix with np.argpartition instead, and counts the votes with arrays.  This
+script checks:
+
+* it gives the same labels as the set1..set4 logic on dataset.xlsx
+* it gives the same networks as sorting every metric and counting how many
+  top/bottom k sets each network is in, on synthetic reports (with continuous
+  values, so there are no ties at the k-th place)
+
+and times both for more metrics and networks.
+
+Usage:
+    python benchmarks/bench_consensus.py [path/to/workbook.xlsx] [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report import pipeline
+from ad_campaign_report.rankings import consensus_networks
+
+
+def at_least_2_of_3_with_sets(df, fields, bottom=False):
+    # The original cells of ad_campaign_visuals.py
+    if bottom:
+        field1_labels, field2_labels, field3_labels = [set(df[field].sort_values(ascending=False).index.values[-5:]) for field in fields]
+    else:
+        field1_labels, field2_labels, field3_labels = [set(df[field].sort_values(ascending=False).index.values[0:5]) for field in fields]
+
+    set1 = field1_labels.intersection(field2_labels)
+    set2 = field1_labels.intersection(field3_labels)
+    set3 = field2_labels.intersection(field3_labels)
+    set4 = set1.intersection(set2, set3)
+    return set1.union(set2, set3, set4)
+
+
+def consensus_with_sorts(df, metrics, k, votes):
+    # Every metric fully sorted, and the votes counted network by network
+    top_votes = Counter()
+    bottom_votes = Counter()
+    for metric in metrics:
+        ordered = df[metric].sort_values(ascending=False).index
+        top_votes.update(ordered[:k])
+        bottom_votes.update(ordered[-k:])
+    return ({network for network, count in top_votes.items() if count >= votes},
+            {network for network, count in bottom_votes.items() if count >= votes})
+
+
+def synthetic_metrics(n_networks, n_metrics, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.gamma(1.5, 100, (n_networks, n_metrics)),
+                        columns=[F"Metric {count}" for count in range(n_metrics)],
+                        index=pd.Index([F"Network {count}" for count in range(n_networks)], name='Network'))
+
+
+def best_of(repeats, function, *args):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else './dataset.xlsx'
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        report_for_client = pipeline.run(path, output_dir=output_dir, pdfs=False)['report_for_client']
+
+    fields = ['Purchases', 'Spend', 'Lift']
+    top, bottom = consensus_networks(report_for_client, fields, k=5, votes=2)
+    assert top == at_least_2_of_3_with_sets(report_for_client, fields)
+    assert bottom == at_least_2_of_3_with_sets(report_for_client, fields, bottom=True)
+    print(F"{path}: same labels as the set intersections (top: {sorted(top)}, bottom: {sorted(bottom)})")
+    print()
+
+    print(F"{'networks':>10}{'metrics':>9}{'k':>5}{'votes':>7}{'sort (ms)':>12}{'argpartition (ms)':>19}{'speedup':>10}")
+    print('-'*72)
+    for n_networks, n_metrics, k, votes in [(40, 3, 5, 2), (1000, 3, 5, 2), (1000, 20, 10, 5), (100000, 3, 5, 2), (100000, 20, 50, 5)]:
+        df = synthetic_metrics(n_networks, n_metrics)
+        metrics = list(df.columns)
+
+        assert consensus_networks(df, metrics, k, votes) == consensus_with_sorts(df, metrics, k, votes), F"{n_networks} networks, {n_metrics} metrics: different networks"
+
+        sorts = best_of(repeats, consensus_with_sorts, df, metrics, k, votes)
+        argpartition = best_of(repeats, consensus_networks, df, metrics, k, votes)
+        print(F"{n_networks:>10}{n_metrics:>9}{k:>5}{votes:>7}{sorts * 1000:>12.2f}{argpartition * 1000:>19.2f}{sorts / argpartition:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
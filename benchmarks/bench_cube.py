@@ -0,0 +1,61 @@
+"""Benchmark and check: every time grain rolled up from one daily cube vs. grouping the raw airings per grain.
+
+For each grain in cube.GRAINS, checks that the Spend and Lift rolled up from the
+daily Network x Date cube match grouping the raw airings directly at that grain,
+then times producing all of the grains both ways, on synthetic airings.
+
+Usage:
+    python benchmarks/bench_cube.py [repeats]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.aggregation import aggregate_spend_lift_by_network_and_month
+from ad_campaign_report.cube import GRAINS, build_daily_cube, roll_up_cube
+from bench_month_join import synthetic_inputs
+
+
+def all_grains_from_raw(purchase_data_transpose, airings_data):
+    return {grain: aggregate_spend_lift_by_network_and_month(airings_data, freq=freq) for grain, freq in GRAINS.items()}
+
+
+def all_grains_from_cube(purchase_data_transpose, airings_data):
+    cube = build_daily_cube(purchase_data_transpose, airings_data)
+    return {grain: roll_up_cube(cube, grain)[1] for grain in GRAINS}
+
+
+def best_of(repeats, function, *args):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print(F"{'airings':>10}{'per grain from raw (ms)':>26}{'from daily cube (ms)':>23}{'speedup':>10}")
+    print('-'*69)
+    for n_networks, airings_per_network in ((40, 1000), (40, 25000), (200, 25000)):
+        purchase_data_transpose, airings_data, _ = synthetic_inputs(n_networks, 12, airings_per_network)
+        airings_data['Network'] = airings_data['Network'].astype('category')
+
+        from_raw = all_grains_from_raw(purchase_data_transpose, airings_data)
+        from_cube = all_grains_from_cube(purchase_data_transpose, airings_data)
+        for grain in GRAINS:
+            pd.testing.assert_frame_equal(from_cube[grain], from_raw[grain], check_exact=False)
+
+        raw = best_of(repeats, all_grains_from_raw, purchase_data_transpose, airings_data)
+        cube = best_of(repeats, all_grains_from_cube, purchase_data_transpose, airings_data)
+        print(F"{len(airings_data):>10}{raw * 1000:>26.1f}{cube * 1000:>23.1f}{raw / cube:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
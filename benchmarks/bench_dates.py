@@ -0,0 +1,80 @@
+"""Benchmark: vectorized build_purchase_dates vs. the original strptime loop.
+
+Usage:
+    python benchmarks/bench_dates.py [repeats]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.cleaning import build_purchase_dates
+
+
+def parse_dates_loop(current_year, months, day_nums):
+    # The loop the report script used to run over the Purchases header, kept as is
+    # for comparison.  It has no notion of a year rollover.
+    parsed_dates = []
+    current_month = months[0]
+    i = 0
+    for count, current_day_num in enumerate(day_nums, start=1):
+        try:
+            next_day_num = day_nums[count]
+        except:
+            pass
+        if current_day_num > next_day_num:
+            current_date = str(current_year) + '-' + current_month + '-' + str(current_day_num)
+            current_date = datetime.strptime(current_date, '%Y-%B-%d').date()
+            i += 1
+            current_month = months[i]
+            parsed_dates.append(current_date)
+        else:
+            current_date = str(current_year) + '-' + current_month + '-' + str(current_day_num)
+            current_date = datetime.strptime(current_date, '%Y-%B-%d').date()
+            parsed_dates.append(current_date)
+    return pd.to_datetime(parsed_dates)
+
+
+def make_header(n_days, start='2016-01-01'):
+    # Day numbers and month names for n_days consecutive days, the way the
+    # Purchases sheet lays them out.  We start in a leap year so the loop (which
+    # uses the starting year for every date) can still parse Feb 29 of later years.
+    dates = pd.date_range(start, periods=n_days, freq='D', name='date')
+    month_starts = (dates.day == 1) | (np.arange(n_days) == 0)
+    months = list(dates[month_starts].month_name())
+    return dates, months, np.asarray(dates.day)
+
+
+def best_of(function, repeats, *args):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(F"{'day columns':>12}{'loop (ms)':>14}{'vectorized (ms)':>18}{'speedup':>10}")
+    print('-'*54)
+    for n_days in (60, 365, 1000, 3000):
+        dates, months, day_nums = make_header(n_days)
+
+        # The loop can't roll the year over, so we only check the vectorized
+        # version against the real dates.
+        assert (build_purchase_dates(dates[0].year, months, day_nums) == dates).all()
+
+        loop = best_of(parse_dates_loop, repeats, dates[0].year, months, day_nums)
+        vectorized = best_of(build_purchase_dates, repeats, dates[0].year, months, day_nums)
+        print(F"{n_days:>12}{loop * 1000:>14.2f}{vectorized * 1000:>18.2f}{loop / vectorized:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
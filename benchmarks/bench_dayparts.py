@@ -0,0 +1,71 @@
+"""Benchmark and check: daypart binning by hour lookup vs. a row-wise apply over the airings.
+
+The straightforward way to get Spend and Lift by network and daypart is to work
+out the daypart of every airing with apply and group by it.  dayparts.py groups
+the airings by network and hour instead, and bins the (at most 24 per network)
+hours into dayparts with an array lookup.  This script checks both give the same
+totals on synthetic airings, and times them.
+
+Usage:
+    python benchmarks/bench_dayparts.py [repeats]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.dayparts import DAYPARTS, DAYPART_DTYPE, aggregate_spend_lift_by_network_and_hour, daypart_of_hours
+from bench_month_join import synthetic_inputs
+
+
+def daypart_of_timestamp(timestamp):
+    # One airing at a time, the way a row-wise apply would do it
+    hour = timestamp.hour
+    starts = sorted((start, name) for name, start in DAYPARTS)
+    earlier = [name for start, name in starts if start <= hour]
+    return earlier[-1] if earlier else starts[-1][1]
+
+
+def by_daypart_apply(airings_data):
+    dayparts = airings_data['Date/Time ET'].apply(daypart_of_timestamp).astype(DAYPART_DTYPE)
+    return airings_data.groupby([airings_data['Network'], dayparts.rename('Daypart')], observed=True)[['Spend', 'Lift']].sum()
+
+
+def by_daypart_lookup(airings_data):
+    by_hour = aggregate_spend_lift_by_network_and_hour(airings_data)
+    dayparts = pd.CategoricalIndex(daypart_of_hours(by_hour.index.get_level_values('Hour')), name='Daypart')
+    return by_hour.groupby([by_hour.index.get_level_values('Network'), dayparts], observed=True).sum()
+
+
+def best_of(repeats, function, *args):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print(F"{'airings':>10}{'apply (ms)':>14}{'hour lookup (ms)':>18}{'speedup':>10}")
+    print('-'*52)
+    for airings_per_network in (250, 2500, 25000):
+        _, airings_data, _ = synthetic_inputs(40, 2, airings_per_network)
+        airings_data['Network'] = airings_data['Network'].astype('category')
+
+        expected = by_daypart_apply(airings_data).sort_index()
+        result = by_daypart_lookup(airings_data).sort_index()
+        pd.testing.assert_frame_equal(result, expected, check_names=False)
+
+        apply = best_of(repeats, by_daypart_apply, airings_data)
+        lookup = best_of(repeats, by_daypart_lookup, airings_data)
+        print(F"{len(airings_data):>10}{apply * 1000:>14.1f}{lookup * 1000:>18.1f}{apply / lookup:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
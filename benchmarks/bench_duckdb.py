@@ -0,0 +1,65 @@
+"""Benchmark and check: the DuckDB engine (duckdb_engine.py) vs. the pandas aggregations and joins.
+
+Times both engines on growing synthetic inputs (after checking they give the
+same tables), with the DuckDB timings split into writing the Parquet files and
+querying them (the part that's left when the history is already stored as
+Parquet).  The checks on the bundled dataset.xlsx, at every grain in cube.GRAINS
+and by hour, are in tests/test_duckdb_parity.py.
+
+Usage:
+    python benchmarks/bench_duckdb.py [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.aggregation import aggregate
+from ad_campaign_report.cube import build_daily_cube, roll_up_cube
+from ad_campaign_report.duckdb_engine import aggregate_parquet, write_parquet_inputs
+from bench_month_join import synthetic_inputs
+
+
+def aggregate_pandas(purchase_data_transpose, airings_data, lookup_data, grain='month'):
+    monthly = None if grain == 'month' else roll_up_cube(build_daily_cube(purchase_data_transpose, airings_data), grain)
+    return aggregate(purchase_data_transpose, airings_data, lookup_data, monthly=monthly)
+
+
+def best_of(repeats, function, *args):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print(F"{'airings':>10}{'pandas (ms)':>13}{'write parquet (ms)':>20}{'duckdb query (ms)':>19}")
+    print('-'*62)
+    for n_networks, n_months, airings_per_network in ((40, 2, 1000), (200, 12, 5000), (200, 36, 25000)):
+        inputs = synthetic_inputs(n_networks, n_months, airings_per_network)
+        inputs[1]['Network'] = inputs[1]['Network'].astype('category')
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_parquet_inputs(*inputs, directory)
+
+            expected = aggregate_pandas(*inputs)
+            for result_table, expected_table in zip(aggregate_parquet(*paths), expected):
+                pd.testing.assert_frame_equal(result_table, expected_table.astype(float), check_index_type=False)
+
+            pandas_time = best_of(repeats, aggregate_pandas, *inputs)
+            write_time = best_of(repeats, write_parquet_inputs, *inputs, directory)
+            query_time = best_of(repeats, aggregate_parquet, *paths)
+
+        print(F"{len(inputs[1]):>10}{pandas_time * 1000:>13.1f}{write_time * 1000:>20.1f}{query_time * 1000:>19.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: placing scatter plot labels with adjust_text vs. the greedy grid placer in label_placement.py.
+
+For 30, 200 and 1000 random points on a 10x5 inch scatter plot (the size
+make_scatter draws), every point gets a label like the network names, and the
+labels are placed with each placer, using the settings make_scatter uses.  We
+report the time it took and how many pairs of labels still overlap afterwards
+(and before, with every label on its point).
+
+Usage:
+    python benchmarks/bench_label_placement.py [repeats] [--sizes 30 200 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+
+from ad_campaign_report.label_placement import LABEL_PLACERS, count_overlaps, place_labels
+
+SIZES = (30, 200, 1000)
+
+# make_scatter's adjust_text settings
+ADJUST_TEXT_KWARGS = dict(force_text=(1,1),
+                          only_move={'points':'y', 'texts':'y'},
+                          arrowprops=dict(arrowstyle="->", color='k', lw=0.5))
+
+
+def labelled_scatter(n_points, seed=0):
+    # Points spread like the networks' Spend and Purchases, with more of them near 0
+    rng = np.random.default_rng(seed)
+    x = rng.gamma(1.5, 10000, n_points)
+    y = rng.gamma(1.5, 5, n_points)
+
+    fig, ax = plt.subplots(1,1,figsize=(10,5))
+    ax.scatter(x, y)
+    texts = [ax.text(x_coord, y_coord, F"Network {count}") for count, (x_coord, y_coord) in enumerate(zip(x, y))]
+    fig.canvas.draw()
+
+    return fig, ax, texts, x, y
+
+
+def run(label_placer, n_points, seed):
+    # Returns (seconds, overlaps before, overlaps after)
+    fig, ax, texts, x, y = labelled_scatter(n_points, seed)
+    try:
+        before = count_overlaps(texts, ax)
+        start = time.perf_counter()
+        place_labels(texts, ax, label_placer, x=x, y=y, **ADJUST_TEXT_KWARGS)
+        seconds = time.perf_counter() - start
+        return seconds, before, count_overlaps(texts, ax)
+    finally:
+        plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the label placers and count the overlaps they leave.")
+    parser.add_argument('repeats', type=int, nargs='?', default=3, help="runs per placer and size, the best time is kept (default: 3)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help="numbers of labelled points (default: 30 200 1000)")
+    args = parser.parse_args()
+
+    print(F"{'points':>8}{'placer':>14}{'best (ms)':>12}{'overlaps before':>18}{'overlaps after':>17}")
+    print('-'*69)
+    for n_points in args.sizes:
+        for label_placer in LABEL_PLACERS:
+            try:
+                runs = [run(label_placer, n_points, seed=0) for _ in range(args.repeats)]
+            except MemoryError as error:
+                # adjust_text compares every pair of overlapping labels at once, which doesn't fit in memory once there are too many
+                print(F"{n_points:>8}{label_placer:>14}  failed: {type(error).__name__}")
+                continue
+            seconds = min(seconds for seconds, _, _ in runs)
+            _, before, after = runs[0]
+            print(F"{n_points:>8}{label_placer:>14}{seconds * 1000:>12.1f}{before:>18}{after:>17}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Timing report: single-pass workbook loader vs. three read_excel calls.
+
+Usage:
+    python benchmarks/bench_loader.py [path/to/workbook.xlsx] [repeats]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.loader import load_workbook, load_workbook_separately
+
+
+def time_loader(loader, path, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        loader(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings), sum(timings) / len(timings)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else './dataset.xlsx'
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    separate_best, separate_mean = time_loader(load_workbook_separately, path, repeats)
+    single_best, single_mean = time_loader(load_workbook, path, repeats)
+
+    print(F"Workbook: {path} ({repeats} runs each)")
+    print('-'*60)
+    print(F"{'loader':<30}{'best (s)':>15}{'mean (s)':>15}")
+    print(F"{'3 x pd.read_excel':<30}{separate_best:>15.3f}{separate_mean:>15.3f}")
+    print(F"{'load_workbook (single pass)':<30}{single_best:>15.3f}{single_mean:>15.3f}")
+    print('-'*60)
+    print(F"Saving: {separate_best - single_best:.3f}s per load ({separate_best / single_best:.2f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark and check: derived metrics computed in one NumPy pass vs. the original column arithmetic.
+
+The original add_metrics summed the Purchases and Spend columns with the builtin
+sum() (one Python-level addition per row) and divided column by column.  This
+script checks that metrics.add_metrics gives the same values (up to float
+rounding of the totals) on synthetic tables with zero and missing measures, and
+times both.
+
+Usage:
+    python benchmarks/bench_metrics.py [repeats]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.metrics import add_metrics
+
+
+def add_metrics_legacy(df):
+    # What add_metrics used to do
+    df = df.copy()
+
+    df['Conversion Rate (Purchases/Lift)%'] = df['Purchases'] / df['Lift'] * 100
+
+    df['Cost Per Acquisition (Spend/Purchases)'] = df['Spend'] / df['Purchases'].fillna(0)
+
+    df['Cost Per Visitor (Spend/Lift)'] = df['Spend'] / df['Lift'].fillna(0)
+
+    df['Percent of Purchases'] = df['Purchases'] / sum(df['Purchases'].fillna(0)) * 100
+
+    df['Percent of Spend'] = df['Spend'] / sum(df['Spend'].fillna(0)) * 100
+
+    df['Percent Pur > Percent Spend'] = df['Percent of Purchases'] > df['Percent of Spend']
+
+    return df
+
+
+def synthetic_measures(n_rows, seed=0):
+    """Purchases, Spend and Lift with plenty of zeros (networks with no spend, no purchases, ...)."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'Purchases': rng.poisson(2, n_rows).astype(float),
+                       'Spend': rng.gamma(2, 500, n_rows).round(2),
+                       'Lift': rng.poisson(40, n_rows).astype(float)},
+                      index=pd.Index([F"Network {i}" for i in range(n_rows)], name='Network Name'))
+    df.loc[rng.random(n_rows) < 0.2, 'Spend'] = 0
+    df.loc[rng.random(n_rows) < 0.1, 'Lift'] = 0
+
+    return df
+
+
+def best_of(repeats, function, *args):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(F"{'rows':>10}{'legacy (ms)':>14}{'numpy (ms)':>14}{'speedup':>10}")
+    print('-'*48)
+    for n_rows in (50, 5000, 500000):
+        df = synthetic_measures(n_rows)
+        pd.testing.assert_frame_equal(add_metrics(df), add_metrics_legacy(df), rtol=1e-9)
+
+        legacy = best_of(repeats, add_metrics_legacy, df)
+        vectorized = best_of(repeats, add_metrics, df)
+        print(F"{n_rows:>10}{legacy * 1000:>14.2f}{vectorized * 1000:>14.2f}{legacy / vectorized:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
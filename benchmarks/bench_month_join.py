@@ -0,0 +1,101 @@
+"""Benchmark: (network, month) grid via MultiIndex.from_product/reindex vs. the old key=0 cross join.
+
+Times and measures the peak memory (tracemalloc) of building the "Metrics by
+Network and Month" table both ways, for growing numbers of networks and months.
+
+Usage:
+    python benchmarks/bench_month_join.py [repeats]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.aggregation import aggregate_by_network_and_month, grouper_freq
+
+
+def aggregate_by_network_and_month_cross_join(purchase_data_transpose, airings_data, lookup_data):
+    # The cross join + two left merges the report script used to run, kept for comparison
+    month_stamps = purchase_data_transpose.groupby(pd.Grouper(freq=grouper_freq('M'))).sum().index.values
+    month_df = pd.DataFrame(data=month_stamps)
+    month_df['key'] = 0
+    lookup_data_with_key = lookup_data.copy()
+    lookup_data_with_key['key'] = 0
+    lookup_data_with_months = lookup_data_with_key.merge(month_df)
+    lookup_data_with_months = lookup_data_with_months.rename(columns={0:'date'}).drop(columns='key')
+
+    spend_lift_by_network_and_month = airings_data.groupby(['Network', pd.Grouper(key='Date/Time ET', freq=grouper_freq('M'))])[['Spend', 'Lift']].sum().reset_index()
+    purchases_by_network_and_month = purchase_data_transpose.groupby(pd.Grouper(freq=grouper_freq('M'))).sum().transpose().stack().to_frame().reset_index()
+    purchases_by_network_and_month = purchases_by_network_and_month.rename(columns={0:'Purchases'})
+
+    lookup_spend_lift = lookup_data_with_months.merge(spend_lift_by_network_and_month, left_on=['Ticker', 'date'], right_on=['Network', 'Date/Time ET'], how='left')
+    lookup_spend_lift = lookup_spend_lift.drop(columns=['Ticker', 'Network', 'Date/Time ET'])
+    result = lookup_spend_lift.merge(purchases_by_network_and_month, left_on=['Network Name', 'date'], right_on=['Source', 'date'], how='left')
+    result = result.drop(columns='Source')
+
+    result['Network Name'] = result['Network Name'].str.replace('_', ' ').str.title()
+    result = result.set_index(['Network Name', 'date']).fillna(0)
+    return result[['Purchases', 'Spend', 'Lift']]
+
+
+def synthetic_inputs(n_networks, n_months, airings_per_network, seed=0):
+    # Cleaned purchase_data_transpose, airings_data and lookup_data of the given size
+    rng = np.random.default_rng(seed)
+    names = [F"network_{i}" for i in range(n_networks)]
+    tickers = [F"NET{i}" for i in range(n_networks)]
+    dates = pd.date_range('2016-01-01', periods=n_months, freq='MS')
+    days = pd.date_range(dates[0], dates[-1] + pd.offsets.MonthEnd(), freq='D', name='date')
+
+    purchase_data_transpose = pd.DataFrame(rng.poisson(0.3, size=(len(days), n_networks)).astype(float),
+                                           index=days, columns=pd.Index(names, name='Source'))
+
+    n_airings = n_networks * airings_per_network
+    airings_data = pd.DataFrame({'Date/Time ET': days[0] + pd.to_timedelta(rng.integers(0, len(days) * 86400, n_airings), unit='s'),
+                                 'Network': rng.choice(tickers, n_airings),
+                                 'Spend': rng.integers(100, 3000, n_airings).astype(float),
+                                 'Lift': rng.integers(0, 200, n_airings)})
+
+    lookup_data = pd.DataFrame({'Network Name': names, 'Ticker': tickers})
+
+    return purchase_data_transpose, airings_data, lookup_data
+
+
+def measure(function, inputs, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*inputs)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function(*inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings), peak
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print(F"{'networks':>9}{'months':>8}{'cross join (ms)':>17}{'reindex (ms)':>14}{'cross join peak (MB)':>22}{'reindex peak (MB)':>19}")
+    print('-'*89)
+    for n_networks, n_months in ((30, 2), (200, 18), (1000, 18), (2000, 36)):
+        inputs = synthetic_inputs(n_networks, n_months, airings_per_network=50)
+
+        old = aggregate_by_network_and_month_cross_join(*inputs)
+        new = aggregate_by_network_and_month(*inputs)
+        pd.testing.assert_frame_equal(old, new, check_names=False)
+
+        old_time, old_peak = measure(aggregate_by_network_and_month_cross_join, inputs, repeats)
+        new_time, new_peak = measure(aggregate_by_network_and_month, inputs, repeats)
+        print(F"{n_networks:>9}{n_months:>8}{old_time * 1000:>17.1f}{new_time * 1000:>14.1f}{old_peak / 1e6:>22.1f}{new_peak / 1e6:>19.1f}")
+
+
+if __name__ == '__main__':
+    main()
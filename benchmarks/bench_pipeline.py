@@ -0,0 +1,188 @@
+"""Benchmark: time of every stage of the pipeline on synthetic workbooks of growing size, saved for regression comparison.
+
+For each scale, a workbook is written with synthetic_workbook.write_workbook (and
+kept in --workbook-dir, since writing the big ones takes a while), then the
+stages of pipeline.run are run on it one at a time:
+
+    load       loader.load_workbook
+    clean      cleaning.clean_workbook, which transposes the Purchases sheet
+    aggregate  aggregation.aggregate_monthly, the group by network and month
+    join       aggregation.aggregate, the joins through the Lookup table
+    metrics    metrics.compute_metrics and reports.build_reports
+    export     export.export, the CSV files (and PDFs with --renderer)
+
+The best time of each stage over the repeats is printed and saved as JSON (with
+the commit and package versions) in --results-dir.  Pass an earlier results file
+to --compare to see how every stage changed since then; the exit status is 1 if
+any stage got slower by more than --threshold.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--scales dataset small medium] [--repeats 3] [--renderer reportlab] [--compare results/OLD.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.aggregation import aggregate, aggregate_monthly
+from ad_campaign_report.cleaning import campaign_period, clean_workbook
+from ad_campaign_report.export import export, period_label
+from ad_campaign_report.loader import load_workbook
+from ad_campaign_report.metrics import compute_metrics
+from ad_campaign_report.reports import build_reports
+from synthetic_workbook import write_workbook
+
+
+# Scale name: (networks, days, airings).  dataset is about the size of dataset.xlsx.
+SCALES = {'dataset': (45, 61, 6500),
+          'small': (100, 92, 25000),
+          'medium': (250, 365, 250000),
+          'large': (500, 730, 1000000)}
+
+STAGES = ['load', 'clean', 'aggregate', 'join', 'metrics', 'export']
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+# Stages that only take a few milliseconds vary by more than any threshold from run to run, so a
+# stage only counts as slower if it also lost at least this many seconds
+MIN_SLOWDOWN = 0.01
+
+
+def run_stages(path, output_dir, renderer=None):
+    # One run of the pipeline, returns {stage: seconds}
+    timings = {}
+
+    def timed(stage, function, *args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    purchase_data, airings_data, lookup_data = timed('load', load_workbook, path)
+    purchase_data_transpose, airings_data, lookup_data = timed('clean', clean_workbook, purchase_data, airings_data, lookup_data)
+    monthly = timed('aggregate', aggregate_monthly, purchase_data_transpose, airings_data)
+    aggregated = timed('join', aggregate, purchase_data_transpose, airings_data, lookup_data, monthly=monthly)
+
+    def metrics():
+        tables = compute_metrics(*aggregated)
+        return tables + build_reports(*tables)
+
+    tables = timed('metrics', metrics)
+    timed('export', export, *tables, output_dir, period_label(*campaign_period(purchase_data_transpose)),
+          pdfs=renderer is not None, renderer=renderer)
+
+    return timings
+
+
+def benchmark_scale(name, workbook_dir, repeats, renderer=None):
+    n_networks, n_days, n_airings = SCALES[name]
+    path = os.path.join(workbook_dir, F"synthetic_{n_networks}_networks_{n_days}_days_{n_airings}_airings.xlsx")
+    if not os.path.exists(path):
+        print(F"Writing {path}")
+        write_workbook(path, n_networks, n_days, n_airings)
+
+    runs = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(repeats):
+            runs.append(run_stages(path, output_dir, renderer))
+
+    stages = {stage: min(run[stage] for run in runs) for stage in STAGES}
+
+    return {'networks': n_networks, 'days': n_days, 'airings': n_airings,
+            'stages': stages, 'total': sum(stages.values())}
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {'commit': commit,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.platform()}
+
+
+def print_results(results):
+    print(F"{'scale':<10}{'airings':>10}" + ''.join(F"{stage:>11}" for stage in STAGES) + F"{'total':>11}")
+    print('-'*(31 + 11 * len(STAGES)))
+    for name, result in results['scales'].items():
+        stages = ''.join(F"{result['stages'][stage]:>11.3f}" for stage in STAGES)
+        print(F"{name:<10}{result['airings']:>10}{stages}{result['total']:>11.3f}")
+    print('(seconds, best of each stage)')
+
+
+def compare(results, baseline, threshold):
+    """Print the change of every stage vs. baseline.  Returns the (scale, stage) pairs that got slower than threshold (and MIN_SLOWDOWN) allows."""
+    print(F"Compared to {baseline['environment'].get('commit')} ({baseline['environment'].get('created')})")
+    if baseline.get('renderer') != results['renderer']:
+        print(F"Note: the export stage was timed with renderer {baseline.get('renderer')} before and {results['renderer']} now")
+    print(F"{'scale':<10}{'stage':<11}{'before (s)':>12}{'after (s)':>12}{'change':>10}")
+    print('-'*55)
+
+    slower = []
+    for name, result in results['scales'].items():
+        if name not in baseline['scales']:
+            continue
+        before_stages = baseline['scales'][name]['stages']
+        for stage in STAGES + ['total']:
+            before = before_stages.get(stage) if stage != 'total' else baseline['scales'][name]['total']
+            after = result['stages'][stage] if stage != 'total' else result['total']
+            if before is None:
+                continue
+            change = after / before - 1
+            flag = ''
+            if change > threshold and after - before >= MIN_SLOWDOWN:
+                flag = '  slower'
+                slower.append((name, stage))
+            print(F"{name:<10}{stage:<11}{before:>12.3f}{after:>12.3f}{change:>+10.0%}{flag}")
+
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every stage of the pipeline on synthetic workbooks.")
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['dataset', 'small', 'medium'], help="workbook sizes to run (default: dataset small medium)")
+    parser.add_argument('--repeats', type=int, default=3, help="runs per scale, the best time of each stage is kept (default: 3)")
+    parser.add_argument('--renderer', default=None, help="also render the PDFs with this backend (default: CSV files only)")
+    parser.add_argument('--workbook-dir', default=os.path.join(tempfile.gettempdir(), 'ad_campaign_report_bench'), help="where the synthetic workbooks are kept")
+    parser.add_argument('--results-dir', default=RESULTS_DIR, help="where the results are saved (default: benchmarks/results)")
+    parser.add_argument('--compare', default=None, help="earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="slowdown that counts as a regression (default: 0.2, i.e. 20%%)")
+    args = parser.parse_args()
+
+    results = {'environment': environment(), 'repeats': args.repeats, 'renderer': args.renderer,
+               'scales': {name: benchmark_scale(name, args.workbook_dir, args.repeats, args.renderer) for name in args.scales}}
+    print_results(results)
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    results_path = os.path.join(args.results_dir, F"pipeline_{time.strftime('%Y%m%d_%H%M%S')}_{results['environment']['commit']}.json")
+    with open(results_path, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(F"Saved {results_path}")
+
+    if args.compare is not None:
+        print()
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
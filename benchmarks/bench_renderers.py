@@ -0,0 +1,63 @@
+"""Per-report PDF rendering latency of each backend in render.py.
+
+Renders the three client reports of a workbook with every available backend
+(pdfkit needs the wkhtmltopdf executable, reportlab needs the reportlab package)
+and reports the time per report, then the time of one combined document with
+all three reports (export(combined=True)).  Backends that aren't available are
+skipped.
+
+Usage:
+    python benchmarks/bench_renderers.py [path/to/workbook.xlsx] [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report import pipeline
+from ad_campaign_report.export import _write_report, combined_sections, export_combined_report
+from ad_campaign_report.render import RENDERERS, get_renderer
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else './dataset.xlsx'
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        tables = pipeline.run(path, output_dir=output_dir, pdfs=False)
+        reports = {'report_for_client': tables['report_for_client'],
+                   'report_for_client_by_month': tables['report_for_client_by_month'],
+                   'report_channels_no_spend': tables['channels_no_spend']}
+
+        print(F"{'backend':<12}{'report':<30}{'best (ms)':>12}{'mean (ms)':>12}")
+        print('-'*66)
+        for name in sorted(RENDERERS):
+            try:
+                renderer = get_renderer(name)
+                # The same writer export() uses, without a render lock since there's one report at a time
+                _write_report(reports['report_for_client'], 'warm_up', output_dir, renderer, None)
+            except (ImportError, OSError) as error:
+                print(F"{name:<12}skipped: {str(error).splitlines()[0]}")
+                continue
+
+            for report_name, df in reports.items():
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    _write_report(df, report_name, output_dir, renderer, None)
+                    timings.append(time.perf_counter() - start)
+                print(F"{name:<12}{report_name:<30}{min(timings) * 1000:>12.1f}{sum(timings) / len(timings) * 1000:>12.1f}")
+
+            sections = combined_sections(*reports.values())
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                export_combined_report(sections, 'campaign_report', output_dir, 'Campaign Report', renderer=renderer)
+                timings.append(time.perf_counter() - start)
+            print(F"{name:<12}{'combined (all three)':<30}{min(timings) * 1000:>12.1f}{sum(timings) / len(timings) * 1000:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
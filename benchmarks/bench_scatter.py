@@ -0,0 +1,113 @@
+"""Benchmark and check: one ax.scatter call per network vs. one collection per quadrant.
+
+make_scatter used to loop over the networks of the two colored quadrants and
+call ax.scatter for each of them, so a plot had one collection per point.
+charts._draw_quadrant_scatter draws each quadrant with a single call, with the
+sizes as an array.  This script checks both draw the same points, with the same
+colors and sizes, on synthetic reports of growing size, and times drawing them
+(labels aren't drawn, they cost the same either way).
+
+Usage:
+    python benchmarks/bench_scatter.py [repeats]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+
+from ad_campaign_report.charts import _draw_quadrant_scatter, scatter_quadrants
+
+SIZE_SCALE = 10
+
+
+def synthetic_report(n_networks, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'Spend': rng.gamma(1.5, 10000, n_networks).round(2),
+                         'Purchases': rng.poisson(8, n_networks)},
+                        index=pd.Index([F"Network {count}" for count in range(n_networks)], name='Network'))
+
+
+def per_point_scatter(df, x_field, y_field, color_1='green', color_2='red'):
+    # The original loop, one ax.scatter per network
+    fig, ax = plt.subplots(1,1,figsize=(10,5))
+    df.plot(kind='scatter', x=x_field, y=y_field, ax=ax)
+
+    quadrants = scatter_quadrants(df, x_field, y_field)
+    x_field_mean, y_field_mean = quadrants.attrs['x_mean'], quadrants.attrs['y_mean']
+
+    low_x_high_y = df[(df[x_field] < x_field_mean) & (df[y_field] >= y_field_mean)]
+    high_x_low_y = df[(df[x_field] >= x_field_mean) & (df[y_field] < y_field_mean)]
+
+    for quadrant, color in ((low_x_high_y, color_1), (high_x_low_y, color_2)):
+        for i in range(len(quadrant)):
+            size = quadrant['Purchases'].iloc[i]
+            if size == 0:
+                size = 1
+            ax.scatter(quadrant[x_field].iloc[i], quadrant[y_field].iloc[i], color=color, s=size*SIZE_SCALE)
+
+    return fig, ax
+
+
+def batched_scatter(df, x_field, y_field, color_1='green', color_2='red'):
+    sizes = df['Purchases'].replace(0, 1).values * SIZE_SCALE
+    fig, ax, _, _ = _draw_quadrant_scatter(df, x_field, y_field, None, None, color_1, color_2, sizes=sizes, annotate_text=False)
+    return fig, ax
+
+
+def colored_points(ax):
+    # (x, y, color, size) of every point drawn after the first (all networks, in the default color) collection
+    points = []
+    for collection in ax.collections[1:]:
+        offsets = collection.get_offsets()
+        colors = np.broadcast_to(collection.get_facecolors(), (len(offsets), 4))
+        sizes = np.broadcast_to(collection.get_sizes(), len(offsets))
+        points += [(x, y, tuple(color), size) for (x, y), color, size in zip(offsets, colors, sizes)]
+    return sorted(points)
+
+
+def time_drawing(repeats, function, *args):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fig, ax = function(*args)
+        fig.canvas.draw()
+        timings.append(time.perf_counter() - start)
+        plt.close(fig)
+    return min(timings)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print(F"{'networks':>10}{'collections':>13}{'per point (ms)':>16}{'batched (ms)':>14}{'speedup':>10}")
+    print('-'*63)
+    for n_networks in (30, 200, 1000, 5000):
+        df = synthetic_report(n_networks)
+
+        fig, ax = per_point_scatter(df, 'Spend', 'Purchases')
+        expected = colored_points(ax)
+        collections = len(ax.collections)
+        plt.close(fig)
+
+        fig, ax = batched_scatter(df, 'Spend', 'Purchases')
+        result = colored_points(ax)
+        plt.close(fig)
+        assert result == expected, F"{n_networks} networks: the batched scatter draws different points"
+
+        per_point = time_drawing(repeats, per_point_scatter, df, 'Spend', 'Purchases')
+        batched = time_drawing(repeats, batched_scatter, df, 'Spend', 'Purchases')
+        print(F"{n_networks:>10}{collections:>13}{per_point * 1000:>16.1f}{batched * 1000:>14.1f}{per_point / batched:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
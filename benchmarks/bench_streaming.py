@@ -0,0 +1,65 @@
+"""Peak memory of chunked airings ingestion vs. loading every airing at once.
+
+Writes a synthetic airings CSV, then measures (with tracemalloc) the peak memory
+and time of building Spend and Lift by network and month with
+pd.read_csv + groupby, and with streaming.stream_spend_lift_by_network_and_month.
+
+Usage:
+    python benchmarks/bench_streaming.py [airings] [chunksize]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.aggregation import aggregate_spend_lift_by_network_and_month
+from ad_campaign_report.cleaning import clean_airings
+from ad_campaign_report.loader import AIRINGS_DTYPES
+from ad_campaign_report.streaming import stream_spend_lift_by_network_and_month
+from bench_month_join import synthetic_inputs
+
+
+def load_all(path):
+    airings_data = pd.read_csv(path, dtype={'Lift': AIRINGS_DTYPES['Lift']}, parse_dates=['Date/Time ET'])
+    return aggregate_spend_lift_by_network_and_month(clean_airings(airings_data))
+
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    n_airings = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    chunksize = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+
+    _, airings_data, _ = synthetic_inputs(200, 18, airings_per_network=n_airings // 200)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'airings.csv')
+        airings_data.to_csv(path, index=False)
+        del airings_data
+
+        full, full_seconds, full_peak = measure(load_all, path)
+        chunked, chunked_seconds, chunked_peak = measure(stream_spend_lift_by_network_and_month, path, chunksize)
+
+    pd.testing.assert_frame_equal(full, chunked)
+
+    print(F"{n_airings} airings, chunks of {chunksize}")
+    print('-'*50)
+    print(F"{'ingestion':<20}{'time (s)':>12}{'peak (MB)':>14}")
+    print(F"{'all at once':<20}{full_seconds:>12.2f}{full_peak / 1e6:>14.1f}")
+    print(F"{'chunked':<20}{chunked_seconds:>12.2f}{chunked_peak / 1e6:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Synthetic campaign workbooks, in the same layout as dataset.xlsx, at any scale.
+
+bench_month_join.synthetic_inputs builds the cleaned tables directly, which skips
+loading and cleaning.  The workbooks written here go through the whole pipeline,
+the way a client's workbook does:
+
+* Purchases: the messy wide sheet, a title row, then the year, quarter and month
+  names above the first day of each, a row of day numbers (as text) and one row
+  of purchase counts per network name, blank when there were none that day
+* Airings: one row per airing (Company, Date/Time ET, Rotation, Creative, Network,
+  Spend, Lift, Program), newest first
+* Lookup: a title row, then Network Name, Ticker and Network Name again.  Like the
+  real Lookup sheet, there's a "(blank)" network and some networks with no ticker,
+  and a few airings are on tickers that aren't in it
+
+Usage:
+    python benchmarks/synthetic_workbook.py out.xlsx [--networks 200] [--days 365] [--airings 100000] [--seed 0]
+"""
+import argparse
+import calendar
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.loader import AIRINGS_SHEET, LOOKUP_SHEET, PURCHASES_SHEET
+
+
+AIRINGS_COLUMNS = ['Company', 'Date/Time ET', 'Rotation', 'Creative', 'Network', 'Spend', 'Lift', 'Program']
+ROTATIONS = ['Everyday Prime', 'Weekday Prime', 'Early Morning', 'Late Night', 'Weekend Daytime']
+PROGRAMS = ['PAID PROGRAMMING', 'NEWS', 'MOVIE', 'SPORTS CENTER', 'LATE SHOW', 'WEATHER HACKS']
+
+# Shares of the Lookup table without a ticker, and of the airings on tickers missing from the Lookup table
+NO_TICKER_SHARE = 0.1
+UNKNOWN_TICKER_SHARE = 0.01
+
+
+def network_names(n_networks):
+    # Lowercase with underscores, like the survey responses in the Purchases sheet
+    return [F"network_{i:04d}" for i in range(n_networks)]
+
+
+def tickers(n_networks):
+    return [F"N{i:04d}" for i in range(n_networks)]
+
+
+def purchases_rows(names, days, rng):
+    # Rows of the Purchases sheet, as openpyxl would read them back
+    n_columns = 2 + len(days)
+
+    def header_row(labels):
+        row = [None] * n_columns
+        for position, label in labels:
+            row[2 + position] = label
+        return row
+
+    first_of_month = [position for position in range(len(days)) if position == 0 or days[position].month != days[position - 1].month]
+    first_of_quarter = [position for position in first_of_month if position == 0 or days[position].quarter != days[position - 1].quarter]
+
+    rows = [header_row([(0, 'Submitted Application Timestamp')]),
+            header_row([(0, str(days[0].year))]),
+            header_row([(position, F"Q{days[position].quarter}") for position in first_of_quarter]),
+            header_row([(position, calendar.month_name[days[position].month]) for position in first_of_month]),
+            ['Source Category', 'Source'] + [str(day.day) for day in days]]
+
+    # Most networks get no purchases on most days, which the sheet leaves blank
+    counts = rng.poisson(0.2, size=(len(names), len(days)))
+    for position, (name, network_counts) in enumerate(zip(names, counts)):
+        category = 'tv_commercial' if position == 0 else None
+        rows.append([category, name] + [int(count) if count else None for count in network_counts])
+
+    return rows
+
+
+def airings_rows(ticker_list, days, n_airings, rng):
+    # Rows of the Airings sheet, newest first like the exports we get
+    seconds = np.sort(rng.integers(0, len(days) * 86400, n_airings))[::-1]
+    timestamps = (days[0] + pd.to_timedelta(seconds, unit='s')).to_pydatetime()
+
+    unknown_tickers = [F"X{i:03d}" for i in range(max(1, len(ticker_list) // 50))]
+    networks = np.where(rng.random(n_airings) < UNKNOWN_TICKER_SHARE,
+                        rng.choice(unknown_tickers, n_airings),
+                        rng.choice(ticker_list, n_airings))
+    spend = rng.integers(0, 300, n_airings) * 10
+    lift = np.where(spend > 0, rng.poisson(spend / 15), 0)
+    rotations = rng.choice(ROTATIONS, n_airings)
+    programs = rng.choice(PROGRAMS, n_airings)
+
+    for timestamp, network, rotation, airing_spend, airing_lift, program in zip(timestamps, networks, rotations, spend, lift, programs):
+        yield ['synthetic_company', timestamp, F"{network} {rotation}", 1010101, str(network), int(airing_spend), int(airing_lift), str(program)]
+
+
+def lookup_rows(names, ticker_list, rng):
+    # Rows of the Lookup sheet, title row included
+    has_ticker = rng.random(len(names)) >= NO_TICKER_SHARE
+    rows = [['Lookup table for survey response field to airings network ticker symbol', None, None],
+            ['Network Name', 'Ticker', 'Network Name'],
+            ['(blank)', None, '(blank)']]
+    rows += [[name, ticker if ticker_listed else None, name] for name, ticker, ticker_listed in zip(names, ticker_list, has_ticker)]
+
+    return rows
+
+
+def write_workbook(path, n_networks=40, n_days=61, n_airings=6500, start='2017-09-01', seed=0):
+    """Write a synthetic workbook with n_networks networks, n_days days of purchases and n_airings airings."""
+    rng = np.random.default_rng(seed)
+    names = network_names(n_networks)
+    ticker_list = tickers(n_networks)
+    days = pd.date_range(start, periods=n_days, freq='D')
+
+    # write_only streams the rows to the file instead of keeping every cell in memory
+    workbook = Workbook(write_only=True)
+    for title, rows in ((PURCHASES_SHEET, purchases_rows(names, days, rng)),
+                        (AIRINGS_SHEET, [AIRINGS_COLUMNS]),
+                        (LOOKUP_SHEET, lookup_rows(names, ticker_list, rng))):
+        worksheet = workbook.create_sheet(title)
+        for row in rows:
+            worksheet.append(row)
+        if title == AIRINGS_SHEET:
+            for row in airings_rows(ticker_list, days, n_airings, rng):
+                worksheet.append(row)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    workbook.save(path)
+
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic campaign workbook in the layout of dataset.xlsx.")
+    parser.add_argument('path', help="where to write the .xlsx file")
+    parser.add_argument('--networks', type=int, default=40, help="number of networks (default: 40)")
+    parser.add_argument('--days', type=int, default=61, help="number of days of purchases and airings (default: 61)")
+    parser.add_argument('--airings', type=int, default=6500, help="number of airings (default: 6500)")
+    parser.add_argument('--start', default='2017-09-01', help="first day (default: 2017-09-01)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args()
+
+    write_workbook(args.path, args.networks, args.days, args.airings, start=args.start, seed=args.seed)
+    print(F"Wrote {args.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Batch mode (batch.run_batch) keeps the results of the workbooks that finished when a worker process dies."""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report import batch
+
+
+def run_or_die(path, output_dir, *args):
+    # Stands in for batch._run_one in the worker processes: the "killed" workbook takes its worker down with it
+    if 'killed' in path:
+        os._exit(1)
+    return batch.BatchResult(path, output_dir, 0.0, None)
+
+
+def test_dead_worker_fails_only_its_workbooks(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, '_run_one', run_or_die)
+
+    # One worker, so the first workbook is done before the second one kills it
+    results = batch.run_batch(['fine.xlsx', 'killed.xlsx'], output_root=str(tmp_path), workers=1, pdfs=False)
+
+    assert [result.path for result in results] == ['fine.xlsx', 'killed.xlsx']
+    assert results[0].error is None
+    assert 'BrokenProcessPool' in results[1].error
+
+    # And the summary still gets printed
+    summary = io.StringIO()
+    batch.print_summary(results, file=summary)
+    assert 'killed.xlsx' in summary.getvalue()
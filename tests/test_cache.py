@@ -0,0 +1,54 @@
+"""The workbook cache (cache.WorkbookCache) when several batch workers share one cache directory."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+pytest.importorskip('pyarrow')
+
+from ad_campaign_report.cache import FRAME_NAMES, WorkbookCache
+from ad_campaign_report.cleaning import clean_workbook
+from ad_campaign_report.loader import load_workbook
+
+
+DATASET = os.path.join(os.path.dirname(__file__), os.pardir, 'dataset.xlsx')
+
+
+@pytest.fixture(scope='module')
+def cleaned_dataset():
+    return clean_workbook(*load_workbook(DATASET))
+
+
+def test_put_keeps_an_existing_entry(tmp_path, cleaned_dataset):
+    # Two workers that processed the same workbook both store it under the same key
+    cache = WorkbookCache(str(tmp_path))
+    cache.put('key', cleaned_dataset)
+    entry_files = {name: os.stat(cache._frame_path('key', name)).st_ino for name in FRAME_NAMES}
+
+    cache.put('key', cleaned_dataset)
+
+    assert {name: os.stat(cache._frame_path('key', name)).st_ino for name in FRAME_NAMES} == entry_files
+    assert os.listdir(tmp_path) == ['key']
+
+    # Parquet reads text back as pandas' string dtype on pandas >= 3, hence check_dtype=False
+    frames = cache.get('key')
+    for frame, expected in zip(frames, cleaned_dataset):
+        pd.testing.assert_frame_equal(frame, expected, check_dtype=False)
+
+
+def test_get_of_a_half_deleted_entry_is_a_miss(tmp_path, cleaned_dataset):
+    cache = WorkbookCache(str(tmp_path))
+    cache.put('key', cleaned_dataset)
+
+    # Another worker's eviction has removed some of the entry's files
+    os.remove(cache._frame_path('key', 'lookup_data'))
+    assert cache.get('key') is None
+
+    # And one of them is truncated
+    cache.put('other', cleaned_dataset)
+    with open(cache._frame_path('other', 'airings_data'), 'r+b') as f:
+        f.truncate(16)
+    assert cache.get('other') is None
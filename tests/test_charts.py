@@ -0,0 +1,61 @@
+"""Every chart of the presentation deck (charts.deck_charts) renders headless, from the report CSVs in ./output, and the heatmaps come out the same as from sort_values."""
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+pytest.importorskip('matplotlib')
+pytest.importorskip('seaborn')
+pytest.importorskip('adjustText')
+
+from ad_campaign_report import charts
+from ad_campaign_report.charts import deck_charts, load_reports, render_chart, use_headless_backend
+
+
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'output')
+
+
+@pytest.fixture(scope='module')
+def reports():
+    use_headless_backend()
+    return load_reports(OUTPUT_DIR)
+
+
+def test_render_every_deck_chart(tmp_path, reports):
+    charts = deck_charts(*reports, highlight='Willow Tv')
+
+    for chart in charts:
+        timing = render_chart(chart, str(tmp_path), formats=('png',))
+        assert [os.path.getsize(path) > 0 for path in timing.paths] == [True]
+
+    assert sorted(os.listdir(tmp_path)) == sorted(F"{chart.name}.png" for chart in charts)
+
+
+def render_png(chart):
+    import matplotlib.pyplot as plt
+
+    fig = chart.function(**chart.kwargs)[0]
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def test_heatmaps_from_rankings_match_sort_values(reports, monkeypatch):
+    heatmaps = [chart for chart in deck_charts(*reports) if chart.function is charts.make_heatmap]
+    from_rankings = [render_png(chart) for chart in heatmaps]
+
+    # The order make_heatmap used to get from sorting the report itself
+    report_for_client = reports[0]
+    monkeypatch.setattr(charts, 'ranked_networks',
+                        lambda rankings, field, ascending=False: report_for_client[field].sort_values(ascending=ascending).index)
+    from_sort_values = [render_png(chart) for chart in heatmaps]
+
+    assert len(heatmaps) == 9
+    for chart, rankings_png, sort_values_png in zip(heatmaps, from_rankings, from_sort_values):
+        assert rankings_png == sort_values_png, chart.name
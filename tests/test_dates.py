@@ -0,0 +1,92 @@
+"""The Purchases header dates (cleaning.build_purchase_dates) and the campaign period labels (cleaning.campaign_period, export.period_label)."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.cleaning import build_purchase_dates, campaign_period
+from ad_campaign_report.export import period_label
+
+
+def header(dates):
+    # The year, month names and day numbers the Purchases sheet would have for dates
+    dates = pd.DatetimeIndex(dates)
+    month_starts = (dates.day == 1) | (pd.RangeIndex(len(dates)) == 0)
+    return dates[0].year, list(dates[month_starts].month_name()), list(dates.day)
+
+
+def test_dates_within_one_year():
+    dates = pd.date_range('2017-09-01', '2017-10-31', name='date')
+
+    pd.testing.assert_index_equal(build_purchase_dates(*header(dates)), dates, check_names=False)
+
+
+def test_dates_across_year_boundaries():
+    dates = pd.date_range('2017-11-15', '2019-02-10', name='date')
+
+    pd.testing.assert_index_equal(build_purchase_dates(*header(dates)), dates, check_names=False)
+
+
+def test_dates_starting_mid_month():
+    result = build_purchase_dates(2017, ['December', 'January'], [30, 31, 1, 2])
+
+    assert list(result) == list(pd.to_datetime(['2017-12-30', '2017-12-31', '2018-01-01', '2018-01-02']))
+
+
+def test_no_day_numbers():
+    assert len(build_purchase_dates(2017, ['September'], [])) == 0
+
+
+def test_more_months_than_names():
+    with pytest.raises(ValueError):
+        build_purchase_dates(2017, ['September'], [29, 30, 1])
+
+
+def test_campaign_period_within_one_year():
+    dates = pd.date_range('2017-09-01', '2017-10-31')
+
+    start, end = campaign_period(dates)
+
+    assert (start, end) == (pd.Timestamp('2017-09-01'), pd.Timestamp('2017-10-31'))
+    assert period_label(start, end) == '2017_September_October'
+
+
+def test_campaign_period_of_a_transposed_purchases_table():
+    purchase_data_transpose = pd.DataFrame({'cnn': 1.0}, index=pd.date_range('2017-09-01', '2017-10-31', name='date'))
+
+    assert period_label(*campaign_period(purchase_data_transpose)) == '2017_September_October'
+
+
+def test_campaign_period_across_a_year_boundary():
+    dates = pd.date_range('2017-11-01', '2018-01-31')
+
+    assert period_label(*campaign_period(dates)) == '2017_November_December_January'
+    assert period_label(*campaign_period(dates), every_month=False) == '2017_November_2018_January'
+
+
+def test_period_label_names_every_month_by_default():
+    # The names run() has always given the files of a campaign of three months or more
+    start, end = campaign_period(pd.date_range('2017-09-01', '2017-11-30'))
+
+    assert period_label(start, end) == '2017_September_October_November'
+    assert period_label(start, end, every_month=False) == '2017_September_November'
+
+
+def test_campaign_period_of_a_multi_year_history():
+    # Month ends of a stored history, ex: from state.MonthlyStateStore.  September
+    # shows up in both years, so run_incremental only names the first and last months.
+    month_ends = pd.date_range('2017-09-30', '2018-10-31', freq=pd.offsets.MonthEnd())
+
+    start, end = campaign_period(month_ends)
+
+    assert (start, end) == (pd.Timestamp('2017-09-30'), pd.Timestamp('2018-10-31'))
+    assert period_label(start, end, every_month=False) == '2017_September_2018_October'
+
+
+def test_period_label_of_a_single_month():
+    start, end = campaign_period(pd.date_range('2017-09-01', '2017-09-30'))
+
+    assert period_label(start, end) == period_label(start, end, every_month=False) == '2017_September'
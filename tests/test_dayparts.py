@@ -0,0 +1,39 @@
+"""The daypart and hour of day reports (dayparts.py) add up to the same Spend and Lift as report_for_client."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report import pipeline
+from benchmarks.synthetic_workbook import write_workbook
+
+
+DATASET = os.path.join(os.path.dirname(__file__), os.pardir, 'dataset.xlsx')
+
+
+@pytest.fixture(scope='module', params=['dataset', 'synthetic'])
+def tables(request, tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp(request.param)
+    path = DATASET
+    if request.param == 'synthetic':
+        # Like the real Lookup sheet, it has networks with no ticker and airings on tickers that aren't in it
+        path = str(tmp_path / 'synthetic.xlsx')
+        write_workbook(path, n_networks=40, n_days=61, n_airings=6500)
+
+    return pipeline.run(path, output_dir=str(tmp_path / 'output'), pdfs=False)
+
+
+@pytest.mark.parametrize('report', ['report_by_daypart', 'report_by_hour'])
+def test_reconciles_with_report_for_client(tables, report):
+    expected = tables['report_for_client']
+
+    assert tables[report]['Spend'].sum() == pytest.approx(expected['Spend'].sum())
+    assert tables[report]['Lift'].sum() == expected['Lift'].sum()
+
+
+def test_only_the_client_channels_by_daypart(tables):
+    networks = set(tables['report_by_daypart'].index.get_level_values('Network'))
+
+    assert networks <= set(tables['report_for_client'].index)
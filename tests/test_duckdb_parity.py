@@ -0,0 +1,54 @@
+"""The DuckDB engine (duckdb_engine.py) gives the same tables as the pandas aggregations and joins on dataset.xlsx."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+pytest.importorskip('duckdb')
+
+from ad_campaign_report.aggregation import aggregate
+from ad_campaign_report.cleaning import clean_workbook
+from ad_campaign_report.cube import GRAINS, build_daily_cube, roll_up_cube
+from ad_campaign_report.dayparts import aggregate_spend_lift_by_network_and_hour
+from ad_campaign_report.duckdb_engine import aggregate_frames
+from ad_campaign_report.loader import load_workbook
+
+
+DATASET = os.path.join(os.path.dirname(__file__), os.pardir, 'dataset.xlsx')
+
+
+@pytest.fixture(scope='module')
+def cleaned_dataset():
+    return clean_workbook(*load_workbook(DATASET))
+
+
+def aggregate_pandas(purchase_data_transpose, airings_data, lookup_data, grain='month'):
+    monthly = None if grain == 'month' else roll_up_cube(build_daily_cube(purchase_data_transpose, airings_data), grain)
+    return aggregate(purchase_data_transpose, airings_data, lookup_data, monthly=monthly)
+
+
+def by_hour_sorted(spend_lift_by_network_and_hour):
+    # The pandas tickers are a categorical, in the order they were first seen, and the DuckDB ones are strings
+    by_hour = spend_lift_by_network_and_hour.astype(float).reset_index()
+    by_hour['Network'] = by_hour['Network'].astype(str)
+    return by_hour.set_index(['Network', 'Hour']).sort_index()
+
+
+@pytest.mark.parametrize('grain', list(GRAINS))
+def test_network_and_period_tables(cleaned_dataset, grain):
+    expected = aggregate_pandas(*cleaned_dataset, grain)
+    result = aggregate_frames(*cleaned_dataset, grain=grain)
+
+    assert len(result) == len(expected)
+    for result_table, expected_table in zip(result, expected):
+        pd.testing.assert_frame_equal(result_table, expected_table.astype(float), check_index_type=False, rtol=1e-12)
+
+
+def test_network_and_hour_table(cleaned_dataset):
+    _, airings_data, _ = cleaned_dataset
+    *_, by_hour = aggregate_frames(*cleaned_dataset, hours=True)
+
+    pd.testing.assert_frame_equal(by_hour_sorted(by_hour), by_hour_sorted(aggregate_spend_lift_by_network_and_hour(airings_data)))
@@ -0,0 +1,45 @@
+"""The single-pass loader (loader.load_workbook) gives the same sheets as pd.read_excel on dataset.xlsx."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report.loader import AIRINGS_DTYPES, LOOKUP_DTYPES, load_workbook, load_workbook_separately
+
+
+DATASET = os.path.join(os.path.dirname(__file__), os.pardir, 'dataset.xlsx')
+
+# The sheets in the order load_workbook returns them, with the dtypes it casts to explicitly
+SHEETS = [('Purchases', {}), ('Airings', AIRINGS_DTYPES), ('Lookup', LOOKUP_DTYPES)]
+
+
+@pytest.fixture(scope='module')
+def both_loaders():
+    return load_workbook(DATASET), load_workbook_separately(DATASET)
+
+
+@pytest.mark.parametrize('sheet', range(len(SHEETS)), ids=[name for name, _ in SHEETS])
+def test_same_columns_as_read_excel(both_loaders, sheet):
+    _, explicit_dtypes = SHEETS[sheet]
+    frame, expected = both_loaders[0][sheet], both_loaders[1][sheet]
+
+    assert list(frame.columns) == list(expected.columns)
+    for column in frame.columns:
+        # Columns with an explicit dtype are compared to read_excel's values in that dtype,
+        # and every other column has to come out exactly as read_excel gives it
+        expected_column = expected[column]
+        if column in explicit_dtypes:
+            expected_column = expected_column.astype(explicit_dtypes[column])
+        pd.testing.assert_series_equal(frame[column], expected_column)
+
+
+def test_na_strings_are_missing(both_loaders):
+    _, airings_data, lookup_data = both_loaders[0]
+
+    # read_excel reads the "None" rotations and the "NULL" network name as missing values
+    assert not airings_data['Rotation'].isin(['None']).any()
+    assert airings_data['Rotation'].isna().sum() == both_loaders[1][1]['Rotation'].isna().sum() > 0
+    assert not lookup_data['Network Name'].isin(['NULL']).any()
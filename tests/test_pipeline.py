@@ -0,0 +1,30 @@
+"""pipeline.run returns, and saves in its run profile, how long every exported file took to write."""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from ad_campaign_report import pipeline
+from ad_campaign_report.export import ArtifactTiming
+
+
+DATASET = os.path.join(os.path.dirname(__file__), os.pardir, 'dataset.xlsx')
+
+
+def test_export_timings(tmp_path):
+    tables = pipeline.run(DATASET, output_dir=str(tmp_path), pdfs=False, profile=True)
+
+    timings = tables['export_timings']
+    assert {timing.kind for timing in timings} == {'csv'}
+    assert sorted(os.path.basename(timing.path) for timing in timings) == sorted(os.listdir(tmp_path / 'cleaned_csvs'))
+
+    with open(tmp_path / 'run_profile.json') as file:
+        profile = json.load(file)
+    assert [ArtifactTiming(**artifact) for artifact in profile['artifacts']] == timings
+
+
+def test_export_timings_of_an_incremental_run(tmp_path):
+    tables = pipeline.run_incremental(DATASET, str(tmp_path / 'state.parquet'), output_dir=str(tmp_path), pdfs=False)
+
+    assert len(tables['export_timings']) == len(os.listdir(tmp_path / 'cleaned_csvs'))